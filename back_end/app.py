@@ -24,23 +24,26 @@ def main_menu():
     return input("Choose an option: ")
 
 
+BASE_YACHTS_PAGE_SIZE = 50
+
+
 def search_base_yachts(services):
     logger.info("\nAvailable Base Yachts:")
     yachts = []
-    for yid in range(1, 100):
-        row, columns = services.profile_service.db.get_by_yacht_id(yid)
-        if row:
-            yacht = services.profile_service.db.get_by_yacht_id(yid)[0]
-            if yacht and columns[columns.index("base_id")] is None:
-                yachts.append((yid, row, columns))
+    after = None
+    while True:
+        page = services.profile_service.list_base_profiles(BASE_YACHTS_PAGE_SIZE, after)
+        for profile in page:
+            logger.info(
+                f"ID: {profile.yacht_id} | Class: {profile.yacht_class} | Model: {profile.model} | Designer: {profile.designer}"
+            )
+        yachts.extend(page)
+        if len(page) < BASE_YACHTS_PAGE_SIZE:
+            break
+        after = page[-1].yacht_id
     if not yachts:
         logger.info("No base yachts found.")
         return None
-    for yid, row, columns in yachts:
-        profile = services.profile_service.get_profile(yid)
-        logger.info(
-            f"ID: {profile.yacht_id} | Class: {profile.yacht_class} | Model: {profile.model} | Designer: {profile.designer}"
-        )
     return yachts
 
 
@@ -0,0 +1,35 @@
+"""
+Compile the furler catalog into the binary artifact the service loads.
+
+Run from the furlers directory after import_data.py has populated SQLite:
+
+    python -m data.build_catalog                      # -> src/catalog.bin
+    python -m data.build_catalog --output /srv/catalog.bin --version 2025.07
+
+Publishing over the path a running service watches hot-swaps its catalog.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.catalog import FurlerCatalog
+from src.catalog_artifact import write_artifact
+from src.config import FURLER_CATALOG_PATH
+from src.database import DB_PATH
+
+
+def build_catalog(db_path=DB_PATH, output=FURLER_CATALOG_PATH, version=None):
+    catalog = FurlerCatalog.from_db(db_path)
+    return write_artifact(catalog.tables, output, version=version)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile the furler catalog artifact")
+    parser.add_argument("--db", default=DB_PATH, help="Source SQLite database")
+    parser.add_argument("--output", default=FURLER_CATALOG_PATH, help="Artifact path")
+    parser.add_argument("--version", default=None, help="Catalog version (default: content hash)")
+    args = parser.parse_args()
+    version = build_catalog(args.db, args.output, args.version)
+    print(f"Wrote furler catalog {version} to {args.output}")
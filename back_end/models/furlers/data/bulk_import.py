@@ -0,0 +1,280 @@
+"""
+Diffing bulk import for supplier furler catalogs.
+
+Reads supplier data as JSON ({"Harken_Toggles": [{...}, ...], ...}) or CSV
+(one file per table, named after the table or given with --table), compares
+it with the current tables by each table's natural key and applies only the
+differences: executemany inserts, updates and deletes in one transaction.
+The natural-key indexes are dropped while the rows are written and rebuilt
+before the transaction commits.
+
+    python -m data.bulk_import harken_2025.json
+    python -m data.bulk_import Furlex_Parts.csv --table furlex_parts_numbers --dry-run
+    python -m data.bulk_import profurl.json --keep-missing --build-artifact
+
+Tables in the input are treated as complete price lists: rows that are no
+longer listed are deleted unless --keep-missing is given.
+"""
+import argparse
+import csv
+import json
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.database import DB_PATH, create_tables
+
+# Natural key of each catalog table; every other column is a value to diff
+TABLE_KEYS = {
+    "Facnor_Selection_Criteria": ("unit_name",),
+    "Facnor_Requires_Eye_Turnbuckle": ("unit_name", "stay_diameter"),
+    "Furlex_Selection_Criteria": ("unit_name", "stay_diameter"),
+    "furlex_parts_numbers": ("unit_name", "stay_diameter", "stay_length"),
+    "Furlex_Link_plates": ("stay_diameter",),
+    "Harken_Selection_Criteria": ("unit_name",),
+    "Harken_Base_Unit_Part_Numbers": ("unit_name", "base_unit_part_number"),
+    "Harken_Toggles": ("unit_name", "toggle_part_number", "clevis_pin_diameter"),
+    "Harken_Rod_Adapters": ("unit_name", "part_number"),
+    "Profurl_Selection_Criteria": ("unit_name",),
+    "Profurl_Requires_Swageless_Eye": ("unit_name", "stay_diameter"),
+    "Profurl_Part_Numbers": ("unit_name", "stay_length"),
+    "Profurl_Turnbuckle_Cylinders": ("unit_name",),
+    "Profurl_Link_Plates": ("unit_name", "part_number"),
+    "Profurl_Prefeeders": ("unit_name", "part_number"),
+    "Profurl_Reefing_Kits": ("part_number",),
+}
+_TABLES_BY_LOWER = {name.lower(): name for name in TABLE_KEYS}
+
+
+def key_index_name(table):
+    return f"idx_{table.lower()}_key"
+
+
+def drop_key_index(conn, table):
+    conn.execute(f"DROP INDEX IF EXISTS {key_index_name(table)}")
+
+
+def create_key_index(conn, table):
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS {key_index_name(table)} "
+        f"ON {table} ({', '.join(TABLE_KEYS[table])})"
+    )
+
+
+def resolve_table(name):
+    table = _TABLES_BY_LOWER.get(name.lower())
+    if table is None:
+        raise ValueError(f"Unknown furler catalog table: {name}")
+    return table
+
+
+def table_columns(conn, table):
+    """[(column, declared type)] for a table, without the id column."""
+    return [
+        (row[1], (row[2] or "").upper())
+        for row in conn.execute(f"PRAGMA table_info({table})")
+        if row[1] != "id"
+    ]
+
+
+def _coerce(value, col_type):
+    """Normalise a supplier value to what import_data.py would have stored."""
+    if isinstance(value, (list, tuple)):
+        # Lists (diameters, pin sizes, model names) are stored comma-separated
+        return ",".join(str(x) for x in value if x is not None)
+    # CSV has no NULL: an empty cell is a missing value, as import_data.py stores it
+    if value is None or value == "":
+        return None
+    if col_type == "INTEGER":
+        return int(float(value))
+    if col_type == "REAL":
+        return float(value)
+    return str(value)
+
+
+def _normalise_key_part(value):
+    # 8 and 8.0 are the same stay diameter
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def read_source(path, table=None):
+    """Return {table: [row dicts]} from a supplier JSON or CSV file."""
+    if path.lower().endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            if table is None:
+                raise ValueError(f"{path} holds a bare list; pass --table")
+            data = {table: data}
+        return {resolve_table(name): rows for name, rows in data.items()}
+    if path.lower().endswith(".csv"):
+        name = table or os.path.splitext(os.path.basename(path))[0]
+        with open(path, newline="") as f:
+            return {resolve_table(name): list(csv.DictReader(f))}
+    raise ValueError(f"Unsupported supplier file type: {path}")
+
+
+def diff_table(conn, table, incoming, keep_missing=False):
+    """
+    Compare supplier rows with the table. Returns a dict with the rows to
+    insert and update, the ids to delete and the keys of each change.
+    """
+    columns = table_columns(conn, table)
+    names = [name for name, _ in columns]
+    key_cols = TABLE_KEYS[table]
+    value_cols = [name for name in names if name not in key_cols]
+
+    def key_of(row):
+        return tuple(_normalise_key_part(row[col]) for col in key_cols)
+
+    current = {}
+    for row in conn.execute(f"SELECT id, {', '.join(names)} FROM {table} ORDER BY id"):
+        record = dict(zip(names, row[1:]))
+        # Duplicate keys (e.g. a repeated import_data run) collapse to the first row
+        current.setdefault(key_of(record), (row[0], record))
+
+    wanted = {}
+    for raw in incoming:
+        record = {name: _coerce(raw.get(name), col_type) for name, col_type in columns}
+        missing = [col for col in key_cols if record[col] is None]
+        if missing:
+            raise ValueError(f"{table}: row {raw} has no {', '.join(missing)}")
+        wanted[key_of(record)] = record
+
+    inserts, updates, changed_keys = [], [], {"inserted": [], "updated": [], "deleted": []}
+    unchanged = 0
+    for key, record in wanted.items():
+        existing = current.get(key)
+        if existing is None:
+            inserts.append(tuple(record[name] for name in names))
+            changed_keys["inserted"].append(key)
+        elif any(existing[1][col] != record[col] for col in value_cols):
+            updates.append(tuple(record[col] for col in value_cols) + (existing[0],))
+            changed_keys["updated"].append(key)
+        else:
+            unchanged += 1
+    deletes, duplicates = [], []
+    if not keep_missing:
+        for key, (row_id, _) in current.items():
+            if key not in wanted:
+                deletes.append((row_id,))
+                changed_keys["deleted"].append(key)
+    # Extra copies of a key are always dropped so the table ends up keyed
+    seen = {row_id for row_id, _ in current.values()}
+    for (row_id,) in conn.execute(f"SELECT id FROM {table}"):
+        if row_id not in seen:
+            duplicates.append((row_id,))
+
+    return {
+        "table": table,
+        "names": names,
+        "value_cols": value_cols,
+        "inserts": inserts,
+        "updates": updates,
+        "deletes": deletes + duplicates,
+        "duplicates": len(duplicates),
+        "keys": changed_keys,
+        "unchanged": unchanged,
+    }
+
+
+def apply_diff(conn, diff):
+    table = diff["table"]
+    names = diff["names"]
+    if not (diff["deletes"] or diff["updates"] or diff["inserts"]):
+        return
+    drop_key_index(conn, table)
+    if diff["deletes"]:
+        conn.executemany(f"DELETE FROM {table} WHERE id = ?", diff["deletes"])
+    if diff["updates"]:
+        assignments = ", ".join(f"{col} = ?" for col in diff["value_cols"])
+        conn.executemany(f"UPDATE {table} SET {assignments} WHERE id = ?", diff["updates"])
+    if diff["inserts"]:
+        placeholders = ", ".join("?" for _ in names)
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(names)}) VALUES ({placeholders})",
+            diff["inserts"],
+        )
+    create_key_index(conn, table)
+
+
+def bulk_import(sources, db_path=DB_PATH, keep_missing=False, dry_run=False):
+    """
+    Diff and apply {table: [row dicts]} against the catalog database in one
+    transaction. Returns a report {table: {inserted, updated, deleted,
+    unchanged, keys}}; nothing is written when dry_run is set.
+    """
+    if os.path.abspath(db_path) == DB_PATH:
+        create_tables()
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        report = {}
+        for table, rows in sources.items():
+            if not table_columns(conn, table):
+                raise ValueError(f"{db_path} has no {table} table")
+            diff = diff_table(conn, table, rows, keep_missing=keep_missing)
+            if not dry_run:
+                apply_diff(conn, diff)
+            report[table] = {
+                "inserted": len(diff["inserts"]),
+                "updated": len(diff["updates"]),
+                "deleted": len(diff["deletes"]) - diff["duplicates"],
+                "duplicates_removed": diff["duplicates"],
+                "unchanged": diff["unchanged"],
+                "keys": diff["keys"],
+            }
+        conn.execute("ROLLBACK" if dry_run else "COMMIT")
+    except BaseException:
+        # Nothing to roll back when BEGIN itself failed, e.g. a locked database
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return report
+
+
+def format_report(report, dry_run=False):
+    lines = ["Dry run, nothing written:" if dry_run else "Applied catalog changes:"]
+    for table, result in report.items():
+        lines.append(
+            f"  {table}: {result['inserted']} inserted, {result['updated']} updated, "
+            f"{result['deleted']} deleted, {result['unchanged']} unchanged"
+            + (f", {result['duplicates_removed']} duplicate rows removed" if result["duplicates_removed"] else "")
+        )
+        for change in ("inserted", "updated", "deleted"):
+            for key in result["keys"][change]:
+                lines.append(f"    {change[0].upper()} {', '.join(str(k) for k in key)}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Diff and import supplier furler data")
+    parser.add_argument("files", nargs="+", help="Supplier JSON or CSV files")
+    parser.add_argument("--table", help="Table for CSV files / bare JSON lists")
+    parser.add_argument("--db", default=DB_PATH, help="Catalog SQLite database")
+    parser.add_argument("--keep-missing", action="store_true", help="Don't delete rows missing from the input")
+    parser.add_argument("--dry-run", action="store_true", help="Report the changes without writing them")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--build-artifact", action="store_true", help="Recompile src/catalog.bin afterwards")
+    args = parser.parse_args()
+
+    sources = {}
+    for path in args.files:
+        for table, rows in read_source(path, args.table).items():
+            sources.setdefault(table, []).extend(rows)
+    report = bulk_import(sources, args.db, keep_missing=args.keep_missing, dry_run=args.dry_run)
+    if args.json:
+        print(json.dumps(report, indent=2, default=list))
+    else:
+        print(format_report(report, dry_run=args.dry_run))
+    if args.build_artifact and not args.dry_run:
+        from data.build_catalog import build_catalog
+
+        version = build_catalog(args.db)
+        print(f"Published furler catalog {version}")
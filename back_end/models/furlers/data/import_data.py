@@ -123,10 +123,10 @@ def import_harken_rod_adapters():
                     for part_number, rod_diameter, thread in rod_adapters:
                         conn.execute(
                             """
-                            INSERT INTO Harken_Rod_Adapters (part_number, rod_diameter, thread)
-                            VALUES (?, ?, ?)
+                            INSERT INTO Harken_Rod_Adapters (unit_name, part_number, rod_diameter, thread)
+                            VALUES (?, ?, ?, ?)
                             """,
-                            (part_number, rod_diameter, thread)
+                            (unit_name, part_number, rod_diameter, thread)
                         )
         conn.commit()
 
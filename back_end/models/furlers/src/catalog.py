@@ -0,0 +1,474 @@
+"""
+In-memory furler catalog.
+
+The whole catalog is a few hundred rows, so it is read once and held in
+indexed structures: selection criteria as LOA-sorted arrays searched
+with bisect, diameters and pin sizes as sets, and part numbers in dicts keyed
+by unit (and stay diameter) with stay lengths sorted for "shortest length that
+fits" lookups. Each brand's indexes are built the first time that brand is
+looked up. Speccing a furler then runs no SQL at all.
+
+The rows come from the compiled catalog artifact when one is published
+(FURLER_CATALOG_PATH), otherwise from SQLite. A watcher thread swaps in a
+newly published artifact without a restart.
+"""
+
+import os
+import sqlite3
+import threading
+from bisect import bisect_left, bisect_right
+
+from src.catalog_artifact import content_version, read_artifact, read_artifact_version
+from src.config import FURLER_CATALOG_PATH, FURLER_CATALOG_POLL_INTERVAL
+from src.database import DB_PATH
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Each catalog table and the columns read from it, in this order
+CATALOG_QUERIES = {
+    "facnor_selection": "SELECT unit_name, min_loa, max_loa, min_dia, max_dia FROM Facnor_Selection_Criteria ORDER BY id",
+    "facnor_eye_turnbuckle": "SELECT unit_name, stay_diameter FROM Facnor_Requires_Eye_Turnbuckle ORDER BY id",
+    "furlex_selection": "SELECT unit_name, stay_diameter, rod_diameter, righting_moment, displacement FROM Furlex_Selection_Criteria ORDER BY id",
+    "furlex_parts": "SELECT unit_name, stay_diameter, stay_length, sta_lok_part_number, rigging_screw_part_number, stud_terminal_part_number FROM furlex_parts_numbers ORDER BY id",
+    "furlex_link_plates": "SELECT stay_diameter, link_plate_part_number FROM Furlex_Link_plates ORDER BY id",
+    "harken_selection": "SELECT unit_name, min_loa, max_loa, stay_diameters, rod_diameters, clevis_pin_diameters FROM Harken_Selection_Criteria ORDER BY id",
+    "harken_base_units": "SELECT unit_name, base_unit_part_number, stay_length, additional_foil_part_number, additional_connector_part_number FROM Harken_Base_Unit_Part_Numbers ORDER BY id",
+    "harken_toggles": "SELECT unit_name, toggle_part_number, clevis_pin_diameter, type FROM Harken_Toggles ORDER BY id",
+    "harken_rod_adapters": "SELECT unit_name, part_number, rod_diameter, thread FROM Harken_Rod_Adapters ORDER BY id",
+    "profurl_selection": "SELECT unit_name, min_loa, max_loa, max_sa, max_wire_diameter, max_rod_diameter, clevis_pin_size_range FROM Profurl_Selection_Criteria ORDER BY id",
+    "profurl_swageless_eye": "SELECT unit_name, stay_diameter FROM Profurl_Requires_Swageless_Eye ORDER BY id",
+    "profurl_parts": "SELECT unit_name, stay_length, part_number FROM Profurl_Part_Numbers ORDER BY id",
+    "profurl_turnbuckle_cylinders": "SELECT unit_name, part_number FROM Profurl_Turnbuckle_Cylinders ORDER BY id",
+    "profurl_link_plates": "SELECT unit_name, part_number FROM Profurl_Link_Plates ORDER BY id",
+    "profurl_prefeeders": "SELECT unit_name, part_number FROM Profurl_Prefeeders ORDER BY id",
+    "profurl_reefing_kits": "SELECT part_number, models, description FROM Profurl_Reefing_Kits ORDER BY id",
+}
+
+
+def _query_columns(query):
+    return len(query[len("SELECT ") : query.index(" FROM ")].split(","))
+
+
+def _float_list(value):
+    """Parse the comma-separated number lists the importer stores."""
+    return [float(x) for x in value.split(",") if x] if value else []
+
+
+class _LoaIndex:
+    """
+    Selection-criteria rows sorted by min_loa. `lookup(loa)` bisects to the
+    rows that start at or below `loa` and keeps those that end at or above it,
+    returned in catalog (import) order.
+    """
+
+    def __init__(self, rows):
+        # rows: (min_loa, max_loa, position, payload)
+        self._rows = sorted(rows, key=lambda r: (r[0], r[2]))
+        self._min_loas = [r[0] for r in self._rows]
+
+    def lookup(self, loa):
+        end = bisect_right(self._min_loas, loa)
+        hits = [r for r in self._rows[:end] if r[1] >= loa]
+        hits.sort(key=lambda r: r[2])
+        return [r[3] for r in hits]
+
+
+class _LengthIndex:
+    """Rows sorted by stay length for 'shortest length >= requested' lookups."""
+
+    def __init__(self):
+        self._lengths = []
+        self._rows = []
+
+    def add(self, stay_length, row):
+        # Insert after equal lengths so the first imported row wins ties
+        pos = bisect_right(self._lengths, stay_length)
+        self._lengths.insert(pos, stay_length)
+        self._rows.insert(pos, row)
+
+    def ceiling(self, stay_length):
+        pos = bisect_left(self._lengths, stay_length)
+        if pos == len(self._rows):
+            return None
+        return self._lengths[pos], self._rows[pos]
+
+
+class FurlerCatalog:
+    """
+    Indexed, read-only view of every furler catalog table.
+
+    Built from the raw table rows (see CATALOG_QUERIES for their columns) so
+    the same indexes can be filled from SQLite or any other source.
+    """
+
+    def __init__(self, tables, version=None, source=None):
+        self.tables = tables
+        self.version = version
+        self.source = source
+        self._built = set()
+        self._build_lock = threading.Lock()
+
+    def _index(self, brand):
+        """Build the indexes of `brand` from its tables on first use."""
+        if brand in self._built:
+            return
+        with self._build_lock:
+            if brand not in self._built:
+                getattr(self, f"_build_{brand}")(self.tables)
+                self._built.add(brand)
+
+    @classmethod
+    def from_db(cls, db_path=DB_PATH):
+        with sqlite3.connect(db_path) as conn:
+            tables = {
+                name: [tuple(row) for row in conn.execute(query).fetchall()]
+                for name, query in CATALOG_QUERIES.items()
+            }
+        return cls(tables, version=content_version(tables), source=db_path)
+
+    @classmethod
+    def from_artifact(cls, path=FURLER_CATALOG_PATH):
+        version, tables = read_artifact(path)
+        missing = set(CATALOG_QUERIES) - set(tables)
+        if missing:
+            raise ValueError(f"Catalog artifact {path} is missing tables: {sorted(missing)}")
+        outdated = sorted(
+            name
+            for name, query in CATALOG_QUERIES.items()
+            if len(tables[name]) and tables[name].columns != _query_columns(query)
+        )
+        if outdated:
+            raise ValueError(f"Catalog artifact {path} has outdated columns in: {outdated}; rebuild it")
+        return cls(tables, version=version, source=path)
+
+    # --- Facnor ---
+
+    def _build_facnor(self, tables):
+        self._facnor_loa = _LoaIndex(
+            (int(min_loa), int(max_loa), pos, (unit_name, float(min_dia), float(max_dia)))
+            for pos, (unit_name, min_loa, max_loa, min_dia, max_dia) in enumerate(
+                tables["facnor_selection"]
+            )
+        )
+        self._facnor_eye_turnbuckle = {
+            (unit_name, float(dia)) for unit_name, dia in tables["facnor_eye_turnbuckle"]
+        }
+
+    def facnor_units(self, loa, stay_diameter):
+        self._index("facnor")
+        return [
+            unit_name
+            for unit_name, min_dia, max_dia in self._facnor_loa.lookup(loa)
+            if min_dia <= stay_diameter <= max_dia
+        ]
+
+    def facnor_requires_eye_turnbuckle(self, unit_name, stay_diameter):
+        self._index("facnor")
+        return (unit_name, float(stay_diameter)) in self._facnor_eye_turnbuckle
+
+    # --- Furlex ---
+
+    def _build_furlex(self, tables):
+        self._furlex_by_wire = {}
+        self._furlex_rows = []
+        for unit_name, wire_diam, rod_diam, rm, disp in tables["furlex_selection"]:
+            row = (
+                unit_name,
+                float(wire_diam),
+                _float_list(rod_diam),
+                _float_list(rm),
+                _float_list(disp),
+            )
+            self._furlex_rows.append(row)
+            self._furlex_by_wire.setdefault(row[1], []).append(row)
+        self._furlex_parts = {}
+        for unit_name, dia, length, sta_lok, screw, stud in tables["furlex_parts"]:
+            index = self._furlex_parts.setdefault((unit_name, float(dia)), _LengthIndex())
+            index.add(
+                length,
+                {
+                    "stay_length": length,
+                    "sta_lok_part_number": sta_lok,
+                    "rigging_screw_part_number": screw,
+                    "stud_terminal_part_number": stud,
+                },
+            )
+        self._furlex_link_plates = {}
+        for dia, part_number in tables["furlex_link_plates"]:
+            if dia is not None:
+                self._furlex_link_plates.setdefault(float(dia), part_number)
+
+    def furlex_rows(self, stay_diameter, rod=False):
+        """Selection rows (unit_name, wire_diam, rod_diams, max_rm, max_disp) for a stay."""
+        self._index("furlex")
+        if rod:
+            return [r for r in self._furlex_rows if float(stay_diameter) in r[2]]
+        return list(self._furlex_by_wire.get(float(stay_diameter), []))
+
+    def find_furlex_part(self, unit_name, stay_diameter, stay_length):
+        self._index("furlex")
+        index = self._furlex_parts.get((unit_name, float(stay_diameter)))
+        hit = index.ceiling(stay_length) if index else None
+        return dict(hit[1]) if hit else None
+
+    def find_furlex_link_plate(self, stay_diameter):
+        self._index("furlex")
+        return self._furlex_link_plates.get(float(stay_diameter))
+
+    # --- Harken ---
+
+    def _build_harken(self, tables):
+        self._harken_loa = _LoaIndex(
+            (
+                int(min_loa),
+                int(max_loa),
+                pos,
+                (
+                    unit_name,
+                    frozenset(_float_list(wire)),
+                    frozenset(_float_list(rod)),
+                    frozenset(_float_list(pins)),
+                ),
+            )
+            for pos, (unit_name, min_loa, max_loa, wire, rod, pins) in enumerate(
+                tables["harken_selection"]
+            )
+        )
+        self._harken_base_units = {}
+        for unit_name, base, length, foil, connector in tables["harken_base_units"]:
+            if length is None:
+                continue
+            self._harken_base_units.setdefault(unit_name, _LengthIndex()).add(
+                length, (base, length, foil, connector)
+            )
+        self._harken_toggles = {}
+        for unit_name, part_number, pin, toggle_type in tables["harken_toggles"]:
+            self._harken_toggles.setdefault(unit_name, []).append(
+                {
+                    "toggle_part_number": part_number,
+                    "clevis_pin_diameter": pin,
+                    "type": toggle_type,
+                }
+            )
+        self._harken_rod_adapters = {}
+        for unit_name, part_number, rod_dia, thread in tables["harken_rod_adapters"]:
+            # Rows imported before units were recorded fit any unit
+            self._harken_rod_adapters.setdefault((unit_name, float(rod_dia)), []).append(
+                {"part_number": part_number, "rod_diameter": rod_dia, "thread": thread}
+            )
+
+    def harken_units(self, loa, stay_diameter, clevis_pin_diameter, rod):
+        self._index("harken")
+        units = []
+        for unit_name, wire, rods, pins in self._harken_loa.lookup(loa):
+            if stay_diameter not in wire:
+                continue
+            if rod and rods and stay_diameter not in rods:
+                continue
+            if pins and clevis_pin_diameter not in pins:
+                continue
+            units.append(unit_name)
+        return units
+
+    def harken_base_unit(self, unit_name, stay_length):
+        """(base_part_number, stay_length, foil, connector) or None."""
+        self._index("harken")
+        index = self._harken_base_units.get(unit_name)
+        hit = index.ceiling(stay_length) if index and stay_length is not None else None
+        return hit[1] if hit else None
+
+    def harken_toggles(self, unit_name, clevis_pin_diameter=None):
+        self._index("harken")
+        toggles = self._harken_toggles.get(unit_name, [])
+        if clevis_pin_diameter is not None:
+            toggles = [
+                t
+                for t in toggles
+                if float(t["clevis_pin_diameter"]) == float(clevis_pin_diameter)
+            ]
+        return [dict(t) for t in toggles]
+
+    def harken_rod_adapters(self, unit_name, rod_diameter):
+        self._index("harken")
+        adapters = self._harken_rod_adapters.get((unit_name, float(rod_diameter)), [])
+        adapters = adapters + self._harken_rod_adapters.get((None, float(rod_diameter)), [])
+        return [dict(a) for a in adapters]
+
+    # --- Profurl ---
+
+    def _build_profurl(self, tables):
+        self._profurl_loa = _LoaIndex(
+            (
+                int(min_loa),
+                int(max_loa),
+                pos,
+                (
+                    unit_name,
+                    float(max_sa),
+                    float(max_wire),
+                    float(max_rod) if max_rod is not None else None,
+                    frozenset(_float_list(pins)),
+                ),
+            )
+            for pos, (unit_name, min_loa, max_loa, max_sa, max_wire, max_rod, pins) in enumerate(
+                tables["profurl_selection"]
+            )
+        )
+        self._profurl_swageless_eye = {
+            (unit_name, float(dia)) for unit_name, dia in tables["profurl_swageless_eye"]
+        }
+        self._profurl_parts = {}
+        for unit_name, length, part_number in tables["profurl_parts"]:
+            self._profurl_parts.setdefault(unit_name, _LengthIndex()).add(
+                length, part_number
+            )
+        self._profurl_turnbuckle_cylinders = {}
+        for unit_name, part_number in tables["profurl_turnbuckle_cylinders"]:
+            self._profurl_turnbuckle_cylinders.setdefault(unit_name, part_number)
+        self._profurl_link_plates = {}
+        for unit_name, part_number in tables["profurl_link_plates"]:
+            self._profurl_link_plates.setdefault(unit_name, []).append(part_number)
+        self._profurl_prefeeders = {}
+        for unit_name, part_number in tables["profurl_prefeeders"]:
+            self._profurl_prefeeders.setdefault(unit_name, part_number)
+        self._profurl_reefing_kits = [
+            (models.lower(), part_number, description)
+            for part_number, models, description in tables["profurl_reefing_kits"]
+        ]
+        self._profurl_reefing_kits_by_unit = {}
+
+    def profurl_units(self, loa, sail_area, stay_diameter, clevis_pin_diameter, rod=False):
+        self._index("profurl")
+        units = []
+        for unit_name, max_sa, max_wire, max_rod, pins in self._profurl_loa.lookup(loa):
+            if max_sa < sail_area or stay_diameter > max_wire:
+                continue
+            if rod and max_rod is not None and stay_diameter > max_rod:
+                continue
+            if clevis_pin_diameter not in pins:
+                continue
+            units.append(unit_name)
+        return units
+
+    def requires_profurl_swageless_eye(self, unit_name, stay_diameter):
+        self._index("profurl")
+        return (unit_name, float(stay_diameter)) in self._profurl_swageless_eye
+
+    def find_profurl_part(self, unit_name, stay_length):
+        self._index("profurl")
+        index = self._profurl_parts.get(unit_name)
+        hit = index.ceiling(stay_length) if index else None
+        if hit is None:
+            return None
+        return {"stay_length": hit[0], "part_number": hit[1]}
+
+    def profurl_link_plates(self, unit_name):
+        self._index("profurl")
+        return list(self._profurl_link_plates.get(unit_name, []))
+
+    def profurl_turnbuckle_cylinder(self, unit_name):
+        self._index("profurl")
+        return self._profurl_turnbuckle_cylinders.get(unit_name)
+
+    def profurl_prefeeder(self, unit_name):
+        self._index("profurl")
+        return self._profurl_prefeeders.get(unit_name)
+
+    def profurl_reefing_kits(self, unit_name):
+        self._index("profurl")
+        # Kits list the models they fit as free text; match like the old LIKE query
+        kits = self._profurl_reefing_kits_by_unit.get(unit_name)
+        if kits is None:
+            needle = unit_name.lower()
+            kits = [
+                {"part_number": part_number, "description": description}
+                for models, part_number, description in self._profurl_reefing_kits
+                if needle in models
+            ]
+            self._profurl_reefing_kits_by_unit[unit_name] = kits
+        return [dict(k) for k in kits]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def load_catalog(artifact_path=FURLER_CATALOG_PATH, db_path=DB_PATH):
+    """Build a catalog from the artifact if one is published, else from SQLite."""
+    if artifact_path and os.path.exists(artifact_path):
+        return FurlerCatalog.from_artifact(artifact_path)
+    return FurlerCatalog.from_db(db_path)
+
+
+def get_catalog():
+    """The process-wide catalog, loaded on first use."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = load_catalog()
+    return _catalog
+
+
+def reload_catalog(artifact_path=FURLER_CATALOG_PATH, db_path=DB_PATH):
+    """Rebuild the catalog and swap it in; in-flight requests keep the old one."""
+    global _catalog
+    catalog = load_catalog(artifact_path, db_path)
+    with _catalog_lock:
+        _catalog = catalog
+    return catalog
+
+
+class CatalogWatcher:
+    """
+    Polls the artifact path and hot-swaps the catalog when a new version is
+    published there. Publishing is an atomic rename (see write_artifact), so a
+    changed file is always complete. A broken artifact is logged and the
+    current catalog stays in service.
+    """
+
+    def __init__(self, path=FURLER_CATALOG_PATH, interval=FURLER_CATALOG_POLL_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._stat = self._file_stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns, st.st_size
+
+    def start(self):
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="furler-catalog-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def check(self):
+        """Swap in the artifact if it changed. Returns True on a swap."""
+        stat = self._file_stat()
+        if stat is None or stat == self._stat:
+            return False
+        self._stat = stat
+        try:
+            if read_artifact_version(self.path) == get_catalog().version:
+                return False
+            catalog = reload_catalog(self.path)
+        except Exception as e:
+            logger.warning(f"Ignoring furler catalog at {self.path}: {e}")
+            return False
+        logger.info(f"Furler catalog switched to version {catalog.version}")
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,258 @@
+"""
+Compiled furler catalog artifact.
+
+A single binary file holding every catalog table, so replicas can start
+from identical data without running the SQLite import. Layout (little-endian):
+
+    header    magic "FURLCAT\\0", format version (u16), table count (u16),
+              payload CRC32 (u32), catalog version length (u32)
+    version   catalog version, UTF-8
+    directory per table, sorted by name: name length (u16), name,
+              offset (u32), length (u32), rows (u32), columns (u16)
+    payload   rows of tagged values: 0 = NULL, 1 = int64, 2 = float64,
+              3 = UTF-8 string (u32 length + bytes)
+
+Files are published with an atomic rename, so a reader never sees a
+half-written catalog. Reading maps the file and checks the header and CRC
+only. Each table is an ArtifactTable view over the mapping whose rows are
+decoded when they are read, so a table nobody reads is never turned into
+Python objects.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from array import array
+from collections.abc import Sequence
+
+MAGIC = b"FURLCAT\0"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<8sHHII")
+_DIR_NAME = struct.Struct("<H")
+_DIR_ENTRY = struct.Struct("<IIIH")
+_TAG = struct.Struct("<B")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_LEN = struct.Struct("<I")
+
+_NULL, _INT_TAG, _FLOAT_TAG, _STR_TAG = range(4)
+
+
+class CatalogArtifactError(ValueError):
+    """Raised when an artifact is missing, corrupt or of an unknown format."""
+
+
+def _encode_value(value, out):
+    if value is None:
+        out += _TAG.pack(_NULL)
+    elif isinstance(value, int):
+        out += _TAG.pack(_INT_TAG) + _INT.pack(int(value))
+    elif isinstance(value, float):
+        out += _TAG.pack(_FLOAT_TAG) + _FLOAT.pack(value)
+    else:
+        data = str(value).encode("utf-8")
+        out += _TAG.pack(_STR_TAG) + _LEN.pack(len(data)) + data
+
+
+def _encode_table(rows):
+    out = bytearray()
+    for row in rows:
+        for value in row:
+            _encode_value(value, out)
+    return bytes(out)
+
+
+def _decode_row(buf, pos, column_count):
+    """Decode one row starting at `pos`. Returns (row tuple, end position)."""
+    row = []
+    for _ in range(column_count):
+        (tag,) = _TAG.unpack_from(buf, pos)
+        pos += _TAG.size
+        if tag == _NULL:
+            row.append(None)
+        elif tag == _INT_TAG:
+            row.append(_INT.unpack_from(buf, pos)[0])
+            pos += _INT.size
+        elif tag == _FLOAT_TAG:
+            row.append(_FLOAT.unpack_from(buf, pos)[0])
+            pos += _FLOAT.size
+        elif tag == _STR_TAG:
+            (size,) = _LEN.unpack_from(buf, pos)
+            pos += _LEN.size
+            row.append(bytes(buf[pos : pos + size]).decode("utf-8"))
+            pos += size
+        else:
+            raise CatalogArtifactError(f"Unknown value tag {tag}")
+    return tuple(row), pos
+
+
+class ArtifactTable(Sequence):
+    """
+    Read-only rows of one artifact table, decoded from the mapped file on
+    access. Iterating streams the rows; indexing builds the row offsets on
+    first use. The mapping stays open as long as any table refers to it.
+    """
+
+    def __init__(self, buf, offset, length, row_count, column_count):
+        self._buf = buf
+        self._offset = offset
+        self._end = offset + length
+        self._row_count = row_count
+        self._column_count = column_count
+        self._row_offsets = None
+
+    @property
+    def columns(self):
+        return self._column_count
+
+    def __len__(self):
+        return self._row_count
+
+    def __iter__(self):
+        pos = self._offset
+        for _ in range(self._row_count):
+            row, pos = _decode_row(self._buf, pos, self._column_count)
+            yield row
+        if pos != self._end:
+            raise CatalogArtifactError("Table length does not match its rows")
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._row_count))]
+        if index < 0:
+            index += self._row_count
+        if not 0 <= index < self._row_count:
+            raise IndexError("artifact table index out of range")
+        if self._row_offsets is None:
+            offsets = array("Q")
+            pos = self._offset
+            for _ in range(self._row_count):
+                offsets.append(pos)
+                pos = _decode_row(self._buf, pos, self._column_count)[1]
+            self._row_offsets = offsets
+        return _decode_row(self._buf, self._row_offsets[index], self._column_count)[0]
+
+    def __eq__(self, other):
+        if isinstance(other, (ArtifactTable, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"<ArtifactTable rows={self._row_count} columns={self._column_count}>"
+
+
+def content_version(tables):
+    """Version derived from the catalog contents, identical for identical data."""
+    digest = hashlib.sha256()
+    for name in sorted(tables):
+        digest.update(name.encode("utf-8"))
+        digest.update(_encode_table(tables[name]))
+    return digest.hexdigest()[:16]
+
+
+def write_artifact(tables, path, version=None):
+    """
+    Compile `tables` ({name: [row tuples]}) into an artifact at `path`.
+
+    The file is written next to `path` and renamed over it, so concurrent
+    readers see either the old or the new catalog. Returns the version.
+    """
+    version = version or content_version(tables)
+    names = sorted(tables)
+    encoded = [_encode_table(tables[name]) for name in names]
+    version_bytes = version.encode("utf-8")
+
+    directory_size = sum(
+        _DIR_NAME.size + len(name.encode("utf-8")) + _DIR_ENTRY.size for name in names
+    )
+    offset = _HEADER.size + len(version_bytes) + directory_size
+    directory = bytearray()
+    for name, payload in zip(names, encoded):
+        name_bytes = name.encode("utf-8")
+        rows = tables[name]
+        columns = len(rows[0]) if rows else 0
+        directory += _DIR_NAME.pack(len(name_bytes)) + name_bytes
+        directory += _DIR_ENTRY.pack(offset, len(payload), len(rows), columns)
+        offset += len(payload)
+    payload = b"".join(encoded)
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(names), zlib.crc32(payload), len(version_bytes)
+    )
+
+    target_dir = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=target_dir, prefix=".catalog-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(header + version_bytes + bytes(directory) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600; replicas running as other users must read it
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return version
+
+
+def _read_header(buf):
+    if len(buf) < _HEADER.size:
+        raise CatalogArtifactError("Artifact is truncated")
+    magic, format_version, table_count, crc, version_len = _HEADER.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise CatalogArtifactError("Not a furler catalog artifact")
+    if format_version != FORMAT_VERSION:
+        raise CatalogArtifactError(f"Unsupported artifact format {format_version}")
+    start = _HEADER.size
+    version = bytes(buf[start : start + version_len]).decode("utf-8")
+    return version, table_count, crc, start + version_len
+
+
+def read_artifact_version(path):
+    """Read only the catalog version from the header of `path`."""
+    with open(path, "rb") as f:
+        head = f.read(_HEADER.size)
+        if len(head) < _HEADER.size:
+            raise CatalogArtifactError("Artifact is truncated")
+        version_len = _HEADER.unpack_from(head, 0)[4]
+        return _read_header(head + f.read(version_len))[0]
+
+
+def read_artifact(path):
+    """
+    Map the artifact at `path` and return (version, {name: ArtifactTable}).
+
+    Only the header, directory and checksum are read here; rows are decoded
+    when a table is read.
+    """
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError as e:
+        raise CatalogArtifactError(f"No catalog artifact at {path}") from e
+    with f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        version, table_count, crc, pos = _read_header(buf)
+        entries = []
+        for _ in range(table_count):
+            (name_len,) = _DIR_NAME.unpack_from(buf, pos)
+            pos += _DIR_NAME.size
+            name = bytes(buf[pos : pos + name_len]).decode("utf-8")
+            pos += name_len
+            entries.append((name, *_DIR_ENTRY.unpack_from(buf, pos)))
+            pos += _DIR_ENTRY.size
+        if zlib.crc32(buf[pos:]) != crc:
+            raise CatalogArtifactError("Artifact checksum mismatch")
+    except BaseException:
+        buf.close()
+        raise
+    tables = {
+        name: ArtifactTable(buf, offset, length, rows, columns)
+        for name, offset, length, rows, columns in entries
+    }
+    return version, tables
@@ -0,0 +1,133 @@
+"""
+Change-feed subscribers for the records the yacht auto-spec reads.
+
+Saildata and hull responses are cached with a long TTL and dropped precisely
+when their service reports a write for that yacht on /saildata/changes or
+/hull/changes, so readers no longer need to refetch on every request to stay
+current.
+"""
+
+import threading
+import time
+
+import requests
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RecordCache:
+    """
+    Thread-safe TTL cache of one service's records keyed by yacht_id.
+
+    `version()` is taken before a fetch and passed to `set()`, so a response
+    that raced with an invalidation is never stored. The cache is bypassed
+    until a subscriber marks it live, because without the change feed a long
+    TTL would serve stale data.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.live = False
+        self._entries = {}
+        self._versions = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def get(self, yacht_id):
+        if not self.live:
+            return None
+        with self._lock:
+            entry = self._entries.get(yacht_id)
+            if entry is None:
+                return None
+            data, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[yacht_id]
+                return None
+            return data
+
+    def version(self, yacht_id):
+        with self._lock:
+            return self._epoch, self._versions.get(yacht_id, 0)
+
+    def set(self, yacht_id, data, version=None):
+        if not self.live:
+            return
+        with self._lock:
+            current = (self._epoch, self._versions.get(yacht_id, 0))
+            if version is not None and version != current:
+                return
+            self._entries[yacht_id] = (data, time.monotonic() + self.ttl)
+
+    def invalidate(self, yacht_id):
+        with self._lock:
+            self._entries.pop(yacht_id, None)
+            self._versions[yacht_id] = self._versions.get(yacht_id, 0) + 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self._epoch += 1
+
+
+class ChangeFeedSubscriber:
+    """
+    Background long-poll loop over a service's change feed, {api_url}/{feed}/changes.
+
+    Every reported change invalidates that yacht in `cache`. If the feed asks
+    for a reset the whole cache is cleared. While the feed is unreachable the
+    cache is switched off, since events may be missed.
+    """
+
+    def __init__(self, api_url, feed, cache, poll_timeout=25.0, retry_delay=5.0):
+        self.api_url = api_url
+        self.feed = feed
+        self.cache = cache
+        self.poll_timeout = poll_timeout
+        self.retry_delay = retry_delay
+        self._since = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.feed}-changes", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        params = {"timeout": self.poll_timeout}
+        if self._since is not None:
+            params["since"] = self._since
+        resp = requests.get(
+            f"{self.api_url}/{self.feed}/changes",
+            params=params,
+            timeout=self.poll_timeout + 5,
+        )
+        resp.raise_for_status()
+        body = resp.json()
+        if body.get("reset") or self._since is None:
+            self.cache.clear()
+            self.cache.live = True
+        for change in body.get("changes", []):
+            logger.debug(f"[DEBUG] {self.feed} change: {change}")
+            self.cache.invalidate(change["yacht_id"])
+        self._since = body.get("last_seq", self._since)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"{self.feed} change feed unavailable: {e}")
+                self.cache.live = False
+                self.cache.clear()
+                self._since = None
+                self._stop.wait(self.retry_delay)
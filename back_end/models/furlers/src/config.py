@@ -0,0 +1,25 @@
+# config.py for the furlers microservice
+import os
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Compiled catalog artifact (see data/build_catalog.py). When it is missing
+# the catalog is read from the SQLite database instead.
+FURLER_CATALOG_PATH = os.environ.get(
+    "FURLER_CATALOG_PATH", os.path.join(BASE_DIR, "catalog.bin")
+)
+# Seconds between checks for a newly published artifact; 0 disables hot-swap
+FURLER_CATALOG_POLL_INTERVAL = float(
+    os.environ.get("FURLER_CATALOG_POLL_INTERVAL", "10")
+)
+
+# Services the yacht auto-spec pulls its inputs from
+HULL_API_URL = os.environ.get("HULL_API_URL", "http://hull_structure:8004")
+SAILDATA_API_URL = os.environ.get("SAILDATA_API_URL", "http://saildata:8001")
+# Hull and saildata are cached for this long; their change feeds invalidate them early
+HULL_CACHE_TTL = float(os.environ.get("HULL_CACHE_TTL", "3600"))
+SAILDATA_CACHE_TTL = float(os.environ.get("SAILDATA_CACHE_TTL", "3600"))
+HULL_EVENTS_ENABLED = os.environ.get("HULL_EVENTS_ENABLED", "1") == "1"
+SAILDATA_EVENTS_ENABLED = os.environ.get("SAILDATA_EVENTS_ENABLED", "1") == "1"
+# Distinct (inputs, catalog version) results kept for the yacht auto-spec
+FURLER_RESULT_CACHE_SIZE = int(os.environ.get("FURLER_RESULT_CACHE_SIZE", "1024"))
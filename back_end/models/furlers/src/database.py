@@ -81,6 +81,7 @@ def create_tables():
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS Harken_Rod_Adapters (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
+            unit_name TEXT,
             part_number TEXT NOT NULL,
             rod_diameter REAL NOT NULL,
             thread TEXT NOT NULL
@@ -134,6 +135,10 @@ def create_tables():
             models TEXT NOT NULL,
             description TEXT NOT NULL
             )''')
+        # Rod adapters were first stored without the unit they fit
+        columns = [row[1] for row in cursor.execute("PRAGMA table_info(Harken_Rod_Adapters)")]
+        if "unit_name" not in columns:
+            cursor.execute("ALTER TABLE Harken_Rod_Adapters ADD COLUMN unit_name TEXT")
 
 def get_facnor_selection_criteria():
     with get_connection() as conn:
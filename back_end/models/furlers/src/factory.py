@@ -4,117 +4,75 @@ from src.harken import HarkenFurler
 from src.profurl import ProfurlFurler
 
 
-from src.database import (
-    get_facnor_selection_criteria,
-    get_facnor_requires_eye_turnbuckle,
-    get_furlex_selection_criteria,
-    get_harken_selection_criteria,
-    get_profurl_selection_criteria,
-    requires_profurl_swageless_eye
-)
+from src.catalog import get_catalog
 
 
 class Factory:
     """
     Factory class to create instances of various classes.
+
+    All lookups go through the in-memory FurlerCatalog; pass `catalog` to
+    spec against a specific catalog instead of the process-wide one.
     """
     @staticmethod
-    def spec_facnor(loa, stay_diameter, stay_length):
+    def spec_facnor(loa, stay_diameter, stay_length, catalog=None):
+        catalog = catalog or get_catalog()
         possible_furlers = []
-        for row in get_facnor_selection_criteria():
-            unit_name = row['unit_name']
-            min_loa = row['min_loa']
-            max_loa = row['max_loa']
-            min_dia = row['min_dia']
-            max_dia = row['max_dia']
-            if min_loa <= loa <= max_loa and min_dia <= stay_diameter <= max_dia:
-                requires_eye_turnbuckle = (unit_name, stay_diameter) in get_facnor_requires_eye_turnbuckle()
-                model = FacnorFurler(
-                    unit_name, stay_diameter, stay_length, requires_eye_turnbuckle
-                )
-                possible_furlers.append(model)
+        for unit_name in catalog.facnor_units(loa, stay_diameter):
+            requires_eye_turnbuckle = catalog.facnor_requires_eye_turnbuckle(unit_name, stay_diameter)
+            model = FacnorFurler(
+                unit_name, stay_diameter, stay_length, requires_eye_turnbuckle
+            )
+            possible_furlers.append(model)
         return possible_furlers 
     
     @staticmethod
-    def spec_furlex(stay_diameter, rm, displacement, stay_length, rod=False, fractional_rig=False):
+    def spec_furlex(stay_diameter, rm, displacement, stay_length, rod=False, fractional_rig=False, catalog=None):
+        catalog = catalog or get_catalog()
         possible_furlers = []
-        for unit_name, wire_diam, rod_diam, max_rm, max_disp in get_furlex_selection_criteria():
-            if rod:
-                if rod_diam is None:
-                    continue
-                if isinstance(rod_diam, tuple):
-                    if stay_diameter not in rod_diam:
-                        continue
-                else:
-                    if stay_diameter != rod_diam:
-                        continue
-            else:
-                if stay_diameter != wire_diam:
-                    continue
+        for unit_name, wire_diam, rod_diam, max_rm, max_disp in catalog.furlex_rows(stay_diameter, rod=rod):
             if fractional_rig:
                 if rm > max_rm[1] or displacement > max_disp[1]:
                     continue
             else:
                 if rm > max_rm[0] or displacement > max_disp[0]:
                     continue
-            model = Furlex(unit_name=unit_name, stay_diameter=stay_diameter, stay_length=stay_length, rod_diameter=rod_diam if rod else None)
+            model = Furlex(unit_name=unit_name, stay_diameter=stay_diameter, stay_length=stay_length, rod_diameter=rod_diam if rod else None, catalog=catalog)
             possible_furlers.append(model)
         return possible_furlers
     
     @staticmethod
-    def spec_harken(loa, stay_diameter, clevis_pin_diam, rod, stay_length):
-        possible_furlers = []
-        for row in get_harken_selection_criteria():
-            unit_name = row['unit_name']
-            min_loa = row['min_loa']
-            max_loa = row['max_loa']
-            wire_diams = row['stay_diameters']
-            rod_diams = row['rod_diameters']
-            pin_sizes = row['clevis_pin_diameters']
-            if min_loa <= loa <= max_loa and stay_diameter in wire_diams:
-                if rod and rod_diams is not None and stay_diameter not in rod_diams:
-                    continue
-                if pin_sizes and clevis_pin_diam not in pin_sizes:
-                    continue
-                furler = HarkenFurler(unit_name, stay_diameter, clevis_pin_diam, rod, stay_length)
-                possible_furlers.append(furler)
-            else:
-                continue
-        return possible_furlers if possible_furlers else []
+    def spec_harken(loa, stay_diameter, clevis_pin_diam, rod, stay_length, catalog=None):
+        catalog = catalog or get_catalog()
+        return [
+            HarkenFurler(unit_name, stay_diameter, clevis_pin_diam, rod, stay_length, catalog=catalog)
+            for unit_name in catalog.harken_units(loa, stay_diameter, clevis_pin_diam, rod)
+        ]
     
     @staticmethod
-    def spec_profurl(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=False, stay_length=None):
+    def spec_profurl(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=False, stay_length=None, catalog=None):
+        catalog = catalog or get_catalog()
         possible_furlers = []
-        for row in get_profurl_selection_criteria():
-            unit_name = row['unit_name']
-            min_loa = row['min_loa']
-            max_loa = row['max_loa']
-            max_sa = row['max_sa']
-            max_wire_dia = row['max_wire_diameter']
-            max_rod_dia = row['max_rod_diameter']
-            clevis_pin_range = row['clevis_pin_size_range']
-            if min_loa <= loa <= max_loa and max_sa >= sail_area and stay_diameter <= max_wire_dia:
-                if rod and max_rod_dia is not None and stay_diameter > max_rod_dia:
-                    continue
-                if clevis_pin_diameter not in clevis_pin_range:
-                    continue
-                requires_swageless_eye = requires_profurl_swageless_eye(unit_name, stay_diameter)
-                model = ProfurlFurler(
-                    unit_name, stay_diameter, clevis_pin_diameter, requires_swage_swageless_eye=requires_swageless_eye, stay_length=stay_length
-                )
-                possible_furlers.append(model)
+        for unit_name in catalog.profurl_units(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=rod):
+            requires_swageless_eye = catalog.requires_profurl_swageless_eye(unit_name, stay_diameter)
+            model = ProfurlFurler(
+                unit_name, stay_diameter, clevis_pin_diameter, requires_swage_swageless_eye=requires_swageless_eye, stay_length=stay_length, catalog=catalog
+            )
+            possible_furlers.append(model)
         return possible_furlers
     
     @staticmethod
-    def spec_furlers(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=False, stay_length=None, rm=None, displacement=None, fractional_rig=False):
+    def spec_furlers(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=False, stay_length=None, rm=None, displacement=None, fractional_rig=False, catalog=None):
         """
         Unified entry point to spec all furler brands. Returns a dict of brand: [furlers].
         """
+        # Pin one catalog for the whole call so a reload can't mix versions
+        catalog = catalog or get_catalog()
         return {
-            'facnor': Factory.spec_facnor(loa, stay_diameter, stay_length),
-            'furlex': Factory.spec_furlex(stay_diameter, rm, displacement, stay_length, rod=rod, fractional_rig=fractional_rig),
-            'harken': Factory.spec_harken(loa, stay_diameter, clevis_pin_diameter, rod, stay_length),
-            'profurl': Factory.spec_profurl(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=rod, stay_length=stay_length)
+            'facnor': Factory.spec_facnor(loa, stay_diameter, stay_length, catalog=catalog),
+            'furlex': Factory.spec_furlex(stay_diameter, rm, displacement, stay_length, rod=rod, fractional_rig=fractional_rig, catalog=catalog),
+            'harken': Factory.spec_harken(loa, stay_diameter, clevis_pin_diameter, rod, stay_length, catalog=catalog),
+            'profurl': Factory.spec_profurl(loa, sail_area, stay_diameter, clevis_pin_diameter, rod=rod, stay_length=stay_length, catalog=catalog)
         }
 
 
@@ -1,20 +1,21 @@
-from src.database import find_furlex_part, find_furlex_link_plate
+from src.catalog import get_catalog
 
 class Furlex:
-    def __init__(self, unit_name, stay_diameter, rod_diameter=None, stay_length=None):
+    def __init__(self, unit_name, stay_diameter, rod_diameter=None, stay_length=None, catalog=None):
+        catalog = catalog or get_catalog()
         self.unit_name = unit_name
         self.stay_diameter = stay_diameter
         self.rod_diameter = rod_diameter
         self.stay_length = stay_length
         self.part_numbers = []
-        self.link_plate = self.get_link_plate()
+        self.link_plate = self.get_link_plate(catalog)
 
-        # Use the database to select the part numbers
+        # Use the catalog to select the part numbers
         if stay_length is not None:
-            part_info = find_furlex_part(unit_name, stay_diameter, stay_length)
+            part_info = catalog.find_furlex_part(unit_name, stay_diameter, stay_length)
         else:
             # If no stay_length given, use the shortest available
-            part_info = find_furlex_part(unit_name, stay_diameter, 0)
+            part_info = catalog.find_furlex_part(unit_name, stay_diameter, 0)
         if part_info:
             self.stay_length = part_info['stay_length']
             self.part_numbers = [
@@ -44,8 +45,8 @@ class Furlex:
                 return self.part_numbers[2] 
         return None
     
-    def get_link_plate(self):
+    def get_link_plate(self, catalog=None):
         """
         Returns the link plate part number for the current furler model.
         """
-        return find_furlex_link_plate(self.stay_diameter)
+        return (catalog or get_catalog()).find_furlex_link_plate(self.stay_diameter)
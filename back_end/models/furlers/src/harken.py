@@ -1,10 +1,8 @@
-from src.database import (
-    find_furlex_part, find_furlex_link_plate,
-    get_harken_toggles, get_harken_rod_adapters, get_connection
-)
+from src.catalog import get_catalog
 
 class HarkenFurler:
-    def __init__(self, unit_name, stay_diameter, clevis_pin_diam, rod, stay_length):
+    def __init__(self, unit_name, stay_diameter, clevis_pin_diam, rod, stay_length, catalog=None):
+        catalog = catalog or get_catalog()
         self.unit_name = unit_name
         self.stay_diameter = stay_diameter
         self.clevis_pin_diam = clevis_pin_diam
@@ -16,35 +14,20 @@ class HarkenFurler:
         self.additional_connector = None
         self.rod_adapters = []
 
-        # Get base part number and foil/connector from DB
         # Find the base unit part with the smallest stay_length >= requested
-        with get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''SELECT base_unit_part_number, stay_length, additional_foil_part_number, additional_connector_part_number
-                   FROM Harken_Base_Unit_Part_Numbers
-                   WHERE unit_name = ? AND stay_length >= ?
-                   ORDER BY stay_length ASC LIMIT 1''',
-                (unit_name, stay_length)
-            )
-            row = cursor.fetchone()
-            if row:
-                self.base_part_number = row[0]
-                self.stay_length = row[1]
-                self.additional_foil = row[2]
-                self.additional_connector = row[3]
+        base_unit = catalog.harken_base_unit(unit_name, stay_length)
+        if base_unit:
+            self.base_part_number = base_unit[0]
+            self.stay_length = base_unit[1]
+            self.additional_foil = base_unit[2]
+            self.additional_connector = base_unit[3]
 
-        # Get toggles from DB
-        self.toggles = get_harken_toggles(unit_name)
-        # Filter toggles by clevis_pin_diam if provided
-        if clevis_pin_diam is not None:
-            self.toggles = [t for t in self.toggles if float(t['clevis_pin_diameter']) == float(clevis_pin_diam)]
+        # Toggles for this unit, filtered by clevis_pin_diam if provided
+        self.toggles = catalog.harken_toggles(unit_name, clevis_pin_diam)
 
-        # Get rod adapters from DB only if rod is True
+        # Rod adapters for this unit matching the rod diameter, only if rod is True
         if self.rod:
-            # Only include rod adapters matching this unit and rod diameter
-            all_adapters = get_harken_rod_adapters()
-            self.rod_adapters = [a for a in all_adapters if float(a['rod_diameter']) == float(self.stay_diameter)]
+            self.rod_adapters = catalog.harken_rod_adapters(unit_name, self.stay_diameter)
         else:
             self.rod_adapters = []
 
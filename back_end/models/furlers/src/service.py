@@ -1,9 +1,60 @@
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 from src.factory import Factory
-from typing import List, Dict, Any
+from src.catalog import CatalogWatcher, get_catalog
+from src.config import (
+    HULL_API_URL,
+    SAILDATA_API_URL,
+    HULL_CACHE_TTL,
+    SAILDATA_CACHE_TTL,
+    HULL_EVENTS_ENABLED,
+    SAILDATA_EVENTS_ENABLED,
+    FURLER_RESULT_CACHE_SIZE,
+)
+from src.change_events import ChangeFeedSubscriber, RecordCache
+from src.yacht_spec import (
+    MissingSpecInputs,
+    SpecResultCache,
+    YachtNotFound,
+    YachtSpecInputs,
+)
+from typing import List, Dict, Any, Optional
+import requests
 
 app = FastAPI()
+catalog_watcher = CatalogWatcher()
+hull_cache = RecordCache(HULL_CACHE_TTL)
+hull_subscriber = ChangeFeedSubscriber(HULL_API_URL, "hull", hull_cache)
+saildata_cache = RecordCache(SAILDATA_CACHE_TTL)
+saildata_subscriber = ChangeFeedSubscriber(SAILDATA_API_URL, "saildata", saildata_cache)
+yacht_inputs = YachtSpecInputs(HULL_API_URL, SAILDATA_API_URL, hull_cache, saildata_cache)
+yacht_results = SpecResultCache(FURLER_RESULT_CACHE_SIZE)
+
+
+@app.on_event("startup")
+def load_furler_catalog():
+    # Map the catalog up front; its indexes are built on first lookup
+    get_catalog()
+    catalog_watcher.start()
+    if HULL_EVENTS_ENABLED:
+        hull_subscriber.start()
+    if SAILDATA_EVENTS_ENABLED:
+        saildata_subscriber.start()
+
+
+@app.on_event("shutdown")
+def stop_catalog_watcher():
+    catalog_watcher.stop()
+    hull_subscriber.stop()
+    saildata_subscriber.stop()
+
+
+@app.get("/spec_furlers/catalog")
+def catalog_info():
+    """Version and source of the catalog this replica is serving."""
+    catalog = get_catalog()
+    return {"version": catalog.version, "source": catalog.source}
+
 
 class FurlerSpecRequest(BaseModel):
     loa: int
@@ -16,8 +67,14 @@ class FurlerSpecRequest(BaseModel):
     displacement: float = 0
     fractional_rig: bool = False
 
-@app.post("/spec_furlers")
-def spec_furlers_api(spec: FurlerSpecRequest) -> Dict[str, List[Any]]:
+def serialize(obj):
+    # Convert results to JSON-serializable format
+    if hasattr(obj, "__dict__"):
+        return obj.__dict__
+    return str(obj)
+
+
+def run_spec(spec: FurlerSpecRequest, catalog=None) -> Dict[str, List[Any]]:
     results = Factory.spec_furlers(
         loa=spec.loa,
         sail_area=spec.sail_area,
@@ -27,11 +84,81 @@ def spec_furlers_api(spec: FurlerSpecRequest) -> Dict[str, List[Any]]:
         stay_length=spec.stay_length,
         rm=spec.rm,
         displacement=spec.displacement,
-        fractional_rig=spec.fractional_rig
+        fractional_rig=spec.fractional_rig,
+        catalog=catalog
     )
-    # Convert results to JSON-serializable format
-    def serialize(obj):
-        if hasattr(obj, "__dict__"):
-            return obj.__dict__
-        return str(obj)
     return {brand: [serialize(f) for f in furlers] for brand, furlers in results.items()}
+
+
+@app.post("/spec_furlers")
+def spec_furlers_api(spec: FurlerSpecRequest) -> Dict[str, List[Any]]:
+    return run_spec(spec)
+
+
+@app.post("/spec_furlers/batch")
+def spec_furlers_batch_api(specs: List[FurlerSpecRequest]) -> List[Dict[str, List[Any]]]:
+    """
+    Spec many stays in one call. Identical requests are only evaluated once;
+    results come back in the same order as the input list.
+    """
+    catalog = get_catalog()
+    unique = {}
+    keys = []
+    for spec in specs:
+        key = tuple(sorted(spec.dict().items()))
+        if key not in unique:
+            unique[key] = run_spec(spec, catalog=catalog)
+        keys.append(key)
+    return [unique[key] for key in keys]
+
+
+@app.get("/spec_furlers/yacht/{yacht_id}")
+def spec_furlers_for_yacht(
+    yacht_id: int,
+    stay_diameter: Optional[float] = None,
+    stay_length: Optional[float] = None,
+    clevis_pin_diameter: Optional[float] = None,
+    rm: Optional[float] = None,
+    rod: Optional[bool] = None,
+    fractional_rig: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    Spec furlers for a stored yacht. Inputs come from its hull and saildata
+    records plus the forestay details passed as query parameters; see
+    src/yacht_spec.py for where each one comes from.
+    """
+    overrides = {
+        "stay_diameter": stay_diameter,
+        "stay_length": stay_length,
+        "clevis_pin_diameter": clevis_pin_diameter,
+        "rm": rm,
+        "rod": rod,
+        "fractional_rig": fractional_rig,
+    }
+    try:
+        inputs, assumed = yacht_inputs.resolve(yacht_id, overrides)
+        spec = FurlerSpecRequest(**inputs)
+    except YachtNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except MissingSpecInputs as e:
+        raise HTTPException(status_code=422, detail={"message": str(e), "missing": e.missing})
+    except ValidationError as e:
+        raise HTTPException(
+            status_code=422,
+            detail={"message": f"Yacht {yacht_id} has invalid furler inputs", "errors": e.errors()},
+        )
+    except requests.RequestException as e:
+        raise HTTPException(status_code=502, detail=f"Input service unavailable: {e}")
+    catalog = get_catalog()
+    key = (catalog.version, tuple(sorted(spec.dict().items())))
+    furlers = yacht_results.get(key)
+    if furlers is None:
+        furlers = run_spec(spec, catalog=catalog)
+        yacht_results.set(key, furlers)
+    return {
+        "yacht_id": yacht_id,
+        "inputs": spec.dict(),
+        "assumed": assumed,
+        "catalog_version": catalog.version,
+        "furlers": furlers,
+    }
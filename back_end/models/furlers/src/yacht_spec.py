@@ -0,0 +1,193 @@
+"""
+Furler spec inputs for a yacht_id.
+
+Gathers what /spec_furlers needs from the hull_structure and saildata
+services so callers only pass a yacht_id and the forestay details:
+
+    loa, displacement      hull bundle (loa rounded to whole mm, displacement
+                           kg -> tonnes, as the Furlex criteria use)
+    sail_area              saildata derived foretriangle_area (m^2)
+    stay_length            request, else hypot(I, J)
+    stay_diameter          request
+    clevis_pin_diameter    request, else the usual fork pin for a wire stay
+                           of that diameter
+    rm                     request, else 0 (Furlex limits not checked)
+    rod                    request, else False
+    fractional_rig         request, else saildata mh_frac
+
+The forestay lives in the base yacht's standing rigging, which neither
+service holds: the orchestrator's /yacht/{yacht_id}/furlers reads it and
+passes stay_diameter and stay_length on. Inputs filled in by default rather
+than from a record are reported as `assumed`.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from math import sqrt
+import threading
+
+import requests
+
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+REQUIRED_INPUTS = ("loa", "sail_area", "stay_diameter", "clevis_pin_diameter", "stay_length")
+
+# Clevis pin (mm) of the usual fork terminal for 1x19 wire of each diameter (mm)
+CLEVIS_PIN_FOR_WIRE = {
+    3: 6.35,
+    4: 7.9,
+    5: 9.5,
+    6: 11.1,
+    7: 12.7,
+    8: 15.9,
+    10: 15.9,
+    12: 19.1,
+    14: 22.2,
+    16: 25.4,
+}
+
+
+class YachtNotFound(LookupError):
+    """Neither hull nor saildata exists for the yacht."""
+
+
+class MissingSpecInputs(ValueError):
+    """The yacht's records don't provide every input the spec needs."""
+
+    def __init__(self, yacht_id, missing):
+        self.missing = missing
+        super().__init__(f"Yacht {yacht_id} is missing furler inputs: {', '.join(missing)}")
+
+
+def _mm_to_m(val):
+    """Convert mm to meters if value is likely in mm (val > 100)."""
+    return val / 1000 if val and val > 100 else val
+
+
+def _whole_mm(val):
+    return int(round(val)) if val is not None else None
+
+
+class YachtSpecInputs:
+    """
+    Fetches and caches the hull bundle and saildata for a yacht.
+
+    Both records are fetched concurrently and each is cached until its
+    service's change feed reports a write for the yacht.
+    """
+
+    def __init__(self, hull_api, saildata_api, hull_cache, saildata_cache):
+        self.hull_api = hull_api
+        self.saildata_api = saildata_api
+        self.hull_cache = hull_cache
+        self.saildata_cache = saildata_cache
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="furler-inputs")
+
+    def _get_json(self, url):
+        resp = requests.get(url, timeout=5)
+        if resp.status_code == 404:
+            return None
+        resp.raise_for_status()
+        return resp.json()
+
+    def _fetch(self, cache, url, yacht_id):
+        cached = cache.get(yacht_id)
+        if cached is not None:
+            return cached
+        version = cache.version(yacht_id)
+        data = self._get_json(url)
+        if data:
+            cache.set(yacht_id, data, version)
+        return data
+
+    def fetch(self, yacht_id):
+        """(hull bundle, saildata) for the yacht, either may be None."""
+        hull = self._pool.submit(
+            self._fetch, self.hull_cache, f"{self.hull_api}/hull/bundle/{yacht_id}", yacht_id
+        )
+        saildata = self._pool.submit(
+            self._fetch, self.saildata_cache, f"{self.saildata_api}/saildata/{yacht_id}", yacht_id
+        )
+        return hull.result(), saildata.result()
+
+    def invalidate(self, yacht_id):
+        self.hull_cache.invalidate(yacht_id)
+        self.saildata_cache.invalidate(yacht_id)
+
+    def resolve(self, yacht_id, overrides=None):
+        """
+        Return (FurlerSpecRequest fields, names of assumed inputs) for a
+        yacht. Values in `overrides` that are not None win over the records.
+        """
+        bundle, saildata = self.fetch(yacht_id)
+        if not bundle and not saildata:
+            raise YachtNotFound(f"No hull or saildata for yacht {yacht_id}")
+        hull = (bundle or {}).get("hull") or {}
+        saildata = saildata or {}
+        derived = saildata.get("derived") or {}
+        overrides = {key: value for key, value in (overrides or {}).items() if value is not None}
+
+        i, j = saildata.get("i"), saildata.get("j")
+        sail_area = derived.get("foretriangle_area")
+        if sail_area is None and i and j:
+            sail_area = 0.5 * _mm_to_m(i) * _mm_to_m(j)
+        displacement = hull.get("displacement")
+        mh_frac = saildata.get("mh_frac")
+
+        inputs = {
+            "loa": hull.get("loa"),
+            "sail_area": sail_area,
+            "stay_diameter": None,
+            "clevis_pin_diameter": None,
+            "stay_length": round(sqrt(i**2 + j**2)) if i and j else None,
+            "rm": 0,
+            "displacement": displacement / 1000 if displacement else 0,
+            "rod": False,
+            "fractional_rig": str(mh_frac or "").lower().startswith("frac"),
+        }
+        inputs.update(overrides)
+        # The spec takes whole millimetres; hull and rigging records store REALs
+        inputs["loa"] = _whole_mm(inputs["loa"])
+        inputs["stay_length"] = _whole_mm(inputs["stay_length"])
+
+        assumed = []
+        if inputs["clevis_pin_diameter"] is None and not inputs["rod"]:
+            pin = CLEVIS_PIN_FOR_WIRE.get(inputs["stay_diameter"])
+            if pin is not None:
+                inputs["clevis_pin_diameter"] = pin
+                assumed.append("clevis_pin_diameter")
+        if "rm" not in overrides:
+            assumed.append("rm")
+        missing = [key for key in REQUIRED_INPUTS if inputs.get(key) is None]
+        if missing:
+            raise MissingSpecInputs(yacht_id, missing)
+        return inputs, assumed
+
+
+class SpecResultCache:
+    """
+    Bounded LRU of spec results keyed by (catalog version, inputs). A result
+    stays valid until an input changes or a new catalog is swapped in, since
+    either produces a different key.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
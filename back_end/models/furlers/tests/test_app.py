@@ -0,0 +1,353 @@
+import pytest
+from fastapi.testclient import TestClient
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../")))
+from src.catalog import CATALOG_QUERIES, CatalogWatcher, FurlerCatalog, get_catalog, reload_catalog
+from src.catalog_artifact import (
+    ArtifactTable,
+    CatalogArtifactError,
+    read_artifact,
+    read_artifact_version,
+    write_artifact,
+)
+from src.change_events import RecordCache
+from src.service import app
+from src.yacht_spec import MissingSpecInputs, YachtNotFound, YachtSpecInputs
+
+client = TestClient(app)
+
+HULL_API = "http://hull"
+SAILDATA_API = "http://saildata"
+
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+def _fake_services(monkeypatch, hulls, saildata):
+    """Serve hull bundles and saildata from dicts; returns the list of URLs fetched."""
+    fetched = []
+
+    def fake_get(url, timeout=None):
+        fetched.append(url)
+        yacht_id = int(url.rsplit("/", 1)[-1])
+        records = hulls if url.startswith(HULL_API) else saildata
+        if yacht_id not in records:
+            return _FakeResponse({"detail": "Not found"}, status_code=404)
+        return _FakeResponse(records[yacht_id])
+
+    monkeypatch.setattr("src.yacht_spec.requests.get", fake_get)
+    return fetched
+
+
+def _inputs():
+    hull_cache, saildata_cache = RecordCache(60), RecordCache(60)
+    hull_cache.live = saildata_cache.live = True
+    return YachtSpecInputs(HULL_API, SAILDATA_API, hull_cache, saildata_cache)
+
+
+HULL = {"hull": {"loa": 10500.4, "displacement": 5000.0}, "keel": None, "rudder": None}
+SAILDATA = {"i": 12000.0, "j": 4000.0, "mh_frac": "Frac", "derived": {"foretriangle_area": 24.0}}
+
+
+def test_resolve_reads_hull_and_saildata(monkeypatch):
+    _fake_services(monkeypatch, {1: HULL}, {1: SAILDATA})
+    inputs, assumed = _inputs().resolve(1, {"stay_diameter": 8.0, "stay_length": 12600.7})
+    assert inputs == {
+        "loa": 10500,
+        "sail_area": 24.0,
+        "stay_diameter": 8.0,
+        "clevis_pin_diameter": 15.9,
+        "stay_length": 12601,
+        "rm": 0,
+        "displacement": 5.0,
+        "rod": False,
+        "fractional_rig": True,
+    }
+    assert assumed == ["clevis_pin_diameter", "rm"]
+
+    inputs, assumed = _inputs().resolve(1, {"stay_diameter": 8, "clevis_pin_diameter": 12.7, "rm": 20})
+    assert inputs["clevis_pin_diameter"] == 12.7 and inputs["rm"] == 20
+    # Without a forestay length the stay runs from the hounds to the stem
+    assert inputs["stay_length"] == 12649
+    assert assumed == []
+
+
+def test_resolve_reports_what_is_missing(monkeypatch):
+    _fake_services(monkeypatch, {1: HULL}, {1: SAILDATA})
+    with pytest.raises(YachtNotFound):
+        _inputs().resolve(2)
+    with pytest.raises(MissingSpecInputs) as e:
+        _inputs().resolve(1)
+    assert e.value.missing == ["stay_diameter", "clevis_pin_diameter"]
+    # A rod forestay has no standard pin to assume
+    with pytest.raises(MissingSpecInputs) as e:
+        _inputs().resolve(1, {"stay_diameter": 8, "rod": True})
+    assert e.value.missing == ["clevis_pin_diameter"]
+
+
+def test_resolve_caches_until_the_feed_reports_a_change(monkeypatch):
+    fetched = _fake_services(monkeypatch, {1: HULL}, {1: SAILDATA})
+    inputs = _inputs()
+    inputs.resolve(1, {"stay_diameter": 8})
+    inputs.resolve(1, {"stay_diameter": 8})
+    assert len(fetched) == 2
+
+    inputs.hull_cache.invalidate(1)
+    inputs.resolve(1, {"stay_diameter": 8})
+    assert fetched[2:] == [f"{HULL_API}/hull/bundle/1"]
+
+
+def test_spec_furlers_for_yacht_endpoint(monkeypatch):
+    import src.service as service
+
+    _fake_services(monkeypatch, {1: HULL, 3: {"hull": {"loa": 10500.0, "displacement": 5000.0}}}, {1: SAILDATA})
+    monkeypatch.setattr(service, "yacht_inputs", _inputs())
+    monkeypatch.setattr(service, "yacht_results", service.SpecResultCache(8))
+    catalog = FurlerCatalog({name: [] for name in CATALOG_QUERIES}, version="test")
+    monkeypatch.setattr(service, "get_catalog", lambda: catalog)
+
+    resp = client.get("/spec_furlers/yacht/1", params={"stay_diameter": 8, "stay_length": 12600})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["inputs"]["loa"] == 10500 and body["inputs"]["clevis_pin_diameter"] == 15.9
+    assert body["assumed"] == ["clevis_pin_diameter", "rm"]
+    assert body["catalog_version"] == "test"
+    assert set(body["furlers"]) == {"facnor", "furlex", "harken", "profurl"}
+
+    assert client.get("/spec_furlers/yacht/2").status_code == 404
+    resp = client.get("/spec_furlers/yacht/1")
+    assert resp.status_code == 422 and resp.json()["detail"]["missing"] == ["stay_diameter", "clevis_pin_diameter"]
+    # Saildata-less yacht: no sail area, reported rather than a server error
+    resp = client.get("/spec_furlers/yacht/3", params={"stay_diameter": 8, "stay_length": 12600})
+    assert resp.status_code == 422 and resp.json()["detail"]["missing"] == ["sail_area"]
+    # Inputs the spec model rejects are a 422 too, not a server error
+    bad = dict(body["inputs"], loa=10500.5)
+    monkeypatch.setattr(service.yacht_inputs, "resolve", lambda yacht_id, overrides: (bad, []))
+    resp = client.get("/spec_furlers/yacht/1")
+    assert resp.status_code == 422 and resp.json()["detail"]["errors"][0]["loc"] == ["loa"]
+
+
+def _facnor_catalog(version="test"):
+    tables = {name: [] for name in CATALOG_QUERIES}
+    tables["facnor_selection"] = [("RC2", 6000, 9000, 5, 7), ("RC3", 8000, 12000, 6, 8)]
+    tables["facnor_eye_turnbuckle"] = [("RC3", 8)]
+    return FurlerCatalog(tables, version=version)
+
+
+def test_spec_furlers_batch_keeps_order_and_evaluates_duplicates_once(monkeypatch):
+    import src.service as service
+
+    catalog = _facnor_catalog()
+    loads = []
+    monkeypatch.setattr(service, "get_catalog", lambda: loads.append(1) or catalog)
+    evaluated = []
+    run_spec = service.run_spec
+
+    def counting_run_spec(spec, catalog=None):
+        evaluated.append(spec.loa)
+        return run_spec(spec, catalog=catalog)
+
+    monkeypatch.setattr(service, "run_spec", counting_run_spec)
+    small = {"loa": 8500, "sail_area": 30, "stay_diameter": 6, "clevis_pin_diameter": 11.1, "stay_length": 11000}
+    large = dict(small, loa=11000, stay_diameter=8, clevis_pin_diameter=15.9, stay_length=14000)
+
+    resp = client.post("/spec_furlers/batch", json=[small, large, small])
+    assert resp.status_code == 200
+    results = resp.json()
+    units = [[f["unit_name"] for f in result["facnor"]] for result in results]
+    assert units == [["RC2", "RC3"], ["RC3"], ["RC2", "RC3"]]
+    assert results[1]["facnor"][0]["requires_eye_turnbuckle"] is True
+    # One evaluation per distinct request, all against one catalog snapshot
+    assert evaluated == [8500, 11000]
+    assert loads == [1]
+
+    # Each result matches what the single-spec endpoint returns
+    monkeypatch.setattr("src.catalog._catalog", catalog)
+    assert client.post("/spec_furlers", json=large).json() == results[1]
+    assert client.post("/spec_furlers/batch", json=[]).json() == []
+
+
+def test_catalog_artifact_round_trips_tables_lazily(tmp_path):
+    path = str(tmp_path / "catalog.bin")
+    tables = {
+        "b": [("RC2", 6000, 9000.5, None), ("Ø é", -1, 0.0, "")],
+        "a": [],
+    }
+    version = write_artifact(tables, path)
+    assert read_artifact_version(path) == version
+    assert write_artifact(tables, str(tmp_path / "again.bin")) == version
+
+    read_version, read_tables = read_artifact(path)
+    assert read_version == version and sorted(read_tables) == ["a", "b"]
+    rows = read_tables["b"]
+    # Rows stay in the mapped file until they are read
+    assert isinstance(rows, ArtifactTable) and len(rows) == 2
+    assert rows[1] == ("Ø é", -1, 0.0, "") and rows[-2] == ("RC2", 6000, 9000.5, None)
+    assert list(rows) == tables["b"] and list(read_tables["a"]) == []
+    assert write_artifact(read_tables, str(tmp_path / "copy.bin"), version="v2") == "v2"
+    assert read_artifact(str(tmp_path / "copy.bin"))[1]["b"] == tables["b"]
+
+
+def test_catalog_artifact_rejects_corrupt_files(tmp_path):
+    path = tmp_path / "catalog.bin"
+    write_artifact({"t": [("RC2", 6000)]}, str(path))
+    data = bytearray(path.read_bytes())
+    data[-1] ^= 0xFF
+    path.write_bytes(bytes(data))
+    with pytest.raises(CatalogArtifactError, match="checksum"):
+        read_artifact(str(path))
+    path.write_bytes(b"NOTACAT\0" + bytes(data[8:]))
+    with pytest.raises(CatalogArtifactError, match="Not a furler catalog"):
+        read_artifact(str(path))
+    with pytest.raises(CatalogArtifactError):
+        read_artifact(str(tmp_path / "missing.bin"))
+
+
+def test_catalog_watcher_hot_swaps_published_artifacts(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.catalog._catalog", None)
+    path = str(tmp_path / "catalog.bin")
+    write_artifact(_facnor_catalog().tables, path, version="v1")
+    reload_catalog(path)
+    watcher = CatalogWatcher(path, interval=0)
+    assert not watcher.check()
+
+    tables = _facnor_catalog().tables
+    tables["facnor_selection"] = [("RC3", 8000, 12000, 6, 8)]
+    write_artifact(tables, path, version="v2")
+    old = get_catalog()
+    assert watcher.check()
+    assert get_catalog().version == "v2"
+    assert get_catalog().facnor_units(7000, 6) == []
+    # Requests holding the old catalog keep reading it after the swap
+    assert old.version == "v1" and old.facnor_units(7000, 6) == ["RC2"]
+    assert not watcher.check()
+
+    # A broken artifact is skipped and the current catalog stays in service
+    with open(path, "wb") as f:
+        f.write(b"FURLCAT\0 truncated")
+    assert not watcher.check()
+    assert get_catalog().version == "v2"
+
+
+@pytest.fixture
+def catalog_db(tmp_path, monkeypatch):
+    import src.database as database
+
+    path = str(tmp_path / "catalog.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.create_tables()
+    return path
+
+
+def _harken_rod_adapters():
+    from data.temp_data import MKIV_OCEAN_PART_NUMBERS, MKIV_PART_NUMBERS
+
+    return [
+        {"unit_name": unit_name, "part_number": part_number, "rod_diameter": rod, "thread": thread}
+        for units in (MKIV_PART_NUMBERS, MKIV_OCEAN_PART_NUMBERS)
+        for unit_name, data in units.items()
+        for part_number, rod, thread in data.get("Rod_adapter") or ()
+    ]
+
+
+def test_bulk_import_keeps_rod_adapters_per_unit(catalog_db):
+    from data.bulk_import import bulk_import
+
+    rows = _harken_rod_adapters()
+    report = bulk_import({"Harken_Rod_Adapters": rows}, catalog_db)["Harken_Rod_Adapters"]
+    assert report["inserted"] == len(rows) == 25
+    report = bulk_import({"Harken_Rod_Adapters": rows}, catalog_db)["Harken_Rod_Adapters"]
+    assert (report["unchanged"], report["inserted"], report["duplicates_removed"]) == (25, 0, 0)
+
+    catalog = FurlerCatalog.from_db(catalog_db)
+    assert catalog.harken_rod_adapters("Harken MKIV Unit 2", 7.14) == [
+        {"part_number": "7424 -12", "rod_diameter": 7.14, "thread": "UNF-5/8"}
+    ]
+    assert catalog.harken_rod_adapters("Harken MKIV Unit 0", 7.14) == []
+
+
+def test_bulk_import_diffs_csv_against_the_table(catalog_db, tmp_path):
+    import sqlite3
+
+    from data.bulk_import import bulk_import, read_source
+
+    def import_csv(lines, **kwargs):
+        path = tmp_path / "Harken_Base_Unit_Part_Numbers.csv"
+        path.write_text("\n".join(["unit_name,base_unit_part_number,stay_length,additional_foil_part_number,additional_connector_part_number"] + lines) + "\n")
+        return bulk_import(read_source(str(path)), catalog_db, **kwargs)["Harken_Base_Unit_Part_Numbers"]
+
+    with sqlite3.connect(catalog_db) as conn:
+        # As import_data.py stores them: no foil or connector is NULL
+        conn.executemany(
+            "INSERT INTO Harken_Base_Unit_Part_Numbers VALUES (NULL, ?, ?, ?, ?, ?)",
+            [("Unit 0", "7410.10", 11990, None, None), ("Unit 1", "7411.10", 13990, "7411.30", "7411.31")],
+        )
+    first = ["Unit 0,7410.10,11990,,", "Unit 1,7411.10,13990,7411.30,7411.31"]
+    # Empty cells match NULL, so importing the same list changes nothing
+    again = import_csv(first)
+    assert (again["unchanged"], again["updated"], again["inserted"], again["deleted"]) == (2, 0, 0, 0)
+
+    changed = ["Unit 1,7411.10,14500,7411.30,7411.31", "Unit 2,7412.10,18380,,"]
+    preview = import_csv(changed, dry_run=True)
+    assert preview["keys"] == {
+        "inserted": [("Unit 2", "7412.10")],
+        "updated": [("Unit 1", "7411.10")],
+        "deleted": [("Unit 0", "7410.10")],
+    }
+    applied = import_csv(changed)
+    assert (applied["inserted"], applied["updated"], applied["deleted"]) == (1, 1, 1)
+    with sqlite3.connect(catalog_db) as conn:
+        rows = conn.execute(
+            "SELECT unit_name, stay_length, additional_foil_part_number "
+            "FROM Harken_Base_Unit_Part_Numbers ORDER BY unit_name"
+        ).fetchall()
+    assert rows == [("Unit 1", 14500, "7411.30"), ("Unit 2", 18380, None)]
+
+
+def test_bulk_import_reports_a_locked_database(catalog_db, monkeypatch):
+    import functools
+    import sqlite3
+
+    from data.bulk_import import bulk_import
+
+    lock = sqlite3.connect(catalog_db, isolation_level=None)
+    lock.execute("BEGIN IMMEDIATE")
+    monkeypatch.setattr(sqlite3, "connect", functools.partial(sqlite3.connect, timeout=0))
+    try:
+        with pytest.raises(sqlite3.OperationalError, match="locked"):
+            bulk_import({"Harken_Rod_Adapters": _harken_rod_adapters()}, catalog_db)
+    finally:
+        lock.execute("ROLLBACK")
+        lock.close()
+
+
+def test_rod_adapter_unit_column_is_added_to_old_databases(tmp_path, monkeypatch):
+    import sqlite3
+
+    import src.database as database
+
+    path = str(tmp_path / "old.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE Harken_Rod_Adapters (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "part_number TEXT NOT NULL, rod_diameter REAL NOT NULL, thread TEXT NOT NULL)"
+        )
+        conn.execute("INSERT INTO Harken_Rod_Adapters (part_number, rod_diameter, thread) VALUES ('7424 -12', 7.14, 'UNF-5/8')")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    database.create_tables()
+    # Rows stored before units were recorded fit any unit
+    assert FurlerCatalog.from_db(path).harken_rod_adapters("Harken MKIV Unit 0", 7.14) == [
+        {"part_number": "7424 -12", "rod_diameter": 7.14, "thread": "UNF-5/8"}
+    ]
@@ -1,7 +1,7 @@
 # Minimal FastAPI app for Docker build
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from .service import HullStructureService
 
 app = FastAPI()
@@ -33,6 +33,24 @@ class HullRequest(BaseModel):
     base_id: Optional[int] = None
 
 
+class HullBundleRequest(BaseModel):
+    yacht_ids: List[int]
+
+
+class InheritRequest(BaseModel):
+    yacht_id: int
+    base_id: int
+
+
+class CopyFromRequest(BaseModel):
+    source_yacht_id: int
+    target_yacht_id: int
+
+
+class DeleteBatchRequest(BaseModel):
+    yacht_ids: List[int]
+
+
 @app.post("/hull/keel")
 def add_keel(req: KeelRequest):
     hull_service.save_keel(req.yacht_id, req.keel_type, req.draft, req.base_id)
@@ -69,6 +87,70 @@ def get_rudder(yacht_id: int):
     return rudder.__dict__
 
 
+@app.get("/hull/bundle/{yacht_id}")
+def get_hull_bundle(yacht_id: int):
+    """
+    Hull, keel and rudder for one yacht in a single call.
+    """
+    bundle = hull_service.get_bundle(yacht_id)
+    if not bundle:
+        raise HTTPException(status_code=404, detail="Hull structure not found")
+    return bundle
+
+
+@app.post("/hull/bundle")
+def get_hull_bundles(req: HullBundleRequest):
+    """
+    Hull bundles for many yachts from one query, keyed by yacht_id.
+    Yachts without any hull structure are omitted.
+    """
+    return hull_service.get_bundles(req.yacht_ids)
+
+
+@app.post("/hull/inherit")
+def inherit_hull_structure(req: InheritRequest):
+    """
+    Make yacht_id a copy-on-write clone of base_id: it serves the base's hull,
+    keel and rudder until it saves its own.
+    """
+    try:
+        hull_service.link_yacht(req.yacht_id, req.base_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok"}
+
+
+@app.post("/hull/copy_from")
+def copy_hull_from(req: CopyFromRequest):
+    """
+    Physically copy the source yacht's hull, keel and rudder onto the target yacht,
+    replacing the target's. Returns the number of rows copied per table.
+    """
+    try:
+        copied = hull_service.copy_from(req.source_yacht_id, req.target_yacht_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok", "copied": copied}
+
+
+@app.post("/hull/delete_batch")
+def delete_hull_batch(req: DeleteBatchRequest):
+    """
+    Delete the hull, keel and rudder of every listed yacht in one transaction.
+    Returns the number of rows deleted per table.
+    """
+    return {"status": "deleted", "deleted": hull_service.delete_yachts(req.yacht_ids)}
+
+
+# Must be declared before /hull/{yacht_id}
+@app.get("/hull/changes")
+def get_hull_changes(
+    since: Optional[int] = Query(None, description="Last sequence number seen"),
+    timeout: float = Query(0.0, description="Seconds to wait for a change"),
+):
+    return hull_service.get_changes(since=since, timeout=timeout)
+
+
 @app.post("/hull/hull")
 def add_hull(req: HullRequest):
     hull_service.save_hull(req)
@@ -95,7 +177,7 @@ def delete_keel(yacht_id: int):
     from .models.database import KeelDatabase
 
     db = KeelDatabase(hull_service.db_path)
-    db.delete_keel_by_yacht(yacht_id)
+    db.delete_keel_by_yacht(yacht_id, detach=True)
     db.close()
     return {"status": "deleted"}
 
@@ -106,6 +188,6 @@ def delete_rudder(yacht_id: int):
     from .models.database import RudderDatabase
 
     db = RudderDatabase(hull_service.db_path)
-    db.delete_rudder_by_yacht(yacht_id)
+    db.delete_rudder_by_yacht(yacht_id, detach=True)
     db.close()
     return {"status": "deleted"}
@@ -5,3 +5,6 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 HULL_STRUCTURE_DB_PATH = os.environ.get(
     "HULL_STRUCTURE_DB_PATH", os.path.join(BASE_DIR, "../data.db")
 )
+
+# Number of hull change events kept in the outbox for subscribers
+HULL_CHANGES_RETAIN = int(os.environ.get("HULL_CHANGES_RETAIN", "10000"))
@@ -1,5 +1,78 @@
 import sqlite3
-from ..config import HULL_STRUCTURE_DB_PATH
+import time
+from ..config import HULL_STRUCTURE_DB_PATH, HULL_CHANGES_RETAIN
+from .inheritance import YachtInheritance
+
+# Copy-on-write resources: a clone inherits each part until it saves its own
+HULL_RESOURCES = {"hull": ("hulls",), "keel": ("keels",), "rudder": ("rudders",)}
+
+
+class HullChangeLog:
+    """
+    Outbox of hull writes, read by subscribers via /hull/changes.
+
+    Only the hulls table is tracked: its loa and displacement feed saildata's
+    derived metrics and the furler sizing. Keels and rudders are not.
+    """
+
+    def __init__(self, db_path=HULL_STRUCTURE_DB_PATH):
+        self.db_path = db_path
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS hull_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    yacht_id INTEGER NOT NULL,
+                    change_type TEXT NOT NULL,
+                    changed_at REAL NOT NULL
+                )
+            """
+            )
+        self.inheritance = YachtInheritance(db_path, HULL_RESOURCES)
+
+    def record(self, conn, yacht_ids, change_type):
+        """
+        Record a change for each yacht, on the same connection as the write so
+        both commit together. Clones still reading a yacht's hull changed with it.
+        """
+        now = time.time()
+        rows = []
+        for yacht_id in yacht_ids:
+            rows.extend(
+                (dependant, "upsert", now)
+                for dependant in self.inheritance.dependants(conn, "hull", yacht_id)
+            )
+            rows.append((yacht_id, change_type, now))
+        conn.executemany(
+            "INSERT INTO hull_changes (yacht_id, change_type, changed_at) VALUES (?, ?, ?)",
+            rows,
+        )
+        last_seq = conn.execute("SELECT MAX(seq) FROM hull_changes").fetchone()[0] or 0
+        conn.execute(
+            "DELETE FROM hull_changes WHERE seq <= ?", (last_seq - HULL_CHANGES_RETAIN,)
+        )
+
+    def changes_since(self, since, limit=500):
+        """Return (changes, last_seq, oldest_seq) for outbox entries after `since`."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT seq, yacht_id, change_type, changed_at FROM hull_changes "
+                "WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            )
+            changes = [
+                {
+                    "seq": seq,
+                    "yacht_id": yacht_id,
+                    "change_type": change_type,
+                    "changed_at": changed_at,
+                }
+                for seq, yacht_id, change_type, changed_at in cursor.fetchall()
+            ]
+            last_seq, oldest_seq = conn.execute(
+                "SELECT MAX(seq), MIN(seq) FROM hull_changes"
+            ).fetchone()
+        return changes, last_seq or 0, oldest_seq or 0
 
 
 class KeelDatabase:
@@ -17,8 +90,10 @@ class KeelDatabase:
         """
         )
         self.conn.commit()
+        self.inheritance = YachtInheritance(db_path, HULL_RESOURCES)
 
     def save_keel(self, yacht_id, base_id, keel_type, draft):
+        self.inheritance.materialize(self.conn, "keel", yacht_id, copy=False)
         self.conn.execute(
             "INSERT OR REPLACE INTO keels (yacht_id, base_id, keel_type, draft) VALUES (?, ?, ?, ?)",
             (yacht_id, base_id, keel_type, draft),
@@ -26,12 +101,17 @@ class KeelDatabase:
         self.conn.commit()
 
     def get_keel_by_yacht(self, yacht_id):
+        source = self.inheritance.source(self.conn, "keel", yacht_id)
         cursor = self.conn.execute(
-            "SELECT * FROM keels WHERE yacht_id = ?", (yacht_id,)
+            "SELECT * FROM keels WHERE yacht_id = ?", (source,)
         )
         return cursor.fetchone()
 
-    def delete_keel_by_yacht(self, yacht_id):
+    def delete_keel_by_yacht(self, yacht_id, detach=False):
+        # detach: clones inheriting this keel keep a copy (yacht deletion)
+        if detach:
+            self.inheritance.detach_dependants(self.conn, "keel", yacht_id)
+        self.inheritance.materialize(self.conn, "keel", yacht_id, copy=False)
         self.conn.execute("DELETE FROM keels WHERE yacht_id = ?", (yacht_id,))
         self.conn.commit()
 
@@ -53,8 +133,10 @@ class RudderDatabase:
         """
         )
         self.conn.commit()
+        self.inheritance = YachtInheritance(db_path, HULL_RESOURCES)
 
     def save_rudder(self, yacht_id, rudder_type, base_id=None):
+        self.inheritance.materialize(self.conn, "rudder", yacht_id, copy=False)
         self.conn.execute(
             "INSERT OR REPLACE INTO rudders (yacht_id, base_id, rudder_type) VALUES (?, ?, ?)",
             (yacht_id, base_id, rudder_type),
@@ -62,12 +144,16 @@ class RudderDatabase:
         self.conn.commit()
 
     def get_rudder_by_yacht(self, yacht_id):
+        source = self.inheritance.source(self.conn, "rudder", yacht_id)
         cursor = self.conn.execute(
-            "SELECT * FROM rudders WHERE yacht_id = ?", (yacht_id,)
+            "SELECT * FROM rudders WHERE yacht_id = ?", (source,)
         )
         return cursor.fetchone()
 
-    def delete_rudder_by_yacht(self, yacht_id):
+    def delete_rudder_by_yacht(self, yacht_id, detach=False):
+        if detach:
+            self.inheritance.detach_dependants(self.conn, "rudder", yacht_id)
+        self.inheritance.materialize(self.conn, "rudder", yacht_id, copy=False)
         self.conn.execute("DELETE FROM rudders WHERE yacht_id = ?", (yacht_id,))
         self.conn.commit()
 
@@ -95,6 +181,8 @@ class HullDatabase:
         """
         )
         self.conn.commit()
+        self.inheritance = YachtInheritance(db_path, HULL_RESOURCES)
+        self.changes = HullChangeLog(db_path)
 
     def save_hull(
         self,
@@ -108,6 +196,7 @@ class HullDatabase:
         construction,
         base_id=None,
     ):
+        self.inheritance.materialize(self.conn, "hull", yacht_id, copy=False)
         self.conn.execute(
             "INSERT OR REPLACE INTO hulls (yacht_id, base_id, hull_type, loa, lwl, beam, displacement, ballast, construction) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
             (
@@ -122,17 +211,121 @@ class HullDatabase:
                 construction,
             ),
         )
+        self.changes.record(self.conn, [yacht_id], "upsert")
         self.conn.commit()
 
     def get_hull_by_yacht(self, yacht_id):
+        source = self.inheritance.source(self.conn, "hull", yacht_id)
         cursor = self.conn.execute(
-            "SELECT * FROM hulls WHERE yacht_id = ?", (yacht_id,)
+            "SELECT * FROM hulls WHERE yacht_id = ?", (source,)
         )
         return cursor.fetchone()
 
-    def delete_hull_by_yacht(self, yacht_id):
-        self.conn.execute("DELETE FROM hulls WHERE yacht_id = ?", (yacht_id,))
+    def delete_hull_by_yacht(self, yacht_id, detach=False):
+        if detach:
+            self.inheritance.detach_dependants(self.conn, "hull", yacht_id)
+        self.inheritance.materialize(self.conn, "hull", yacht_id, copy=False)
+        cursor = self.conn.execute("DELETE FROM hulls WHERE yacht_id = ?", (yacht_id,))
+        if cursor.rowcount:
+            self.changes.record(self.conn, [yacht_id], "delete")
         self.conn.commit()
 
     def close(self):
         self.conn.close()
+
+
+class HullBundleDatabase:
+    """
+    Read-side access to hull, keel and rudder together.
+
+    One connection serves the whole bundle and the tables/indexes are only
+    created once per process and database path.
+    """
+
+    _initialised = set()
+
+    def __init__(self, db_path=HULL_STRUCTURE_DB_PATH):
+        self.db_path = db_path
+        if db_path not in self._initialised:
+            # The per-table classes own the schema; let them create it once
+            for db_cls in (HullDatabase, KeelDatabase, RudderDatabase):
+                db_cls(db_path).close()
+            with sqlite3.connect(db_path) as conn:
+                for table in ("hulls", "keels", "rudders"):
+                    conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS idx_{table}_yacht_id ON {table}(yacht_id)"
+                    )
+            self._initialised.add(db_path)
+        self.inheritance = YachtInheritance(db_path, HULL_RESOURCES)
+        self.changes = HullChangeLog(db_path)
+
+    def link_yacht(self, yacht_id, base_id):
+        """Make yacht_id a copy-on-write clone of base_id's hull, keel and rudder."""
+        self.inheritance.link(yacht_id, base_id)
+        with sqlite3.connect(self.db_path) as conn:
+            self.changes.record(conn, [yacht_id], "upsert")
+            conn.commit()
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        """Copy source_yacht_id's hull, keel and rudder onto target_yacht_id in one transaction."""
+        with sqlite3.connect(self.db_path) as conn:
+            copied = self.inheritance.copy_yacht(conn, source_yacht_id, target_yacht_id)
+            if copied["hulls"]:
+                self.changes.record(conn, [target_yacht_id], "upsert")
+            conn.commit()
+        return copied
+
+    def delete_yachts(self, yacht_ids):
+        """Delete the hull, keel and rudder of many yachts in one transaction."""
+        ids = list(dict.fromkeys(yacht_ids))
+        with sqlite3.connect(self.db_path) as conn:
+            # Clones of deleted yachts keep their copy of the hull unchanged
+            had_hull = [
+                yacht_id
+                for yacht_id in ids
+                if self.inheritance.base_of(conn, yacht_id) is not None
+                or conn.execute(
+                    "SELECT 1 FROM hulls WHERE yacht_id = ? LIMIT 1", (yacht_id,)
+                ).fetchone()
+            ]
+            deleted = self.inheritance.delete_yachts(conn, ids)
+            self.changes.record(conn, had_hull, "delete")
+            conn.commit()
+        return deleted
+
+    def get_bundles(self, yacht_ids):
+        """
+        Return hull, keel and rudder rows for each yacht with a single query:
+        one tuple per requested yacht: (yacht_id, hull columns...,
+        keel_type, draft, rudder_type); missing parts come back as NULLs.
+        Clones read each part from the yacht it is inherited from.
+        """
+        ids = list(dict.fromkeys(yacht_ids))
+        if not ids:
+            return []
+        values = ", ".join("(?, ?, ?, ?)" for _ in ids)
+        query = f"""
+            WITH ids(yacht_id, hull_src, keel_src, rudder_src) AS (VALUES {values})
+            SELECT ids.yacht_id,
+                   h.id, h.base_id, h.hull_type, h.loa, h.lwl, h.beam,
+                   h.displacement, h.ballast, h.construction,
+                   k.id, k.keel_type, k.draft,
+                   r.id, r.rudder_type
+            FROM ids
+            LEFT JOIN hulls h ON h.id = (
+                SELECT MAX(id) FROM hulls WHERE yacht_id = ids.hull_src)
+            LEFT JOIN keels k ON k.id = (
+                SELECT MAX(id) FROM keels WHERE yacht_id = ids.keel_src)
+            LEFT JOIN rudders r ON r.id = (
+                SELECT MAX(id) FROM rudders WHERE yacht_id = ids.rudder_src)
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            sources = {
+                part: self.inheritance.sources(conn, part, ids)
+                for part in ("hull", "keel", "rudder")
+            }
+            params = []
+            for yacht_id in ids:
+                params.append(yacht_id)
+                params.extend(sources[part][yacht_id] for part in ("hull", "keel", "rudder"))
+            return conn.execute(query, params).fetchall()
@@ -1,12 +1,23 @@
+import threading
+import time
+
 from .config import HULL_STRUCTURE_DB_PATH
 
 from .models.factory import HullStructureFactory
 
+# Yachts per bundle query (four bound parameters each), well under SQLite's limit
+BUNDLE_CHUNK = 200
+
+# Upper bound for a single /hull/changes long-poll
+MAX_CHANGES_WAIT = 30.0
+
 
 class HullStructureService:
     def __init__(self, db_path=HULL_STRUCTURE_DB_PATH):
         self.db_path = db_path
         self.db = None
+        # Wakes long-polling /hull/changes requests when this process writes
+        self._changed = threading.Condition()
 
     def initialize_from_base(self, yacht_id, base_id):
         """
@@ -30,7 +41,8 @@ class HullStructureService:
         row = db.get_keel_by_yacht(yacht_id)
         db.close()
         if row:
-            _, yacht_id, base_id, keel_type, draft = row  # Unpack all columns
+            # Unpack all columns; an inherited row carries its base's yacht_id
+            _, _, base_id, keel_type, draft = row
             return HullStructureFactory.create_keel(yacht_id, keel_type, draft)
         return None
 
@@ -49,7 +61,7 @@ class HullStructureService:
         row = db.get_rudder_by_yacht(yacht_id)
         db.close()
         if row:
-            _, yacht_id, base_id, rudder_type = row  # Unpack all columns
+            _, _, base_id, rudder_type = row  # Unpack all columns
             return HullStructureFactory.create_rudder(yacht_id, rudder_type)
         return None
 
@@ -71,6 +83,7 @@ class HullStructureService:
             yacht_id, hull_type, loa, lwl, beam, displacement, ballast, construction
         )
         db.close()
+        self._notify_changed()
 
     def get_hull(self, yacht_id):
         from .models.database import HullDatabase
@@ -82,7 +95,7 @@ class HullStructureService:
             # Unpack all columns including construction
             (
                 _,
-                yacht_id,
+                _,
                 base_id,
                 hull_type,
                 loa,
@@ -105,9 +118,125 @@ class HullStructureService:
             }
         return None
 
+    def get_bundles(self, yacht_ids):
+        """
+        Hull, keel and rudder for each yacht, keyed by yacht_id, in the same
+        shapes as the single-part endpoints. Parts that don't exist are None
+        and yachts with no hull structure at all are left out.
+        """
+        from .models.database import HullBundleDatabase
+
+        db = HullBundleDatabase(self.db_path)
+        bundles = {}
+        ids = list(yacht_ids)
+        for start in range(0, len(ids), BUNDLE_CHUNK):
+            for row in db.get_bundles(ids[start : start + BUNDLE_CHUNK]):
+                (
+                    yacht_id,
+                    hull_row_id,
+                    base_id,
+                    hull_type,
+                    loa,
+                    lwl,
+                    beam,
+                    displacement,
+                    ballast,
+                    construction,
+                    keel_row_id,
+                    keel_type,
+                    draft,
+                    rudder_row_id,
+                    rudder_type,
+                ) = row
+                hull = None
+                if hull_row_id is not None:
+                    hull = {
+                        "yacht_id": yacht_id,
+                        "base_id": base_id,
+                        "hull_type": hull_type,
+                        "loa": loa,
+                        "lwl": lwl,
+                        "beam": beam,
+                        "displacement": displacement,
+                        "ballast": ballast,
+                        "construction": construction,
+                    }
+                keel = None
+                if keel_row_id is not None:
+                    keel = HullStructureFactory.create_keel(
+                        yacht_id, keel_type, draft
+                    ).__dict__
+                rudder = None
+                if rudder_row_id is not None:
+                    rudder = HullStructureFactory.create_rudder(
+                        yacht_id, rudder_type
+                    ).__dict__
+                if hull is None and keel is None and rudder is None:
+                    continue
+                bundles[yacht_id] = {"hull": hull, "keel": keel, "rudder": rudder}
+        return bundles
+
+    def get_bundle(self, yacht_id):
+        return self.get_bundles([yacht_id]).get(yacht_id)
+
     def delete_all_by_yacht(self, yacht_id):
         from .models.database import KeelDatabase, RudderDatabase, HullDatabase
 
-        KeelDatabase(self.db_path).delete_keel_by_yacht(yacht_id)
-        RudderDatabase(self.db_path).delete_rudder_by_yacht(yacht_id)
-        HullDatabase(self.db_path).delete_hull_by_yacht(yacht_id)
+        # Clones still inheriting these parts get their own copies first
+        KeelDatabase(self.db_path).delete_keel_by_yacht(yacht_id, detach=True)
+        RudderDatabase(self.db_path).delete_rudder_by_yacht(yacht_id, detach=True)
+        HullDatabase(self.db_path).delete_hull_by_yacht(yacht_id, detach=True)
+        self._notify_changed()
+
+    def link_yacht(self, yacht_id, base_id):
+        from .models.database import HullBundleDatabase
+
+        HullBundleDatabase(self.db_path).link_yacht(yacht_id, base_id)
+        self._notify_changed()
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        from .models.database import HullBundleDatabase
+
+        copied = HullBundleDatabase(self.db_path).copy_from(source_yacht_id, target_yacht_id)
+        self._notify_changed()
+        return copied
+
+    def delete_yachts(self, yacht_ids):
+        from .models.database import HullBundleDatabase
+
+        deleted = HullBundleDatabase(self.db_path).delete_yachts(yacht_ids)
+        self._notify_changed()
+        return deleted
+
+    def _notify_changed(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def get_changes(self, since=None, timeout=0.0, limit=500):
+        """
+        Return hull change events after the `since` sequence number.
+
+        Blocks for up to `timeout` seconds until at least one change exists
+        (long-poll). Without `since` it returns the current head immediately so
+        a new subscriber can start from there. `reset` tells the subscriber it
+        missed events (pruned outbox or a recreated DB) and must resync.
+        """
+        from .models.database import HullChangeLog
+
+        log = HullChangeLog(self.db_path)
+        timeout = min(max(timeout, 0.0), MAX_CHANGES_WAIT)
+        deadline = time.monotonic() + timeout
+        while True:
+            changes, head, oldest = log.changes_since(since or 0, limit)
+            if since is None:
+                return {"changes": [], "last_seq": head, "reset": False}
+            if since > head or (oldest and since < oldest - 1):
+                return {"changes": [], "last_seq": head, "reset": True}
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                last_seq = changes[-1]["seq"] if changes else since
+                return {"changes": changes, "last_seq": last_seq, "reset": False}
+            # Re-check the DB at least once a second so writes made by other
+            # worker processes are seen too
+            with self._changed:
+                self._changed.wait(min(remaining, 1.0))
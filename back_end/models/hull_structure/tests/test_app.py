@@ -12,3 +12,99 @@ client = TestClient(app)
 def test_get_hull():
     response = client.get("/hull/1")
     assert response.status_code in (200, 404, 422)
+
+
+def test_hull_bundle():
+    yacht_id = 990030
+    client.post(
+        "/hull/hull",
+        json={"yacht_id": yacht_id, "hull_type": "monohull", "loa": 10500, "displacement": 5000},
+    )
+    client.post("/hull/keel", json={"yacht_id": yacht_id, "keel_type": "fin", "draft": 1.9})
+
+    response = client.get(f"/hull/bundle/{yacht_id}")
+    assert response.status_code == 200
+    bundle = response.json()
+    assert bundle["hull"]["loa"] == 10500
+    assert bundle["keel"] == {"yacht_id": yacht_id, "keel_type": "fin", "draft": 1.9}
+    assert bundle["rudder"] is None
+
+    many = client.post("/hull/bundle", json={"yacht_ids": [yacht_id, 990031]}).json()
+    assert list(many) == [str(yacht_id)]
+    assert client.get("/hull/bundle/990031").status_code == 404
+    client.delete(f"/hull/{yacht_id}")
+
+
+def test_inherited_hull_structure():
+    base_id, clone_id = 990040, 990041
+    client.delete(f"/hull/{clone_id}")
+    client.post("/hull/hull", json={"yacht_id": base_id, "hull_type": "monohull", "loa": 9000})
+    client.post("/hull/keel", json={"yacht_id": base_id, "keel_type": "fin", "draft": 1.7})
+    assert client.post("/hull/inherit", json={"yacht_id": clone_id, "base_id": base_id}).status_code == 200
+
+    bundle = client.get(f"/hull/bundle/{clone_id}").json()
+    assert bundle["hull"]["loa"] == 9000 and bundle["hull"]["yacht_id"] == clone_id
+    assert client.get(f"/hull/keel/{clone_id}").json()["yacht_id"] == clone_id
+
+    # Saving a part for the clone overrides only that part
+    client.post("/hull/keel", json={"yacht_id": clone_id, "keel_type": "bulb", "draft": 2.0})
+    bundle = client.get(f"/hull/bundle/{clone_id}").json()
+    assert bundle["keel"]["keel_type"] == "bulb" and bundle["hull"]["loa"] == 9000
+    assert client.get(f"/hull/keel/{base_id}").json()["keel_type"] == "fin"
+
+    # Deleting the base hands the clone its own copy of the inherited hull
+    client.delete(f"/hull/{base_id}")
+    assert client.get(f"/hull/{clone_id}").json()["loa"] == 9000
+    client.delete(f"/hull/{clone_id}")
+
+
+def test_copy_from_duplicates_hull_structure():
+    source_id, target_id = 990042, 990043
+    client.delete(f"/hull/{target_id}")
+    client.post("/hull/hull", json={"yacht_id": source_id, "hull_type": "monohull", "loa": 9500})
+    client.post("/hull/keel", json={"yacht_id": source_id, "keel_type": "fin", "draft": 1.9})
+    resp = client.post("/hull/copy_from", json={"source_yacht_id": source_id, "target_yacht_id": target_id})
+    assert resp.status_code == 200
+    assert resp.json()["copied"] == {"hulls": 1, "keels": 1, "rudders": 0}
+    client.delete(f"/hull/{source_id}")
+    bundle = client.get(f"/hull/bundle/{target_id}").json()
+    assert bundle["hull"]["loa"] == 9500 and bundle["hull"]["base_id"] == source_id
+    assert bundle["keel"]["draft"] == 1.9
+    client.delete(f"/hull/{target_id}")
+
+
+def test_delete_batch_keeps_clones():
+    base_id, clone_id, other_id = 990045, 990046, 990047
+    client.post("/hull/hull", json={"yacht_id": base_id, "hull_type": "monohull", "loa": 8000})
+    client.post("/hull/keel", json={"yacht_id": other_id, "keel_type": "fin", "draft": 1.5})
+    client.post("/hull/inherit", json={"yacht_id": clone_id, "base_id": base_id})
+    resp = client.post("/hull/delete_batch", json={"yacht_ids": [base_id, other_id]})
+    assert resp.json()["deleted"] == {"hulls": 1, "keels": 1, "rudders": 0}
+    assert client.get(f"/hull/{base_id}").status_code == 404
+    assert client.get(f"/hull/{clone_id}").json()["loa"] == 8000
+    client.delete(f"/hull/{clone_id}")
+
+
+def test_hull_changes_feed_reports_clones():
+    base_id, clone_id = 990048, 990049
+    head = client.get("/hull/changes").json()
+    assert head["changes"] == [] and head["reset"] is False
+    client.post("/hull/hull", json={"yacht_id": base_id, "hull_type": "monohull", "displacement": 5000})
+    client.post("/hull/inherit", json={"yacht_id": clone_id, "base_id": base_id})
+    client.post("/hull/keel", json={"yacht_id": base_id, "keel_type": "fin", "draft": 1.8})
+    since = client.get("/hull/changes").json()["last_seq"]
+
+    # A new displacement on the base is a change for the clone reading it too
+    client.post("/hull/hull", json={"yacht_id": base_id, "hull_type": "monohull", "displacement": 5200})
+    body = client.get("/hull/changes", params={"since": since}).json()
+    assert body["reset"] is False and body["last_seq"] == body["changes"][-1]["seq"]
+    assert {c["yacht_id"] for c in body["changes"]} == {base_id, clone_id}
+
+    since = body["last_seq"]
+    client.post("/hull/delete_batch", json={"yacht_ids": [base_id, clone_id]})
+    changes = client.get("/hull/changes", params={"since": since}).json()["changes"]
+    assert sorted((c["yacht_id"], c["change_type"]) for c in changes) == [
+        (base_id, "delete"),
+        (clone_id, "delete"),
+    ]
+    assert client.get("/hull/changes", params={"since": since + 1000}).json()["reset"] is True
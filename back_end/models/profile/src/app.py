@@ -1,8 +1,9 @@
 # Minimal FastAPI app for Docker build
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from .service import YachtProfileService
+from .models.database import PROFILE_COLUMNS
 from fastapi import Request
 
 app = FastAPI()
@@ -26,6 +27,32 @@ class ProfileRequest(BaseModel):
     notes: Optional[str] = None
 
 
+class ProfileBatchRequest(BaseModel):
+    yacht_ids: List[int]
+    fields: Optional[List[str]] = None
+
+
+class ProfileCloneRequest(BaseModel):
+    base_id: int
+    name: Optional[str] = None
+    model: Optional[str] = None
+    spec: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class ProfileCopyRequest(BaseModel):
+    source_yacht_id: int
+    target_yacht_id: Optional[int] = None
+    name: Optional[str] = None
+    model: Optional[str] = None
+    spec: Optional[str] = None
+    notes: Optional[str] = None
+
+
+class DeleteBatchRequest(BaseModel):
+    yacht_ids: List[int]
+
+
 class ProfileResponse(BaseModel):
     id: Optional[int] = None
     yacht_id: Optional[int] = None
@@ -63,6 +90,109 @@ def list_all_profiles(request: Request):
     return profiles
 
 
+@app.post("/profile/batch")
+def get_profiles_batch(req: ProfileBatchRequest):
+    """
+    Profiles for many yachts in one call, keyed by yacht_id. `fields` limits
+    the columns returned; yachts without a profile are omitted.
+    """
+    unknown = [f for f in req.fields or [] if f not in PROFILE_COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown profile fields: {', '.join(unknown)}")
+    return profile_service.get_profiles(req.yacht_ids, req.fields)
+
+
+@app.post("/profile/clone")
+def clone_profile(req: ProfileCloneRequest):
+    """
+    Allocate a new yacht_id whose profile inherits base_id's, apart from the
+    fields given here. Returns the new profile.
+    """
+    overrides = req.dict()
+    base_id = overrides.pop("base_id")
+    profile = profile_service.clone_profile(base_id, overrides)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Base profile not found")
+    return profile.__dict__
+
+
+@app.post("/profile/copy_from")
+def copy_profile_from(req: ProfileCopyRequest):
+    """
+    Physically copy the source yacht's profile, with the given fields
+    overridden, onto target_yacht_id or a newly allocated yacht_id.
+    """
+    overrides = req.dict()
+    source_yacht_id = overrides.pop("source_yacht_id")
+    target_yacht_id = overrides.pop("target_yacht_id")
+    try:
+        profile = profile_service.copy_profile(source_yacht_id, target_yacht_id, overrides)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not profile:
+        raise HTTPException(status_code=404, detail="Source profile not found")
+    return profile.__dict__
+
+
+@app.post("/profile/delete_batch")
+def delete_profiles_batch(req: DeleteBatchRequest):
+    """Delete the profiles of every listed yacht in one transaction."""
+    return {"status": "deleted", "deleted": {"yacht_profiles": profile_service.delete_profiles(req.yacht_ids)}}
+
+
+@app.get("/profile/list")
+def list_profiles_page(
+    after: Optional[int] = Query(None, description="Last yacht_id of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    builder: Optional[str] = None,
+    designer: Optional[str] = None,
+    yacht_class: Optional[str] = None,
+    desc: bool = False,
+    facets: bool = Query(False, description="Include catalogue-wide facet counts"),
+):
+    """
+    Keyset-paginated profiles in yacht_id order (newest first with desc).
+    Pass next_after back as `after` to get the following page. With facets,
+    `catalogue_facets` holds the counts of /profile/facets: they cover the
+    whole catalogue and are not narrowed by the filters.
+    """
+    filters = {"builder": builder, "designer": designer, "yacht_class": yacht_class}
+    profiles, next_after = profile_service.list_profiles(after, limit, filters, desc)
+    page = {"items": profiles, "next_after": next_after}
+    if facets:
+        page["catalogue_facets"] = profile_service.facet_counts()
+    return page
+
+
+@app.get("/profile/facets")
+def get_profile_facets(limit: int = Query(20, ge=1, le=500)):
+    """
+    Profile counts per builder, designer, yacht_class, country_of_origin and
+    decade introduced, largest first. Read from counts kept up to date on
+    every profile write.
+    """
+    return profile_service.facet_counts(limit)
+
+
+@app.get("/profile/suggest")
+def suggest_profile_names(prefix: str = "", limit: int = Query(10, ge=1, le=10)):
+    """
+    Model, builder, designer and class names starting with `prefix` (or with
+    a later word starting with it), most used first. Served from memory.
+    """
+    return profile_service.suggest(prefix, limit)
+
+
+@app.get("/profile/search")
+def search_profiles(q: str = "", limit: int = Query(20, ge=1, le=100)):
+    """
+    Fuzzy search over model, builder, designer, class and version names,
+    tolerant of typos such as "Jenneau". Results carry a similarity `score`
+    and are ranked by it.
+    """
+    return profile_service.search_profiles(q, limit)
+
+
 @app.get("/profile/{yacht_id}")
 def get_profile(yacht_id: int):
     profile = profile_service.get_profile(yacht_id)
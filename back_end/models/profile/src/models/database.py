@@ -1,11 +1,68 @@
 import sqlite3
+from collections import Counter
 from ..config import PROFILE_DB_PATH
+from .inheritance import YachtInheritance
+from .suggest import SuggestionIndex
+from .trigram import TrigramIndex
+
+PROFILE_COLUMNS = (
+    "id",
+    "yacht_id",
+    "base_id",
+    "name",
+    "yacht_class",
+    "model",
+    "spec",
+    "version",
+    "builder",
+    "designer",
+    "year_introduced",
+    "production_start",
+    "production_end",
+    "country_of_origin",
+    "notes",
+)
+
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+BATCH_CHUNK = 500
+
+# A cloned profile stores only the fields it overrides; the rest are read
+# field by field from its base chain. These identify the row itself.
+OWN_COLUMNS = ("id", "yacht_id", "base_id")
+PROFILE_RESOURCES = {"profile": ("yacht_profiles",)}
+
+# Columns list_page can filter on; each has a (column, yacht_id) index so a
+# filtered page is an index range scan
+LIST_FILTERS = ("builder", "designer", "yacht_class")
+
+# Facet counts live in yacht_profile_facets and are adjusted on every write;
+# year_introduced is counted per decade under "year"
+FACET_COLUMNS = ("builder", "designer", "yacht_class", "country_of_origin")
+YEAR_FACET = "year"
+# Names offered as search suggestions and matched by fuzzy search, ranked by
+# the same counts
+NAME_COLUMNS = ("model", "builder", "designer", "yacht_class")
+# Fuzzy search also matches the version ("MKII"), which is not suggested
+SEARCH_COLUMNS = NAME_COLUMNS + ("version",)
+COUNTED_COLUMNS = tuple(dict.fromkeys(FACET_COLUMNS + SEARCH_COLUMNS))
 
 
 class YachtProfileDatabase:
     def __init__(self, db_path=PROFILE_DB_PATH):
         self.db_path = db_path
         self.create_table()
+        self.inheritance = YachtInheritance(db_path, PROFILE_RESOURCES)
+        self.create_facets_table()
+        self.suggestions = SuggestionIndex(NAME_COLUMNS)
+        self.trigrams = TrigramIndex(SEARCH_COLUMNS)
+        with sqlite3.connect(self.db_path) as conn:
+            placeholders = ", ".join("?" for _ in SEARCH_COLUMNS)
+            self._index_names(
+                conn.execute(
+                    f"SELECT facet, value, count FROM yacht_profile_facets WHERE facet IN ({placeholders})",
+                    SEARCH_COLUMNS,
+                ).fetchall()
+            )
 
     def create_table(self):
         with sqlite3.connect(self.db_path) as conn:
@@ -30,36 +87,474 @@ class YachtProfileDatabase:
             )
             """
             )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_yacht_profiles_yacht_id ON yacht_profiles(yacht_id)"
+            )
+            # Base yachts (not clones or copies) in yacht_id order for list_bases
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_yacht_profiles_bases "
+                "ON yacht_profiles(yacht_id) WHERE base_id IS NULL"
+            )
+            # model and version are also looked up by name for fuzzy search
+            for col in LIST_FILTERS + ("model", "version"):
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_yacht_profiles_{col} "
+                    f"ON yacht_profiles({col} COLLATE NOCASE, yacht_id)"
+                )
+            conn.commit()
+
+    def create_facets_table(self):
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS yacht_profile_facets (
+                    facet TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (facet, value)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_yacht_profile_facets_count "
+                "ON yacht_profile_facets(facet, count)"
+            )
+            if not self._facets_stale(conn):
+                return
+            # Count the profiles stored before facets (or one of them) existed, once
+            conn.execute("DELETE FROM yacht_profile_facets")
+            counts = Counter()
+            for (yacht_id,) in conn.execute("SELECT DISTINCT yacht_id FROM yacht_profiles").fetchall():
+                counts.update(self._facet_values(conn, yacht_id))
+            conn.executemany(
+                "INSERT INTO yacht_profile_facets (facet, value, count) VALUES (?, ?, ?)",
+                [(facet, value, n) for (facet, value), n in counts.items()],
+            )
             conn.commit()
 
+    def _facets_stale(self, conn):
+        """True if a counted column has values but no facet rows yet."""
+        sources = [(col, col) for col in COUNTED_COLUMNS] + [(YEAR_FACET, "year_introduced")]
+        for facet, column in sources:
+            if conn.execute(
+                "SELECT 1 FROM yacht_profile_facets WHERE facet = ? LIMIT 1", (facet,)
+            ).fetchone():
+                continue
+            if conn.execute(
+                f"SELECT 1 FROM yacht_profiles WHERE {column} IS NOT NULL AND {column} != '' LIMIT 1"
+            ).fetchone():
+                return True
+        return False
+
+    def _facet_values(self, conn, yacht_id):
+        """The (facet, value) pairs a yacht's resolved profile counts towards."""
+        columns = COUNTED_COLUMNS + ("year_introduced",)
+        profile = self._first_row(conn, yacht_id, ("yacht_id",) + columns)
+        if profile is None:
+            return ()
+        self._resolve(conn, profile, columns)
+        values = [(col, str(profile[col])) for col in COUNTED_COLUMNS if profile[col] not in (None, "")]
+        try:
+            values.append((YEAR_FACET, f"{int(profile['year_introduced']) // 10 * 10}s"))
+        except (TypeError, ValueError):
+            pass
+        return tuple(values)
+
+    def _facet_snapshot(self, conn, yacht_ids):
+        """
+        Facet values of yacht_ids and of every clone inheriting from them,
+        taken before a write and handed to _update_facets after it.
+        """
+        affected = list(dict.fromkeys(yacht_ids))
+        for yacht_id in list(affected):
+            affected.extend(self.inheritance.dependants(conn, "profile", yacht_id))
+        return {yacht_id: self._facet_values(conn, yacht_id) for yacht_id in dict.fromkeys(affected)}
+
+    def _update_facets(self, conn, before):
+        """
+        Adjust the facet counts by what changed since `before`. Returns the
+        [(facet, value, delta)] applied, for _index_names once committed.
+        """
+        deltas = Counter()
+        for yacht_id, old in before.items():
+            deltas.subtract(old)
+            deltas.update(self._facet_values(conn, yacht_id))
+        changes = [(facet, value, n) for (facet, value), n in deltas.items() if n]
+        conn.executemany(
+            "INSERT INTO yacht_profile_facets (facet, value, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(facet, value) DO UPDATE SET count = count + excluded.count",
+            changes,
+        )
+        conn.executemany(
+            "DELETE FROM yacht_profile_facets WHERE facet = ? AND value = ? AND count <= 0",
+            [(facet, value) for facet, value, _ in changes],
+        )
+        return changes
+
+    def _index_names(self, changes):
+        self.suggestions.apply(changes)
+        self.trigrams.apply(changes)
+
+    def search(self, query, limit=20):
+        """
+        Profiles whose model, builder, designer, yacht_class or version is
+        similar to `query`, typos included. Each profile gets the `score` and the
+        `matched` field of its best name; best matches come first, newest
+        yachts first among equals.
+        """
+        results = {}
+        for score, field, value in self.trigrams.search(query):
+            ids = self._yachts_named(field, value)
+            for yacht_id, profile in self.get_by_yacht_ids(ids).items():
+                if yacht_id in results or profile.get(field) != value:
+                    continue
+                results[yacht_id] = {**profile, "score": score, "matched": field}
+            if len(results) >= limit:
+                break
+        ranked = sorted(results.values(), key=lambda p: (-p["score"], -p["yacht_id"]))
+        return ranked[:limit]
+
+    def _yachts_named(self, field, value):
+        """yacht_ids storing `value` in `field`, and the clones inheriting it."""
+        with sqlite3.connect(self.db_path) as conn:
+            ids = [
+                row[0] for row in conn.execute(
+                    f"SELECT DISTINCT yacht_id FROM yacht_profiles WHERE {field} = ? COLLATE NOCASE",
+                    (value,),
+                )
+            ]
+            for yacht_id in list(ids):
+                ids.extend(self.inheritance.dependants(conn, "profile", yacht_id))
+        return ids
+
+    def facet_counts(self, limit=20):
+        """{facet: [{"value", "count"}, ...]} with the `limit` largest values per facet."""
+        with sqlite3.connect(self.db_path) as conn:
+            return {
+                facet: [
+                    {"value": value, "count": count}
+                    for value, count in conn.execute(
+                        "SELECT value, count FROM yacht_profile_facets WHERE facet = ? "
+                        "ORDER BY count DESC, value LIMIT ?",
+                        (facet, limit),
+                    )
+                ]
+                for facet in FACET_COLUMNS + (YEAR_FACET,)
+            }
+
     def insert(self, profile: dict):
         col_names = ", ".join(profile.keys())
         placeholders = ", ".join(["?"] * len(profile))
         values = list(profile.values())
         with sqlite3.connect(self.db_path) as conn:
+            facets = self._facet_snapshot(conn, [profile.get("yacht_id")])
+            if self.inheritance.base_of(conn, profile.get("yacht_id")) is not None:
+                # A clone keeps its single override row; fields left None
+                # go on being inherited
+                changed = {
+                    k: v for k, v in profile.items()
+                    if k not in OWN_COLUMNS and k in PROFILE_COLUMNS and v is not None
+                }
+                if changed:
+                    assignments = ", ".join(f"{col} = ?" for col in changed)
+                    conn.execute(
+                        f"UPDATE yacht_profiles SET {assignments} WHERE id = "
+                        "(SELECT MIN(id) FROM yacht_profiles WHERE yacht_id = ?)",
+                        list(changed.values()) + [profile["yacht_id"]],
+                    )
+                    changes = self._update_facets(conn, facets)
+                    conn.commit()
+                    self._index_names(changes)
+                return
             conn.execute(
                 f"INSERT OR REPLACE INTO yacht_profiles ({col_names}) VALUES ({placeholders})",
                 values,
             )
+            changes = self._update_facets(conn, facets)
             conn.commit()
+        self._index_names(changes)
+
+    def _first_row(self, conn, yacht_id, columns):
+        row = conn.execute(
+            f"SELECT {', '.join(columns)} FROM yacht_profiles "
+            "WHERE yacht_id = ? ORDER BY id LIMIT 1",
+            (yacht_id,),
+        ).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def _resolve(self, conn, profile, columns):
+        """Fill a clone's NULL fields from the nearest base that sets them."""
+        if self.inheritance.base_of(conn, profile["yacht_id"]) is None:
+            return profile
+        inherited = [
+            col for col in columns if col not in OWN_COLUMNS and profile.get(col) is None
+        ]
+        for ancestor in self.inheritance.chain(conn, profile["yacht_id"])[1:]:
+            if not inherited:
+                break
+            base = self._first_row(conn, ancestor, inherited)
+            if base is None:
+                continue
+            for col in list(inherited):
+                if base[col] is not None:
+                    profile[col] = base[col]
+                    inherited.remove(col)
+        return profile
 
     def get_by_yacht_id(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT * FROM yacht_profiles WHERE yacht_id = ?", (yacht_id,)
+                "SELECT * FROM yacht_profiles WHERE yacht_id = ? ORDER BY id", (yacht_id,)
             )
             row = cursor.fetchone()
             columns = [desc[0] for desc in cursor.description]
+            if row is not None:
+                profile = self._resolve(conn, dict(zip(columns, row)), columns)
+                row = tuple(profile[col] for col in columns)
             return row, columns
 
+    def get_by_yacht_ids(self, yacht_ids, fields=None):
+        """
+        Return {yacht_id: profile dict} for many yachts. With `fields` only
+        those columns are read (yacht_id is always included). Like
+        get_by_yacht_id, the first row stored for a yacht wins.
+        """
+        select = ("yacht_id",) + tuple(
+            f for f in (fields or PROFILE_COLUMNS) if f != "yacht_id"
+        )
+        result = {}
+        ids = list(dict.fromkeys(yacht_ids))
+        with sqlite3.connect(self.db_path) as conn:
+            for start in range(0, len(ids), BATCH_CHUNK):
+                chunk = ids[start : start + BATCH_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                cursor = conn.execute(
+                    f"SELECT {', '.join(select)} FROM yacht_profiles "
+                    f"WHERE yacht_id IN ({placeholders}) ORDER BY id",
+                    chunk,
+                )
+                for row in cursor:
+                    result.setdefault(row[0], dict(zip(select, row)))
+                linked = conn.execute(
+                    f"SELECT yacht_id FROM yacht_inheritance WHERE yacht_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for (yacht_id,) in linked:
+                    if yacht_id in result:
+                        self._resolve(conn, result[yacht_id], select)
+        return result
+
+    def clone(self, base_id, overrides=None):
+        """
+        Register a copy-on-write clone of base_id's profile under a new
+        yacht_id and return that id, or None if base_id has no profile. Only
+        `overrides` are stored for the clone.
+        """
+        return self._write_clone(base_id, overrides, link=True)
+
+    def copy_from(self, source_yacht_id, target_yacht_id=None, overrides=None):
+        """
+        Write source_yacht_id's resolved profile, with `overrides`, as a full
+        profile for target_yacht_id (a new yacht_id if None), replacing the
+        target's. Returns the target id, or None if the source has no profile.
+        """
+        if source_yacht_id == target_yacht_id:
+            raise ValueError("A yacht cannot be copied onto itself")
+        return self._write_clone(source_yacht_id, overrides, link=False, yacht_id=target_yacht_id)
+
+    def _write_clone(self, base_id, overrides, link, yacht_id=None):
+        overrides = {
+            k: v for k, v in (overrides or {}).items()
+            if k in PROFILE_COLUMNS and k not in OWN_COLUMNS and v is not None
+        }
+        conn = sqlite3.connect(self.db_path, isolation_level=None)
+        try:
+            # Serialise id allocation with other clones and writers
+            conn.execute("BEGIN IMMEDIATE")
+            base = self._first_row(conn, base_id, PROFILE_COLUMNS)
+            if base is None:
+                conn.execute("ROLLBACK")
+                return None
+            if yacht_id is None:
+                (last_id,) = conn.execute(
+                    "SELECT MAX(m) FROM (SELECT MAX(yacht_id) AS m FROM yacht_profiles "
+                    "UNION ALL SELECT MAX(yacht_id) FROM yacht_inheritance)"
+                ).fetchone()
+                yacht_id = (last_id or 0) + 1
+                facets = {yacht_id: ()}
+            else:
+                facets = self._facet_snapshot(conn, [yacht_id])
+                self._detach_dependants(conn, yacht_id)
+                self.inheritance.unlink(conn, yacht_id)
+                conn.execute("DELETE FROM yacht_profiles WHERE yacht_id = ?", (yacht_id,))
+            if link:
+                row = {"yacht_id": yacht_id, "base_id": base_id, **overrides}
+            else:
+                resolved = self._resolve(conn, base, PROFILE_COLUMNS)
+                row = {k: v for k, v in resolved.items() if k not in OWN_COLUMNS}
+                row.update(overrides, yacht_id=yacht_id, base_id=base_id)
+            conn.execute(
+                f"INSERT INTO yacht_profiles ({', '.join(row)}) "
+                f"VALUES ({', '.join('?' for _ in row)})",
+                list(row.values()),
+            )
+            if link:
+                conn.execute(
+                    "INSERT INTO yacht_inheritance (yacht_id, base_id) VALUES (?, ?)",
+                    (yacht_id, base_id),
+                )
+            changes = self._update_facets(conn, facets)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        self._index_names(changes)
+        return yacht_id
+
+    def _detach_dependants(self, conn, yacht_id):
+        """Write the resolved fields into direct clones before yacht_id goes away."""
+        columns = [col for col in PROFILE_COLUMNS if col not in OWN_COLUMNS]
+        for (child,) in conn.execute(
+            "SELECT yacht_id FROM yacht_inheritance WHERE base_id = ?", (yacht_id,)
+        ).fetchall():
+            profile = self._first_row(conn, child, ("id", "yacht_id") + tuple(columns))
+            if profile is not None:
+                self._resolve(conn, profile, columns)
+                assignments = ", ".join(f"{col} = ?" for col in columns)
+                conn.execute(
+                    f"UPDATE yacht_profiles SET {assignments} WHERE id = ?",
+                    [profile[col] for col in columns] + [profile["id"]],
+                )
+            self.inheritance.unlink(conn, child)
+
     def delete(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
+            facets = self._facet_snapshot(conn, [yacht_id])
+            self._detach_dependants(conn, yacht_id)
+            self.inheritance.unlink(conn, yacht_id)
             conn.execute("DELETE FROM yacht_profiles WHERE yacht_id = ?", (yacht_id,))
+            changes = self._update_facets(conn, facets)
             conn.commit()
+        self._index_names(changes)
+
+    def delete_many(self, yacht_ids):
+        """Delete the profiles of many yachts in one transaction. Returns the row count."""
+        ids = list(dict.fromkeys(yacht_ids))
+        deleted = 0
+        with sqlite3.connect(self.db_path) as conn:
+            facets = self._facet_snapshot(conn, ids)
+            for yacht_id in ids:
+                self._detach_dependants(conn, yacht_id)
+            for start in range(0, len(ids), BATCH_CHUNK):
+                chunk = ids[start : start + BATCH_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                for table in ("yacht_inheritance", "yacht_materialized"):
+                    conn.execute(f"DELETE FROM {table} WHERE yacht_id IN ({placeholders})", chunk)
+                cursor = conn.execute(
+                    f"DELETE FROM yacht_profiles WHERE yacht_id IN ({placeholders})", chunk
+                )
+                deleted += cursor.rowcount
+            changes = self._update_facets(conn, facets)
+            conn.commit()
+        self._index_names(changes)
+        return deleted
+
+    def list_page(self, after=None, limit=50, filters=None, descending=False):
+        """
+        One page of profiles in yacht_id order: at most `limit` yachts after
+        the yacht_id `after`. `filters` maps LIST_FILTERS columns to values,
+        matched case-insensitively; clones match on their inherited values.
+        Returns (profiles, next_after), next_after being None on the last page.
+        """
+        filters = {k: v for k, v in (filters or {}).items() if v is not None}
+        profiles = []
+        exhausted = False
+        with sqlite3.connect(self.db_path) as conn:
+            while len(profiles) < limit:
+                wanted = limit - len(profiles)
+                ids = self._page_candidates(conn, after, wanted, filters, descending)
+                if ids:
+                    after = ids[-1]
+                    found = self.get_by_yacht_ids(ids)
+                    profiles.extend(
+                        found[yacht_id] for yacht_id in ids
+                        if yacht_id in found and self._matches(found[yacht_id], filters)
+                    )
+                if len(ids) < wanted:
+                    exhausted = True
+                    break
+        next_after = None if exhausted else profiles[-1]["yacht_id"]
+        return profiles, next_after
+
+    def list_bases(self, limit=50, after=None):
+        """
+        Rows of base yachts (profiles with no base_id) in yacht_id order, at
+        most `limit` after the yacht_id `after`. Returns (rows, columns).
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT * FROM yacht_profiles p WHERE base_id IS NULL AND yacht_id > ? "
+                "AND id = (SELECT MIN(id) FROM yacht_profiles WHERE yacht_id = p.yacht_id) "
+                "ORDER BY yacht_id LIMIT ?",
+                (after if after is not None else -1, limit),
+            )
+            return cursor.fetchall(), [desc[0] for desc in cursor.description]
+
+    def _page_candidates(self, conn, after, limit, filters, descending):
+        """
+        The next `limit` yacht_ids that may match `filters`: yachts whose own
+        row matches, plus clones that leave a filtered field to their base.
+        """
+        op, order = ("<", "DESC") if descending else (">", "ASC")
+        if after is None:
+            keyset = lambda col: "1"
+            keyset_args = []
+        else:
+            keyset = lambda col: f"{col} {op} ?"
+            keyset_args = [after]
+        if not filters:
+            return [
+                row[0] for row in conn.execute(
+                    f"SELECT DISTINCT yacht_id FROM yacht_profiles WHERE {keyset('yacht_id')} "
+                    f"ORDER BY yacht_id {order} LIMIT ?",
+                    keyset_args + [limit],
+                )
+            ]
+        own = " AND ".join(f"{col} = ? COLLATE NOCASE" for col in filters)
+        inherited = " AND ".join(
+            f"(p.{col} IS NULL OR p.{col} = ? COLLATE NOCASE)" for col in filters
+        )
+        # Each arm walks an index in yacht_id order and stops after `limit`
+        # rows, so a page costs the same anywhere in the table. CROSS JOIN
+        # keeps SQLite from driving the clone arm off the filter indexes.
+        query = f"""
+            SELECT yacht_id FROM (
+                SELECT yacht_id FROM yacht_profiles WHERE {keyset('yacht_id')} AND {own}
+                ORDER BY yacht_id {order} LIMIT ?)
+            UNION
+            SELECT yacht_id FROM (
+                SELECT i.yacht_id FROM yacht_inheritance i
+                CROSS JOIN yacht_profiles p ON p.yacht_id = i.yacht_id
+                WHERE {keyset('i.yacht_id')} AND {inherited}
+                ORDER BY i.yacht_id {order} LIMIT ?)
+            ORDER BY yacht_id {order} LIMIT ?
+        """
+        values = list(filters.values())
+        params = keyset_args + values + [limit] + keyset_args + values + [limit, limit]
+        return [row[0] for row in conn.execute(query, params)]
+
+    @staticmethod
+    def _matches(profile, filters):
+        return all(
+            str(profile.get(col) or "").lower() == str(value).lower()
+            for col, value in filters.items()
+        )
 
     def list_all(self):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute("SELECT * FROM yacht_profiles")
             rows = cursor.fetchall()
             columns = [desc[0] for desc in cursor.description]
-            return [dict(zip(columns, row)) for row in rows]
+            return [self._resolve(conn, dict(zip(columns, row)), columns) for row in rows]
@@ -0,0 +1,94 @@
+"""
+suggest.py
+----------
+In-memory typeahead index over yacht names (model, builder, designer and
+yacht_class), weighted by how many yachts use each name.
+
+Names are stored in a character trie under their lowercased text and under
+the start of every later word, so "sun" finds "Jeanneau Sun Odyssey". Every
+node caches the TOP_K most popular names below it, so a lookup is a walk
+down the prefix and costs the same however many names share it. Counts are
+adjusted with the deltas the profile database computes for its facet
+counts; only the nodes on a changed name's path are recomputed, each once
+per batch of changes.
+"""
+
+import heapq
+import threading
+
+TOP_K = 10
+
+
+class _Node:
+    __slots__ = ("children", "names", "top")
+
+    def __init__(self):
+        self.children = {}
+        # (field, value) -> yacht count for names whose key ends here
+        self.names = {}
+        # [(count, field, value)] most popular in this subtree, best first
+        self.top = []
+
+
+class SuggestionIndex:
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._root = _Node()
+        # Writers are serialised; readers only follow dict lookups and swap-in lists
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _keys(value):
+        words = value.lower().split()
+        return {" ".join(words[i:]) for i in range(len(words))}
+
+    def apply(self, changes):
+        """Apply [(field, value, delta)] as produced for the facet counts."""
+        with self._lock:
+            # node id -> (depth, node, parent, char) for every node on a changed path
+            touched = {}
+            for field, value, delta in changes:
+                if field not in self.fields or not delta:
+                    continue
+                for key in self._keys(value):
+                    node = self._root
+                    touched[id(node)] = (0, node, None, None)
+                    for depth, char in enumerate(key, 1):
+                        parent, node = node, node.children.setdefault(char, _Node())
+                        touched[id(node)] = (depth, node, parent, char)
+                    count = node.names.get((field, value), 0) + delta
+                    if count > 0:
+                        node.names[(field, value)] = count
+                    else:
+                        node.names.pop((field, value), None)
+            # Children before parents, so each cached top is recomputed once
+            for _, node, parent, char in sorted(touched.values(), key=lambda t: -t[0]):
+                if parent is not None and not node.names and not node.children:
+                    del parent.children[char]
+                else:
+                    node.top = self._top(node)
+
+    @staticmethod
+    def _top(node):
+        best = dict(node.names)
+        for child in node.children.values():
+            for count, field, value in child.top:
+                # A name can sit under several keys of one subtree
+                best[(field, value)] = count
+        return heapq.nlargest(
+            TOP_K,
+            ((count, field, value) for (field, value), count in best.items()),
+            key=lambda entry: entry[0],
+        )
+
+    def suggest(self, prefix, limit=TOP_K):
+        """[{"value", "field", "count"}] for the most popular names matching prefix."""
+        node = self._root
+        for char in " ".join(prefix.lower().split()):
+            node = node.children.get(char)
+            if node is None:
+                return []
+        return [
+            {"value": value, "field": field, "count": count}
+            for count, field, value in node.top[:limit]
+        ]
@@ -0,0 +1,114 @@
+"""
+trigram.py
+----------
+In-memory trigram index for typo-tolerant search over yacht names (model,
+builder, designer, yacht_class and version).
+
+Every word is padded ("  jeanneau ") and cut into trigrams; each trigram has
+a posting list of the names containing it. A search counts, from the query's
+posting lists only, how many trigrams each name shares with the query, drops
+names that cannot reach the similarity threshold, and scores the rest by
+Jaccard similarity against the whole name and against runs of as many words
+as the query has. "Jenneau" then finds "Jeanneau" without comparing the query
+with every stored name.
+
+Kept current with the same (field, value, delta) changes as the suggestions.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+
+# pg_trgm's default similarity threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD = re.compile(r"\w+")
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+def _trigrams(words):
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i : i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _jaccard(a, b):
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared) if shared else 0.0
+
+
+class TrigramIndex:
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        # (field, value) -> yacht count; a name is indexed while its count > 0
+        self._counts = {}
+        self._grams = {}
+        self._postings = {}
+        self._lock = threading.Lock()
+
+    def apply(self, changes):
+        """Apply [(field, value, delta)] as produced for the facet counts."""
+        with self._lock:
+            for field, value, delta in changes:
+                if field not in self.fields or not delta:
+                    continue
+                name = (field, value)
+                before = self._counts.get(name, 0)
+                after = before + delta
+                if after > 0:
+                    self._counts[name] = after
+                    if before <= 0:
+                        self._add(name)
+                elif before > 0:
+                    del self._counts[name]
+                    self._remove(name)
+
+    def _add(self, name):
+        grams = _trigrams(_words(name[1]))
+        self._grams[name] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(name)
+
+    def _remove(self, name):
+        for gram in self._grams.pop(name, ()):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(name)
+                if not posting:
+                    del self._postings[gram]
+
+    def search(self, query, limit=20, threshold=SIMILARITY_THRESHOLD):
+        """[(score, field, value)] for names similar to query, best first."""
+        query_words = _words(query)
+        query_grams = _trigrams(query_words)
+        if not query_grams:
+            return []
+        with self._lock:
+            shared = Counter()
+            for gram in query_grams:
+                shared.update(self._postings.get(gram, ()))
+            # Jaccard similarity can't exceed shared / len(query_grams)
+            needed = math.ceil(threshold * len(query_grams))
+            candidates = [name for name, n in shared.items() if n >= needed]
+            scored = []
+            for field, value in candidates:
+                score = self._score(query_words, query_grams, (field, value))
+                if score >= threshold:
+                    scored.append((score, self._counts[(field, value)], field, value))
+        scored.sort(key=lambda entry: (-entry[0], -entry[1], entry[3]))
+        return [(round(score, 3), field, value) for score, _, field, value in scored[:limit]]
+
+    def _score(self, query_words, query_grams, name):
+        best = _jaccard(query_grams, self._grams[name])
+        words = _words(name[1])
+        span = len(query_words)
+        if len(words) > span:
+            for start in range(len(words) - span + 1):
+                best = max(best, _jaccard(query_grams, _trigrams(words[start : start + span])))
+        return best
@@ -58,8 +58,53 @@ class YachtProfileService:
             return YachtProfileFactory.from_row(row, columns)
         return None
 
+    def get_profiles(self, yacht_ids, fields=None):
+        """Profiles for many yachts as {yacht_id: dict}; missing yachts are left out."""
+        return self.db.get_by_yacht_ids(yacht_ids, fields)
+
+    def clone_profile(self, base_id, overrides=None):
+        """
+        Copy-on-write clone of base_id's profile under a new yacht_id. Returns
+        the clone's resolved profile, or None if base_id has no profile.
+        """
+        yacht_id = self.db.clone(base_id, overrides)
+        if yacht_id is None:
+            return None
+        logger.info(f"Profile for yacht {yacht_id} cloned from base yacht {base_id}.")
+        return self.get_profile(yacht_id)
+
+    def copy_profile(self, source_yacht_id, target_yacht_id=None, overrides=None):
+        """
+        Physical copy of source_yacht_id's profile onto target_yacht_id (a new
+        yacht_id if None). Returns the copy, or None if the source has no profile.
+        """
+        yacht_id = self.db.copy_from(source_yacht_id, target_yacht_id, overrides)
+        if yacht_id is None:
+            return None
+        return self.get_profile(yacht_id)
+
     def delete_profile(self, yacht_id):
         self.db.delete(yacht_id)
 
+    def list_base_profiles(self, limit=50, after=None):
+        """Base yacht profiles in yacht_id order; pass the last yacht_id as `after` for more."""
+        rows, columns = self.db.list_bases(limit, after)
+        return [YachtProfileFactory.from_row(row, columns) for row in rows]
+
+    def list_profiles(self, after=None, limit=50, filters=None, descending=False):
+        return self.db.list_page(after, limit, filters, descending)
+
+    def facet_counts(self, limit=20):
+        return self.db.facet_counts(limit)
+
+    def suggest(self, prefix, limit=10):
+        return self.db.suggestions.suggest(prefix, limit)
+
+    def search_profiles(self, query, limit=20):
+        return self.db.search(query, limit)
+
+    def delete_profiles(self, yacht_ids):
+        return self.db.delete_many(yacht_ids)
+
     def close(self):
         self.db.close()
@@ -14,3 +14,141 @@ def test_list_profiles():
     response = client.get("/profile/")
     assert response.status_code == 200
     assert isinstance(response.json(), list)
+
+
+def test_profile_batch():
+    client.post("/profile/", json={"yacht_id": 990037, "model": "Batch 37", "builder": "Test Yard"})
+    response = client.post(
+        "/profile/batch", json={"yacht_ids": [990037, 990099], "fields": ["model", "builder"]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"990037": {"yacht_id": 990037, "model": "Batch 37", "builder": "Test Yard"}}
+    assert client.post("/profile/batch", json={"yacht_ids": [990037], "fields": ["nope"]}).status_code == 400
+    client.delete("/profile/990037")
+
+
+def test_profile_clone_inherits_fields():
+    client.post("/profile/", json={"yacht_id": 990040, "model": "Base 40", "builder": "Test Yard"})
+    clone = client.post("/profile/clone", json={"base_id": 990040, "spec": "race"}).json()
+    clone_id = clone["yacht_id"]
+    assert clone_id > 990040 and clone["base_id"] == 990040
+    assert clone["model"] == "Base 40" and clone["spec"] == "race"
+
+    # The clone stores the fields it sets and keeps inheriting the rest
+    client.post("/profile/", json={"yacht_id": clone_id, "model": "Mine"})
+    batch = client.post("/profile/batch", json={"yacht_ids": [clone_id], "fields": ["model", "builder"]}).json()
+    assert batch[str(clone_id)] == {"yacht_id": clone_id, "model": "Mine", "builder": "Test Yard"}
+
+    # Deleting the base leaves the clone with its resolved fields
+    client.delete("/profile/990040")
+    assert client.get(f"/profile/{clone_id}").json()["builder"] == "Test Yard"
+    assert client.post("/profile/clone", json={"base_id": 990040}).status_code == 404
+    client.delete(f"/profile/{clone_id}")
+
+
+def test_profile_copy_from():
+    client.post("/profile/", json={"yacht_id": 990042, "model": "Base 42", "builder": "Test Yard"})
+    copy = client.post("/profile/copy_from", json={"source_yacht_id": 990042, "notes": "mine"}).json()
+    assert copy["base_id"] == 990042 and copy["builder"] == "Test Yard" and copy["notes"] == "mine"
+    # A physical copy keeps its fields when the source goes away
+    client.delete("/profile/990042")
+    assert client.get(f"/profile/{copy['yacht_id']}").json()["model"] == "Base 42"
+    client.delete(f"/profile/{copy['yacht_id']}")
+
+
+def test_profile_delete_batch():
+    for yacht_id in (990045, 990046):
+        client.post("/profile/", json={"yacht_id": yacht_id, "model": "Fleet"})
+    resp = client.post("/profile/delete_batch", json={"yacht_ids": [990045, 990046]})
+    assert resp.json()["deleted"] == {"yacht_profiles": 2}
+    assert client.get("/profile/990045").status_code == 404
+
+
+def test_profile_list_keyset_pages():
+    for yacht_id in (990050, 990051, 990052):
+        client.post("/profile/", json={"yacht_id": yacht_id, "model": f"Page {yacht_id}", "builder": "Keyset Yard"})
+    clone_id = client.post("/profile/clone", json={"base_id": 990050}).json()["yacht_id"]
+    params = {"builder": "keyset yard", "limit": 2, "after": 990049}
+    first = client.get("/profile/list", params=params).json()
+    assert [p["yacht_id"] for p in first["items"]] == [990050, 990051]
+    # The clone matches on the builder it inherits
+    second = client.get("/profile/list", params={**params, "after": first["next_after"]}).json()
+    assert [p["yacht_id"] for p in second["items"]] == [990052, clone_id]
+    newest = client.get("/profile/list", params={"builder": "Keyset Yard", "desc": True, "limit": 1}).json()
+    assert newest["items"][0]["yacht_id"] == clone_id
+    client.post("/profile/delete_batch", json={"yacht_ids": [990050, 990051, 990052, clone_id]})
+    assert client.get("/profile/list", params={"builder": "Keyset Yard"}).json() == {"items": [], "next_after": None}
+
+
+def test_profile_facets_follow_writes():
+    def count(facet, value):
+        entries = client.get("/profile/facets", params={"limit": 500}).json()[facet]
+        return next((e["count"] for e in entries if e["value"] == value), 0)
+
+    before = count("builder", "Facet Yard"), count("builder", "Other Facet Yard")
+    client.post("/profile/", json={"yacht_id": 990060, "builder": "Facet Yard", "year_introduced": 1987})
+    clone_id = client.post("/profile/clone", json={"base_id": 990060}).json()["yacht_id"]
+    assert count("builder", "Facet Yard") == before[0] + 2
+    assert count("year", "1980s") >= 2
+    client.post("/profile/", json={"yacht_id": clone_id, "builder": "Other Facet Yard"})
+    assert count("builder", "Facet Yard") == before[0] + 1
+    assert count("builder", "Other Facet Yard") == before[1] + 1
+    # The clone keeps its values when its base goes
+    client.delete("/profile/990060")
+    assert count("builder", "Facet Yard") == before[0]
+    assert count("year", "1980s") >= 1
+    client.post("/profile/delete_batch", json={"yacht_ids": [clone_id]})
+    assert count("builder", "Other Facet Yard") == before[1]
+    listed = client.get("/profile/list", params={"limit": 1, "facets": True}).json()
+    assert listed["catalogue_facets"] == client.get("/profile/facets").json()
+
+
+def test_profile_suggest_ranks_by_use():
+    for yacht_id, model in ((990070, "Zephyrus 40"), (990071, "Zephyrus 40"), (990072, "Zephyrus 33")):
+        client.post("/profile/", json={"yacht_id": yacht_id, "model": model, "builder": "Zephyr Boats"})
+    names = client.get("/profile/suggest", params={"prefix": "zephyru"}).json()
+    assert [(n["value"], n["count"]) for n in names] == [("Zephyrus 40", 2), ("Zephyrus 33", 1)]
+    assert {"value": "Zephyr Boats", "field": "builder", "count": 3} in client.get(
+        "/profile/suggest", params={"prefix": "ZEPH"}
+    ).json()
+    # Later words match too
+    assert client.get("/profile/suggest", params={"prefix": "boats"}).json()[0]["value"] == "Zephyr Boats"
+    client.post("/profile/delete_batch", json={"yacht_ids": [990070, 990071, 990072]})
+    assert client.get("/profile/suggest", params={"prefix": "zephyr"}).json() == []
+
+
+def test_profile_search_tolerates_typos():
+    client.post("/profile/", json={"yacht_id": 990080, "model": "Sun Odyssey 40", "builder": "Jeanneau"})
+    client.post("/profile/", json={"yacht_id": 990081, "model": "Oceanis 40", "builder": "Beneteau"})
+    clone_id = client.post("/profile/clone", json={"base_id": 990080}).json()["yacht_id"]
+    found = client.get("/profile/search", params={"q": "Jenneau"}).json()
+    assert {p["yacht_id"] for p in found} >= {990080, clone_id}
+    assert all(p["matched"] == "builder" for p in found if p["yacht_id"] in (990080, clone_id))
+    assert 990081 not in {p["yacht_id"] for p in found}
+    # One word of a longer model name is enough
+    assert client.get("/profile/search", params={"q": "odysey"}).json()[0]["model"] == "Sun Odyssey 40"
+    client.post("/profile/delete_batch", json={"yacht_ids": [990080, 990081, clone_id]})
+    assert client.get("/profile/search", params={"q": "Beneteu"}).json() == []
+
+
+def test_profile_search_matches_version():
+    client.post("/profile/", json={"yacht_id": 990085, "model": "Westerly Konsort", "version": "Deck Saloon"})
+    found = client.get("/profile/search", params={"q": "deck salon"}).json()
+    assert found[0]["yacht_id"] == 990085 and found[0]["matched"] == "version"
+    # Versions are searchable but not offered as suggestions
+    assert "Deck Saloon" not in [s["value"] for s in client.get("/profile/suggest", params={"prefix": "deck"}).json()]
+    client.post("/profile/delete_batch", json={"yacht_ids": [990085]})
+    assert client.get("/profile/search", params={"q": "deck salon"}).json() == []
+
+
+def test_list_base_profiles_skips_clones():
+    from src.app import profile_service
+
+    client.post("/profile/", json={"yacht_id": 990090, "model": "Base 90"})
+    client.post("/profile/", json={"yacht_id": 990190, "model": "Base 190"})
+    clone_id = client.post("/profile/clone", json={"base_id": 990090}).json()["yacht_id"]
+    first = profile_service.list_base_profiles(limit=1, after=990089)
+    assert [p.yacht_id for p in first] == [990090]
+    rest = profile_service.list_base_profiles(limit=50, after=first[-1].yacht_id)
+    assert 990190 in [p.yacht_id for p in rest] and clone_id not in [p.yacht_id for p in rest]
+    client.post("/profile/delete_batch", json={"yacht_ids": [990090, 990190, clone_id]})
@@ -1,13 +1,29 @@
 # Minimal FastAPI app for Docker build
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
-from .service import RopeService
+from typing import Optional, Dict, Any, List
+from .service import RopeService, SAILDATA_API_URL
+from .config import SAILDATA_EVENTS_ENABLED
+from .saildata_events import SaildataChangeSubscriber
 from src.logger import get_logger
 
 app = FastAPI()
 rope_service = RopeService()
 logger = get_logger(__name__)
+saildata_subscriber = SaildataChangeSubscriber(
+    SAILDATA_API_URL, rope_service.saildata_cache
+)
+
+
+@app.on_event("startup")
+def start_saildata_subscriber():
+    if SAILDATA_EVENTS_ENABLED:
+        saildata_subscriber.start()
+
+
+@app.on_event("shutdown")
+def stop_saildata_subscriber():
+    saildata_subscriber.stop()
 
 
 class RopeRequest(BaseModel):
@@ -29,6 +45,59 @@ class PossibleRopeRequest(BaseModel):
     rope_type: str
 
 
+class PossibleRopesRequest(BaseModel):
+    ropes: List[PossibleRopeRequest]
+
+
+class InheritRequest(BaseModel):
+    yacht_id: int
+    base_id: int
+
+
+class CopyFromRequest(BaseModel):
+    source_yacht_id: int
+    target_yacht_id: int
+
+
+class DeleteBatchRequest(BaseModel):
+    yacht_ids: List[int]
+
+
+@app.post("/ropes/inherit")
+def inherit_ropes(req: InheritRequest):
+    """
+    Make yacht_id a copy-on-write clone of base_id: it serves the base's
+    ropes and possible ropes until it first changes them.
+    """
+    try:
+        rope_service.link_yacht(req.yacht_id, req.base_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok"}
+
+
+@app.post("/ropes/copy_from")
+def copy_ropes_from(req: CopyFromRequest):
+    """
+    Physically copy the source yacht's ropes and possible ropes onto the target yacht,
+    replacing the target's. Returns the number of rows copied per table.
+    """
+    try:
+        copied = rope_service.copy_from(req.source_yacht_id, req.target_yacht_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok", "copied": copied}
+
+
+@app.post("/ropes/delete_batch")
+def delete_ropes_batch(req: DeleteBatchRequest):
+    """
+    Delete the ropes and possible ropes of every listed yacht in one transaction.
+    Returns the number of rows deleted per table.
+    """
+    return {"status": "deleted", "deleted": rope_service.delete_yachts(req.yacht_ids)}
+
+
 # --- POSSIBLE ROPES ROUTES (must be before generic /ropes/{yacht_id}) ---
 @app.get("/ropes/possible/{yacht_id}")
 def get_possible_ropes(yacht_id: int):
@@ -45,17 +114,19 @@ def add_possible_rope(yacht_id: int, req: PossibleRopeRequest):
     return {"status": "ok"}
 
 
+@app.post("/ropes/possible/{yacht_id}/bulk")
+def add_possible_ropes(yacht_id: int, req: PossibleRopesRequest):
+    """
+    Add all listed ropes in one transaction and return the yacht's resulting
+    possible ropes.
+    """
+    rope_service.db.save_possible_ropes(yacht_id, [r.rope_type for r in req.ropes])
+    return get_possible_ropes(yacht_id)
+
+
 @app.delete("/ropes/possible/{yacht_id}/{rope_type}")
 def remove_possible_rope(yacht_id: int, rope_type: str):
-    import sqlite3
-
-    with sqlite3.connect(rope_service.db.db_path) as conn:
-        cursor = conn.cursor()
-        cursor.execute(
-            "DELETE FROM ropes_possible WHERE yacht_id = ? AND rope_type = ?",
-            (yacht_id, rope_type),
-        )
-        conn.commit()
+    rope_service.db.delete_possible_rope(yacht_id, rope_type)
     return {"status": "ok"}
 
 
@@ -121,7 +192,8 @@ def get_ropes(yacht_id: int):
         "required_wl_kg",
         "config",
     ]
-    return [dict(zip(keys, row)) for row in ropes]
+    # Inherited rows are stored under the base yacht
+    return [{**dict(zip(keys, row)), "yacht_id": yacht_id} for row in ropes]
 
 
 @app.delete("/ropes/{yacht_id}/{rope_type}")
@@ -3,3 +3,7 @@ import os
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 ROPES_DB_PATH = os.environ.get("ROPES_DB_PATH", os.path.join(BASE_DIR, "data.db"))
+
+# Saildata responses are cached this long; the change feed invalidates them early
+SAILDATA_CACHE_TTL = float(os.environ.get("SAILDATA_CACHE_TTL", "3600"))
+SAILDATA_EVENTS_ENABLED = os.environ.get("SAILDATA_EVENTS_ENABLED", "1") == "1"
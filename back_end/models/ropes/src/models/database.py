@@ -11,12 +11,17 @@ Handles SQLite database integration for rope storage and retrieval in the runnin
 import sqlite3
 from ..config import ROPES_DB_PATH
 from .rope_utils import normalize_rope_type
+from .inheritance import YachtInheritance
+
+# Copy-on-write resources: a clone inherits each until it first writes to it
+ROPE_RESOURCES = {"ropes": ("ropes",), "ropes_possible": ("ropes_possible",)}
 
 
 class RopeDatabase:
     def __init__(self, db_path=ROPES_DB_PATH):
         self.db_path = db_path
         self.create_tables()
+        self.inheritance = YachtInheritance(db_path, ROPE_RESOURCES)
 
     def create_tables(self):
         with sqlite3.connect(self.db_path) as conn:
@@ -78,6 +83,7 @@ class RopeDatabase:
             led_aft = getattr(rope, "led_aft", None)
             required_wl_kg = getattr(rope, "required_wl_kg", None)
             config = getattr(rope, "config", None)
+            self.inheritance.materialize(conn, "ropes", yacht_id)
             cursor.execute(
                 """
                 INSERT OR REPLACE INTO ropes (
@@ -110,7 +116,8 @@ class RopeDatabase:
     def get_ropes_by_yacht(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM ropes WHERE yacht_id = ?", (yacht_id,))
+            source = self.inheritance.source(conn, "ropes", yacht_id)
+            cursor.execute("SELECT * FROM ropes WHERE yacht_id = ?", (source,))
             return cursor.fetchall()
 
     def get_rope_by_type(self, rope_type):
@@ -123,18 +130,45 @@ class RopeDatabase:
         rope_type = normalize_rope_type(rope_type)
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            self.inheritance.materialize(conn, "ropes_possible", yacht_id)
             cursor.execute(
                 "INSERT INTO ropes_possible (yacht_id, rope_type, config) VALUES (?, ?, ?)",
                 (yacht_id, rope_type, str(config) if config else None),
             )
             conn.commit()
 
+    def save_possible_ropes(self, yacht_id, rope_types):
+        """
+        Add many possible ropes in one transaction. Rope types the yacht
+        already lists are not added again.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            self.inheritance.materialize(conn, "ropes_possible", yacht_id)
+            existing = {
+                normalize_rope_type(row[0])
+                for row in conn.execute(
+                    "SELECT rope_type FROM ropes_possible WHERE yacht_id = ?", (yacht_id,)
+                )
+            }
+            new = [
+                rope_type
+                for rope_type in dict.fromkeys(normalize_rope_type(r) for r in rope_types)
+                if rope_type not in existing
+            ]
+            conn.executemany(
+                "INSERT INTO ropes_possible (yacht_id, rope_type, config) VALUES (?, ?, NULL)",
+                [(yacht_id, rope_type) for rope_type in new],
+            )
+            conn.commit()
+        return new
+
     def get_possible_ropes(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            source = self.inheritance.source(conn, "ropes_possible", yacht_id)
             cursor.execute(
                 "SELECT rope_type, config FROM ropes_possible WHERE yacht_id = ?",
-                (yacht_id,),
+                (source,),
             )
             # Normalize all rope_type values on load
             return [(normalize_rope_type(row[0]), row[1]) for row in cursor.fetchall()]
@@ -142,15 +176,58 @@ class RopeDatabase:
     def delete_ropes_by_yacht(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            # The yacht now has no ropes of its own rather than inheriting
+            self.inheritance.materialize(conn, "ropes", yacht_id, copy=False)
             cursor.execute("DELETE FROM ropes WHERE yacht_id = ?", (yacht_id,))
             conn.commit()
 
+    def delete_possible_rope(self, yacht_id, rope_type):
+        with sqlite3.connect(self.db_path) as conn:
+            self.inheritance.materialize(conn, "ropes_possible", yacht_id)
+            conn.execute(
+                "DELETE FROM ropes_possible WHERE yacht_id = ? AND rope_type = ?",
+                (yacht_id, rope_type),
+            )
+            conn.commit()
+
     def delete_possible_ropes(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            self.inheritance.materialize(conn, "ropes_possible", yacht_id, copy=False)
             cursor.execute("DELETE FROM ropes_possible WHERE yacht_id = ?", (yacht_id,))
             conn.commit()
 
+    def link_yacht(self, yacht_id, base_id):
+        """Make yacht_id a copy-on-write clone of base_id's ropes."""
+        self.inheritance.link(yacht_id, base_id)
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        """Copy source_yacht_id's ropes and possible ropes onto target_yacht_id in one transaction."""
+        with sqlite3.connect(self.db_path) as conn:
+            copied = self.inheritance.copy_yacht(conn, source_yacht_id, target_yacht_id)
+            conn.commit()
+        return copied
+
+    def delete_yachts(self, yacht_ids):
+        """Delete the ropes and possible ropes of many yachts in one transaction."""
+        with sqlite3.connect(self.db_path) as conn:
+            deleted = self.inheritance.delete_yachts(conn, yacht_ids)
+            conn.commit()
+        return deleted
+
+    def delete_yacht(self, yacht_id):
+        """
+        Remove everything stored for a yacht. Clones still inheriting from it
+        get their own copies first.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            for resource, tables in ROPE_RESOURCES.items():
+                self.inheritance.detach_dependants(conn, resource, yacht_id)
+                for table in tables:
+                    conn.execute(f"DELETE FROM {table} WHERE yacht_id = ?", (yacht_id,))
+            self.inheritance.unlink(conn, yacht_id)
+            conn.commit()
+
     def close(self):
         pass  # No persistent connection to close
 
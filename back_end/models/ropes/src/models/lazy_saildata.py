@@ -0,0 +1,65 @@
+"""
+Lazy saildata handle for rope factories.
+
+Only rope length and load calculations need the yacht's rig dimensions, so
+the saildata service is not contacted until a dimension is actually read.
+Possible-rope bookkeeping therefore runs purely against the local ropes
+database.
+"""
+
+from collections.abc import Mapping
+
+
+class LazySailData(Mapping):
+    """
+    Read-only mapping over a yacht's saildata that is fetched on first access.
+
+    Args:
+        yacht_id: Yacht whose saildata is wrapped.
+        loader: Callable taking the yacht_id and returning the saildata dict
+            (or None if the yacht has no saildata).
+
+    Supports both dict-style (``saildata["trisail_i"]``, ``saildata.get(...)``)
+    and attribute-style (``saildata.p``) reads, as used by the rope classes.
+    """
+
+    def __init__(self, yacht_id, loader):
+        self.yacht_id = yacht_id
+        self._loader = loader
+        self._data = None
+
+    @property
+    def loaded(self):
+        """True once the saildata has been fetched."""
+        return self._data is not None
+
+    def _load(self):
+        if self._data is None:
+            data = self._loader(self.yacht_id)
+            if not isinstance(data, Mapping):
+                raise ValueError(
+                    f"No saildata found for yacht_id={self.yacht_id}. Cannot create ropes."
+                )
+            self._data = dict(data)
+        return self._data
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __getattr__(self, key):
+        if key.startswith("_"):
+            raise AttributeError(key)
+        try:
+            return self._load()[key]
+        except KeyError:
+            raise AttributeError(key) from None
+
+    def __repr__(self):
+        state = self._data if self.loaded else "<not loaded>"
+        return f"LazySailData(yacht_id={self.yacht_id}, data={state})"
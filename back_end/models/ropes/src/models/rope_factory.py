@@ -119,7 +119,7 @@ class Factory:
         self,
         yacht_id,
         saildata,
-        sail_service,
+        sail_service=None,
         wind_speed_in_knots=30,
         halyard_load_safety_factor=1.25,
         dynamic_load_safety_factor=1.5,
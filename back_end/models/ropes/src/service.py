@@ -1,9 +1,10 @@
-from .config import ROPES_DB_PATH
+from .config import ROPES_DB_PATH, SAILDATA_CACHE_TTL
 from .models.rope_factory import Factory
 from .models.database import RopeDatabase
+from .models.lazy_saildata import LazySailData
 from .models.rope_utils import normalize_rope_type
+from .saildata_events import SaildataCache
 import requests
-import threading
 
 SAILDATA_API_URL = "http://127.0.0.1:8001"
 SAILS_API_URL = "http://127.0.0.1:8002"
@@ -12,24 +13,22 @@ HULL_API_URL = "http://127.0.0.1:8004"
 
 
 class RopeService:
-    _thread_local = threading.local()
-
     def __init__(self, db_path=ROPES_DB_PATH):
         self.db = RopeDatabase(db_path)
+        # Shared across requests; kept fresh by the saildata change feed
+        self.saildata_cache = SaildataCache(SAILDATA_CACHE_TTL)
 
     def _fetch_saildata(self, yacht_id):
-        # Use a thread-local cache to avoid repeated HTTP requests for the same yacht_id within a request
-        if not hasattr(self._thread_local, "saildata_cache"):
-            self._thread_local.saildata_cache = {}
-        cache = self._thread_local.saildata_cache
-        if yacht_id in cache:
-            return cache[yacht_id]
+        cached = self.saildata_cache.get(yacht_id)
+        if cached is not None:
+            return cached
+        version = self.saildata_cache.version(yacht_id)
         try:
             resp = requests.get(f"{SAILDATA_API_URL}/saildata/{yacht_id}", timeout=10)
             if resp.status_code == 200:
                 data = resp.json()
                 if data and isinstance(data, dict) and data.get("i") is not None:
-                    cache[yacht_id] = data
+                    self.saildata_cache.set(yacht_id, data, version)
                     return data
         except Exception:
             pass  # Optionally log error
@@ -61,12 +60,9 @@ class RopeService:
         dynamic_load_safety_factor=2,
         length_safety_factor=2,
     ):
-        saildata_dict = self._fetch_saildata(yacht_id)
-        saildata = saildata_dict  # Use dict directly or refactor as needed
-        if saildata is None:
-            raise ValueError(
-                f"No saildata found for yacht_id={yacht_id}. Cannot create ropes."
-            )
+        # Saildata is only fetched once a rope needs its length or load, so
+        # possible-rope CRUD never depends on the saildata service being up.
+        saildata = LazySailData(yacht_id, self._fetch_saildata)
         return Factory(
             yacht_id=yacht_id,
             saildata=saildata,
@@ -106,9 +102,17 @@ class RopeService:
         factory = self._get_factory(yacht_id, **kwargs)
         return factory.get(rope_type)
 
+    def link_yacht(self, yacht_id, base_id):
+        self.db.link_yacht(yacht_id, base_id)
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        return self.db.copy_from(source_yacht_id, target_yacht_id)
+
+    def delete_yachts(self, yacht_ids):
+        return self.db.delete_yachts(yacht_ids)
+
     def delete_ropes_by_yacht(self, yacht_id):
-        self.db.delete_ropes_by_yacht(yacht_id)
-        self.db.delete_possible_ropes(yacht_id)
+        self.db.delete_yacht(yacht_id)
 
     def close(self):
         self.db.close()
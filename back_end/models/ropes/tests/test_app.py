@@ -1,6 +1,11 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
 import pytest
 from fastapi.testclient import TestClient
-from app import app
+from src.app import app
 
 client = TestClient(app)
 
@@ -8,3 +13,65 @@ client = TestClient(app)
 def test_possible_ropes():
     response = client.get("/ropes/possible/1")
     assert response.status_code in (200, 404, 422)
+
+
+def test_add_rope_type_without_saildata_service():
+    # Possible-rope CRUD only touches the local DB, so it must not need saildata
+    response = client.post(
+        "/ropes/add_rope_type",
+        json={"yacht_id": 999001, "rope_type": "MainHalyard"},
+    )
+    assert response.status_code == 200
+    ropes = client.get("/ropes/possible/999001").json()
+    assert {"rope_type": "MainsailHalyard"} in ropes
+    client.delete("/ropes/possible/999001")
+
+
+def test_inherited_possible_ropes_copy_on_write():
+    base_id, clone_id = 999040, 999041
+    client.delete(f"/ropes/{base_id}")
+    client.delete(f"/ropes/{clone_id}")
+    client.post(f"/ropes/possible/{base_id}", json={"rope_type": "MainsailHalyard"})
+    assert client.post("/ropes/inherit", json={"yacht_id": clone_id, "base_id": base_id}).status_code == 200
+    assert client.get(f"/ropes/possible/{clone_id}").json() == [{"rope_type": "MainsailHalyard"}]
+
+    # Removing a rope from the clone copies the list first; the base keeps it
+    client.delete(f"/ropes/possible/{clone_id}/MainsailHalyard")
+    assert client.get(f"/ropes/possible/{clone_id}").json() == []
+    assert client.get(f"/ropes/possible/{base_id}").json() == [{"rope_type": "MainsailHalyard"}]
+    client.delete(f"/ropes/{base_id}")
+    client.delete(f"/ropes/{clone_id}")
+
+
+def test_copy_from_duplicates_possible_ropes():
+    source_id, target_id = 999042, 999043
+    client.delete(f"/ropes/{target_id}")
+    client.post(f"/ropes/possible/{source_id}", json={"rope_type": "MainsailHalyard"})
+    resp = client.post("/ropes/copy_from", json={"source_yacht_id": source_id, "target_yacht_id": target_id})
+    assert resp.status_code == 200 and resp.json()["copied"]["ropes_possible"] == 1
+    client.delete(f"/ropes/{source_id}")
+    assert client.get(f"/ropes/possible/{target_id}").json() == [{"rope_type": "MainsailHalyard"}]
+    assert client.post("/ropes/copy_from", json={"source_yacht_id": target_id, "target_yacht_id": target_id}).status_code == 400
+    client.delete(f"/ropes/{target_id}")
+
+
+def test_bulk_possible_ropes():
+    yacht_id = 999044
+    client.delete(f"/ropes/{yacht_id}")
+    client.post(f"/ropes/possible/{yacht_id}", json={"rope_type": "MainsailHalyard"})
+    resp = client.post(
+        f"/ropes/possible/{yacht_id}/bulk",
+        json={"ropes": [{"rope_type": "MainsailHalyard"}, {"rope_type": "JibSheet"}, {"rope_type": "JibSheet"}]},
+    )
+    assert resp.status_code == 200
+    assert sorted(r["rope_type"] for r in resp.json()) == ["JibSheet", "MainsailHalyard"]
+    client.delete(f"/ropes/{yacht_id}")
+
+
+def test_delete_batch():
+    ids = [999045, 999046]
+    for yacht_id in ids:
+        client.post(f"/ropes/possible/{yacht_id}", json={"rope_type": "JibSheet"})
+    resp = client.post("/ropes/delete_batch", json={"yacht_ids": ids})
+    assert resp.json()["deleted"]["ropes_possible"] >= 2
+    assert all(client.get(f"/ropes/possible/{yacht_id}").json() == [] for yacht_id in ids)
@@ -1,11 +1,25 @@
 # Minimal FastAPI app for Docker build
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from .service import SailDataService
+from .hull_events import HullChangeSubscriber
+from .config import HULL_API_URL, HULL_EVENTS_ENABLED
 
 app = FastAPI()
 saildata_service = SailDataService()
+hull_subscriber = HullChangeSubscriber(HULL_API_URL, saildata_service)
+
+
+@app.on_event("startup")
+def start_hull_subscriber():
+    if HULL_EVENTS_ENABLED:
+        hull_subscriber.start()
+
+
+@app.on_event("shutdown")
+def stop_hull_subscriber():
+    hull_subscriber.stop()
 
 
 class SailDataRequest(BaseModel):
@@ -18,6 +32,25 @@ class SailDataRequest(BaseModel):
     extras: Optional[Dict[str, Any]] = None
 
 
+class SailDataBatchRequest(BaseModel):
+    yacht_ids: List[int]
+    fields: Optional[List[str]] = None
+
+
+class InheritRequest(BaseModel):
+    yacht_id: int
+    base_id: int
+
+
+class CopyFromRequest(BaseModel):
+    source_yacht_id: int
+    target_yacht_id: int
+
+
+class DeleteBatchRequest(BaseModel):
+    yacht_ids: List[int]
+
+
 @app.post("/saildata/")
 def add_saildata(req: SailDataRequest):
     data = req.dict()
@@ -27,6 +60,72 @@ def add_saildata(req: SailDataRequest):
     return {"status": "ok"}
 
 
+@app.post("/saildata/inherit")
+def inherit_saildata(req: InheritRequest):
+    """
+    Make yacht_id a copy-on-write clone of base_id: it is served base_id's
+    saildata until it saves its own.
+    """
+    try:
+        saildata_service.link_yacht(req.yacht_id, req.base_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok"}
+
+
+@app.post("/saildata/copy_from")
+def copy_saildata_from(req: CopyFromRequest):
+    """
+    Physically copy the source yacht's saildata onto the target yacht,
+    replacing the target's. Returns the number of rows copied per table.
+    """
+    try:
+        copied = saildata_service.copy_from(req.source_yacht_id, req.target_yacht_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok", "copied": copied}
+
+
+@app.post("/saildata/delete_batch")
+def delete_saildata_batch(req: DeleteBatchRequest):
+    """
+    Delete the saildata of every listed yacht in one transaction.
+    Returns the number of rows deleted per table.
+    """
+    return {"status": "deleted", "deleted": saildata_service.delete_many(req.yacht_ids)}
+
+
+# Must be declared before /saildata/{yacht_id}
+@app.get("/saildata/changes")
+def get_saildata_changes(
+    since: Optional[int] = Query(None, description="Last sequence number seen"),
+    timeout: float = Query(0.0, description="Seconds to wait for a change"),
+):
+    return saildata_service.get_changes(since=since, timeout=timeout)
+
+
+@app.post("/saildata/batch")
+def get_saildata_batch(req: SailDataBatchRequest):
+    """
+    Saildata for many yachts at once, keyed by yacht_id. Pass `fields` to read
+    only those dimensions. Yachts without saildata are omitted.
+    """
+    return saildata_service.get_saildata_batch(req.yacht_ids, req.fields)
+
+
+# Must be declared before /saildata/{yacht_id}
+@app.get("/saildata/search")
+def search_saildata(
+    field: str = Query(..., description="Dimension column to filter on, e.g. j"),
+    min: Optional[float] = Query(None, description="Inclusive lower bound"),
+    max: Optional[float] = Query(None, description="Inclusive upper bound"),
+):
+    try:
+        return saildata_service.find_yacht_ids(field, min, max)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.get("/saildata/{yacht_id}")
 def get_saildata(yacht_id: int):
     saildata = saildata_service.get_saildata(yacht_id)
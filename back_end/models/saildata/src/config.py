@@ -5,3 +5,10 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SAILDATA_DB_PATH = os.environ.get(
     "SAILDATA_DB_PATH", os.path.join(BASE_DIR, "data.db")
 )
+
+# Number of saildata change events kept in the outbox for subscribers
+SAILDATA_CHANGES_RETAIN = int(os.environ.get("SAILDATA_CHANGES_RETAIN", "10000"))
+
+# Hull service, whose displacement feeds the derived SA/D ratio
+HULL_API_URL = os.environ.get("HULL_API_URL", "http://hull_structure:8004")
+HULL_EVENTS_ENABLED = os.environ.get("HULL_EVENTS_ENABLED", "1") == "1"
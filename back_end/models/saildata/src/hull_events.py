@@ -0,0 +1,92 @@
+"""
+Hull change-feed subscriber.
+
+Displacement lives on the hull, but the derived SA/D ratio is computed here.
+This loop long-polls /hull/changes and copies the displacement of every
+changed hull into its saildata record, which recomputes the ratio. On the
+first poll, and whenever the feed asks for a reset, every yacht is synced,
+since changes may have been missed.
+"""
+
+import threading
+
+import requests
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Yachts per /hull/bundle request
+SYNC_CHUNK = 200
+
+
+class HullChangeSubscriber:
+    def __init__(self, api_url, service, poll_timeout=25.0, retry_delay=5.0):
+        self.api_url = api_url
+        self.service = service
+        self.poll_timeout = poll_timeout
+        self.retry_delay = retry_delay
+        self._since = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="hull-changes", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def poll_once(self):
+        params = {"timeout": self.poll_timeout}
+        if self._since is not None:
+            params["since"] = self._since
+        resp = requests.get(
+            f"{self.api_url}/hull/changes",
+            params=params,
+            timeout=self.poll_timeout + 5,
+        )
+        resp.raise_for_status()
+        body = resp.json()
+        if body.get("reset") or self._since is None:
+            yacht_ids = self.service.list_yacht_ids()
+        else:
+            yacht_ids = [change["yacht_id"] for change in body.get("changes", [])]
+        updated = self.sync(yacht_ids)
+        if updated:
+            logger.info(f"Displacement updated from the hull for yachts {updated}")
+        self._since = body.get("last_seq", self._since)
+
+    def sync(self, yacht_ids):
+        """
+        Copy the hull displacement of each yacht into its saildata. Yachts the
+        hull service has no hull for are left as they are.
+        """
+        ids = list(dict.fromkeys(yacht_ids))
+        updated = []
+        for start in range(0, len(ids), SYNC_CHUNK):
+            resp = requests.post(
+                f"{self.api_url}/hull/bundle",
+                json={"yacht_ids": ids[start : start + SYNC_CHUNK]},
+                timeout=10,
+            )
+            resp.raise_for_status()
+            displacements = {
+                int(yacht_id): bundle["hull"].get("displacement")
+                for yacht_id, bundle in resp.json().items()
+                if bundle.get("hull")
+            }
+            updated.extend(self.service.apply_displacements(displacements))
+        return updated
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"hull change feed unavailable: {e}")
+                self._since = None
+                self._stop.wait(self.retry_delay)
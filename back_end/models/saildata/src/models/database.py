@@ -1,78 +1,491 @@
 import sqlite3
+import time
 from .saildata import SailData
-from ..config import SAILDATA_DB_PATH
+from .derived import METRIC_COLUMNS, compute_derived_metrics, inputs_hash
+from .inheritance import YachtInheritance
+from ..config import SAILDATA_DB_PATH, SAILDATA_CHANGES_RETAIN
 import json
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
 
+# Rig dimensions stored in their own REAL columns. Anything else a caller
+# sends is kept in the JSON `data` column as a true extra.
+BASE_COLUMNS = ("i", "j", "p", "e")
+DIMENSION_COLUMNS = (
+    "genoa_i",
+    "genoa_j",
+    "main_p",
+    "main_e",
+    "codezero_i",
+    "codezero_j",
+    "jib_i",
+    "jib_j",
+    "spin_i",
+    "spin_j",
+    "staysail_i",
+    "staysail_j",
+    "trisail_i",
+    "trisail_j",
+)
+VALUE_COLUMNS = BASE_COLUMNS + DIMENSION_COLUMNS
+# Fields readable without touching the JSON extras
+COLUMN_FIELDS = ("yacht_id", "base_id") + VALUE_COLUMNS
+
+# Key under which derived metrics are served with a saildata record
+DERIVED_KEY = "derived"
+
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+BATCH_CHUNK = 500
+
+# Copy-on-write resource: a clone inherits the record with its derived metrics
+SAILDATA_RESOURCES = {"saildata": ("saildata", "saildata_derived")}
+
+
 class SailDataDatabase:
     def __init__(self, db_path=SAILDATA_DB_PATH):
         self.db_path = db_path
         logger.info(f"SAILDATA DB PATH: {self.db_path}")
+        self.inheritance = YachtInheritance(self.db_path, SAILDATA_RESOURCES)
         self._create_table()
 
     def _create_table(self):
+        value_columns = ",\n".join(f"{col} REAL" for col in VALUE_COLUMNS)
         with sqlite3.connect(self.db_path) as conn:
             conn.execute(
-                """
+                f"""
                 CREATE TABLE IF NOT EXISTS saildata (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     yacht_id INTEGER NOT NULL,
                     base_id INTEGER,
-                    i INTEGER,
-                    j INTEGER,
-                    p INTEGER,
-                    e INTEGER,
+                    {value_columns},
                     data TEXT NOT NULL
                 )
             """
             )
+            self._migrate_json_dimensions(conn)
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_saildata_yacht_id ON saildata(yacht_id)"
+            )
+            for col in BASE_COLUMNS:
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_saildata_{col} ON saildata({col})"
+                )
+            # Derived rig metrics, recomputed only when their inputs change
+            metric_columns = ",\n".join(f"{col} REAL" for col in METRIC_COLUMNS)
+            conn.execute(
+                f"""
+                CREATE TABLE IF NOT EXISTS saildata_derived (
+                    yacht_id INTEGER PRIMARY KEY,
+                    inputs_hash TEXT NOT NULL,
+                    {metric_columns},
+                    computed_at REAL NOT NULL
+                )
+            """
+            )
+            # Outbox of saildata writes, read by subscribers via /saildata/changes
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS saildata_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    yacht_id INTEGER NOT NULL,
+                    change_type TEXT NOT NULL,
+                    changed_at REAL NOT NULL
+                )
+            """
+            )
+            conn.commit()
+        missing = self._yachts_missing_derived()
+        if missing:
+            logger.info(f"Computing derived metrics for {len(missing)} yachts")
+            self.recompute_derived(missing)
+
+    def _migrate_json_dimensions(self, conn):
+        """
+        Move dimensions out of the JSON blob of databases created before they
+        had their own columns. Runs once: only when a column is missing.
+
+        The ALTER TABLEs and the backfill share one transaction, so a failed
+        backfill leaves no half-migrated table (columns present, values still
+        in the JSON) for the next start to skip.
+        """
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Checked under the write lock: another worker may have just migrated
+            existing = {row[1] for row in conn.execute("PRAGMA table_info(saildata)")}
+            missing = [col for col in DIMENSION_COLUMNS if col not in existing]
+            if missing:
+                logger.info(f"Migrating saildata dimensions into columns: {missing}")
+                for col in missing:
+                    conn.execute(f"ALTER TABLE saildata ADD COLUMN {col} REAL")
+                self._backfill_dimensions(conn)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _backfill_dimensions(self, conn):
+        rows = conn.execute("SELECT id, base_id, data FROM saildata").fetchall()
+        assignments = ", ".join(f"{col} = ?" for col in DIMENSION_COLUMNS)
+        updates = []
+        for id_, base_id, data_json in rows:
+            extras = json.loads(data_json) if data_json else {}
+            values = [extras.pop(col, None) for col in DIMENSION_COLUMNS]
+            json_base_id = extras.pop("base_id", None)
+            extras.pop("yacht_id", None)
+            updates.append(
+                (
+                    *values,
+                    base_id if base_id is not None else json_base_id,
+                    json.dumps(extras),
+                    id_,
+                )
+            )
+        conn.executemany(
+            f"UPDATE saildata SET {assignments}, base_id = ?, data = ? WHERE id = ?",
+            updates,
+        )
+
+    def _record_change(self, conn, yacht_id, change_type):
+        # Written on the same connection as the data change so both commit together.
+        # Clones still reading this yacht's record changed with it.
+        now = time.time()
+        conn.executemany(
+            "INSERT INTO saildata_changes (yacht_id, change_type, changed_at) VALUES (?, ?, ?)",
+            [
+                (dependant, "upsert", now)
+                for dependant in self.inheritance.dependants(conn, "saildata", yacht_id)
+            ],
+        )
+        cursor = conn.execute(
+            "INSERT INTO saildata_changes (yacht_id, change_type, changed_at) VALUES (?, ?, ?)",
+            (yacht_id, change_type, now),
+        )
+        conn.execute(
+            "DELETE FROM saildata_changes WHERE seq <= ?",
+            (cursor.lastrowid - SAILDATA_CHANGES_RETAIN,),
+        )
+        return cursor.lastrowid
+
+    def _store_derived(self, conn, yacht_id, values, force=False):
+        """
+        Write derived metrics for one yacht unless its inputs are unchanged.
+        Returns True if the stored metrics were (re)computed. Clones still
+        inheriting their saildata are skipped: they are served their base's
+        metrics, and a row of their own would collide with the copy made when
+        they materialize.
+        """
+        if self.inheritance.source(conn, "saildata", yacht_id) != yacht_id:
+            return False
+        digest = inputs_hash(values)
+        if not force:
+            row = conn.execute(
+                "SELECT inputs_hash FROM saildata_derived WHERE yacht_id = ?",
+                (yacht_id,),
+            ).fetchone()
+            if row and row[0] == digest:
+                return False
+        metrics = compute_derived_metrics(values)
+        columns = ("yacht_id", "inputs_hash") + METRIC_COLUMNS + ("computed_at",)
+        placeholders = ", ".join("?" for _ in columns)
+        conn.execute(
+            f"INSERT OR REPLACE INTO saildata_derived ({', '.join(columns)}) VALUES ({placeholders})",
+            (
+                yacht_id,
+                digest,
+                *(metrics[col] for col in METRIC_COLUMNS),
+                time.time(),
+            ),
+        )
+        return True
+
+    def _yachts_missing_derived(self):
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT s.yacht_id FROM saildata s "
+                "LEFT JOIN saildata_derived d ON d.yacht_id = s.yacht_id "
+                "WHERE d.yacht_id IS NULL"
+            )
+            return [row[0] for row in cursor.fetchall()]
+
+    def recompute_derived(self, yacht_ids=None, force=False):
+        """
+        Recompute derived metrics for `yacht_ids` (all yachts if None) in one
+        transaction. Without `force` only yachts whose inputs changed since the
+        last computation are rewritten. Returns the yacht_ids that were updated.
+        """
+        if yacht_ids is None:
+            yacht_ids = self.list_yacht_ids()
+        records = self.get_saildata_batch(yacht_ids, include_derived=False)
+        updated = []
+        with sqlite3.connect(self.db_path) as conn:
+            for yacht_id, values in records.items():
+                if self._store_derived(conn, yacht_id, values, force=force):
+                    # Derived metrics are part of the served record
+                    self._record_change(conn, yacht_id, "upsert")
+                    updated.append(yacht_id)
             conn.commit()
+        return updated
 
     def delete_saildata_by_yacht(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM saildata WHERE yacht_id = ?", (yacht_id,))
+            # Clones inheriting this record get their own copy first
+            self.inheritance.detach_dependants(conn, "saildata", yacht_id)
+            linked = self.inheritance.base_of(conn, yacht_id) is not None
+            self.inheritance.unlink(conn, yacht_id)
+            conn.execute("DELETE FROM saildata_derived WHERE yacht_id = ?", (yacht_id,))
+            cursor = conn.execute("DELETE FROM saildata WHERE yacht_id = ?", (yacht_id,))
+            if cursor.rowcount or linked:
+                self._record_change(conn, yacht_id, "delete")
+            conn.commit()
+
+    def delete_many(self, yacht_ids):
+        """
+        Delete the saildata of many yachts in one transaction, recording a
+        delete event for each yacht that had any. Returns {table: rows deleted}.
+        """
+        ids = list(dict.fromkeys(yacht_ids))
+        with sqlite3.connect(self.db_path) as conn:
+            present = set()
+            for start in range(0, len(ids), BATCH_CHUNK):
+                chunk = ids[start : start + BATCH_CHUNK]
+                placeholders = ", ".join("?" for _ in chunk)
+                for table in ("saildata", "yacht_inheritance"):
+                    present.update(
+                        row[0]
+                        for row in conn.execute(
+                            f"SELECT yacht_id FROM {table} WHERE yacht_id IN ({placeholders})",
+                            chunk,
+                        )
+                    )
+            deleted = self.inheritance.delete_yachts(conn, ids, BATCH_CHUNK)
+            for yacht_id in ids:
+                if yacht_id in present:
+                    self._record_change(conn, yacht_id, "delete")
+            conn.commit()
+        return deleted
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        """Copy source_yacht_id's saildata and derived metrics onto target_yacht_id."""
+        with sqlite3.connect(self.db_path) as conn:
+            copied = self.inheritance.copy_yacht(conn, source_yacht_id, target_yacht_id)
+            if copied["saildata"]:
+                self._record_change(conn, target_yacht_id, "upsert")
+            conn.commit()
+        return copied
+
+    def link_yacht(self, yacht_id, base_id):
+        """Serve base_id's saildata for yacht_id until yacht_id saves its own."""
+        self.inheritance.link(yacht_id, base_id)
+        with sqlite3.connect(self.db_path) as conn:
+            self._record_change(conn, yacht_id, "upsert")
             conn.commit()
 
     def save_saildata(self, saildata: SailData, base_id=None):
-        # Only store kwargs in the data column
-        base_keys = {"yacht_id", "i", "j", "p", "e"}
-        kwargs = {k: v for k, v in saildata.to_dict().items() if k not in base_keys}
-        data_json = json.dumps(kwargs)
-        self.delete_saildata_by_yacht(saildata.yacht_id)
+        values = saildata.to_dict()
+        if base_id is None:
+            base_id = values.get("base_id")
+        # Only true extras go into the data column
+        values.pop(DERIVED_KEY, None)
+        column_keys = set(COLUMN_FIELDS)
+        extras = {k: v for k, v in values.items() if k not in column_keys}
+        columns = ("yacht_id", "base_id") + VALUE_COLUMNS + ("data",)
+        placeholders = ", ".join("?" for _ in columns)
         with sqlite3.connect(self.db_path) as conn:
+            # The new record replaces whatever a clone inherited
+            self.inheritance.materialize(conn, "saildata", saildata.yacht_id, copy=False)
+            conn.execute(
+                "DELETE FROM saildata WHERE yacht_id = ?", (saildata.yacht_id,)
+            )
             conn.execute(
-                "INSERT INTO saildata (yacht_id, base_id, i, j, p, e, data) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                f"INSERT INTO saildata ({', '.join(columns)}) VALUES ({placeholders})",
                 (
                     saildata.yacht_id,
                     base_id,
-                    saildata.i,
-                    saildata.j,
-                    saildata.p,
-                    saildata.e,
-                    data_json,
+                    *(values.get(col) for col in VALUE_COLUMNS),
+                    json.dumps(extras),
                 ),
             )
+            self._store_derived(conn, saildata.yacht_id, values)
+            self._record_change(conn, saildata.yacht_id, "upsert")
             conn.commit()
 
     def get_saildata_by_yacht(self, yacht_id):
+        columns = ("base_id",) + VALUE_COLUMNS + ("data",)
+        select = ", ".join(
+            [f"s.{col}" for col in columns] + [f"d.{col}" for col in METRIC_COLUMNS]
+        )
+        with sqlite3.connect(self.db_path) as conn:
+            source = self.inheritance.source(conn, "saildata", yacht_id)
+            row = conn.execute(
+                f"SELECT {select} FROM saildata s "
+                "LEFT JOIN saildata_derived d ON d.yacht_id = s.yacht_id "
+                "WHERE s.yacht_id = ?",
+                (source,),
+            ).fetchone()
+            if source != yacht_id:
+                inherited_from = self.inheritance.base_of(conn, yacht_id)
+        if row is None:
+            return None
+        values = dict(zip(columns, row[: len(columns)]))
+        if source != yacht_id:
+            values["base_id"] = inherited_from
+        derived = dict(zip(METRIC_COLUMNS, row[len(columns) :]))
+        kwargs = json.loads(values.pop("data") or "{}")
+        kwargs.pop("yacht_id", None)
+        # NULL dimensions fall back to their I/J/P/E defaults in SailData
+        kwargs.update(
+            {col: values[col] for col in DIMENSION_COLUMNS if values[col] is not None}
+        )
+        saildata = SailData(
+            yacht_id,
+            values["i"],
+            values["j"],
+            values["p"],
+            values["e"],
+            base_id=values["base_id"],
+            **kwargs,
+        )
+        saildata.derived = derived
+        return saildata
+
+    def get_saildata_batch(self, yacht_ids, fields=None, include_derived=True):
+        """
+        Return {yacht_id: saildata dict} for the given yachts in one pass.
+
+        With `fields` only those columns are read (yacht_id is always
+        included), and the JSON extras are only decoded if a requested field
+        is not a column. Derived metric names may be requested as fields;
+        full reads carry them under "derived". Yachts without saildata are
+        left out.
+        """
+        if fields is None:
+            wanted = None
+            select = COLUMN_FIELDS + ("data",)
+            metrics = METRIC_COLUMNS if include_derived else ()
+        else:
+            wanted = [f for f in fields if f != "yacht_id"]
+            select = ("yacht_id",) + tuple(f for f in wanted if f in COLUMN_FIELDS)
+            metrics = tuple(f for f in wanted if f in METRIC_COLUMNS)
+            if any(f not in COLUMN_FIELDS and f not in METRIC_COLUMNS for f in wanted):
+                select += ("data",)
+        sql_columns = ", ".join(
+            [f"s.{col}" for col in select] + [f"d.{col}" for col in metrics]
+        )
+        join = (
+            " LEFT JOIN saildata_derived d ON d.yacht_id = s.yacht_id"
+            if metrics
+            else ""
+        )
+        result = {}
+        ids = list(dict.fromkeys(yacht_ids))
+        with sqlite3.connect(self.db_path) as conn:
+            for start in range(0, len(ids), BATCH_CHUNK):
+                chunk = ids[start : start + BATCH_CHUNK]
+                # Clones are answered from the record they inherit
+                sources = self.inheritance.sources(conn, "saildata", chunk)
+                readers = {}
+                for yacht_id, source in sources.items():
+                    readers.setdefault(source, []).append(yacht_id)
+                source_ids = list(readers)
+                placeholders = ", ".join("?" for _ in source_ids)
+                cursor = conn.execute(
+                    f"SELECT s.yacht_id, {sql_columns} FROM saildata s{join} "
+                    f"WHERE s.yacht_id IN ({placeholders})",
+                    source_ids,
+                )
+                for source, *row in cursor.fetchall():
+                    values = dict(zip(select, row))
+                    derived = dict(zip(metrics, row[len(select) :]))
+                    data_json = values.pop("data", None)
+                    extras = json.loads(data_json) if data_json else {}
+                    if wanted is None:
+                        values.update(extras)
+                        if metrics:
+                            values[DERIVED_KEY] = derived
+                    else:
+                        values.update(derived)
+                        for f in wanted:
+                            if f not in values and f in extras:
+                                values[f] = extras[f]
+                    for yacht_id in readers[source]:
+                        record = dict(values, yacht_id=yacht_id)
+                        if yacht_id != source and "base_id" in record:
+                            record["base_id"] = self.inheritance.base_of(conn, yacht_id)
+                        if DERIVED_KEY in record:
+                            record[DERIVED_KEY] = dict(record[DERIVED_KEY])
+                        result[yacht_id] = record
+        return result
+
+    def find_yacht_ids(self, column, min_value=None, max_value=None):
+        """
+        Return yacht_ids whose `column` lies within [min_value, max_value].
+        Only the typed dimension columns and derived metrics can be filtered on.
+        """
+        if column in VALUE_COLUMNS:
+            table = "saildata"
+        elif column in METRIC_COLUMNS:
+            table = "saildata_derived"
+        else:
+            raise ValueError(f"Cannot filter saildata on '{column}'")
+        clauses = []
+        params = []
+        if min_value is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(min_value)
+        if max_value is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(max_value)
+        where = " AND ".join(clauses) or f"{column} IS NOT NULL"
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT id, yacht_id, i, j, p, e, data FROM saildata WHERE yacht_id = ?",
-                (yacht_id,),
+                f"SELECT yacht_id FROM {table} WHERE {where} ORDER BY yacht_id",
+                params,
             )
-            row = cursor.fetchone()
-            if row:
-                id_, yacht_id, i, j, p, e, data_json = row
-                kwargs = json.loads(data_json) if data_json else {}
-                kwargs.pop("yacht_id", None)
-                saildata = SailData(yacht_id, i, j, p, e, **kwargs)
-                return saildata
-            return None
+            matches = [row[0] for row in cursor.fetchall()]
+            # Clones match whatever the record they inherit matches
+            for yacht_id in list(matches):
+                matches.extend(self.inheritance.dependants(conn, "saildata", yacht_id))
+        return sorted(set(matches))
+
+    def get_changes_since(self, since, limit=500):
+        """
+        Return (changes, last_seq, oldest_seq) for outbox entries after `since`.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "SELECT seq, yacht_id, change_type, changed_at FROM saildata_changes "
+                "WHERE seq > ? ORDER BY seq LIMIT ?",
+                (since, limit),
+            )
+            changes = [
+                {
+                    "seq": seq,
+                    "yacht_id": yacht_id,
+                    "change_type": change_type,
+                    "changed_at": changed_at,
+                }
+                for seq, yacht_id, change_type, changed_at in cursor.fetchall()
+            ]
+            last_seq, oldest_seq = conn.execute(
+                "SELECT MAX(seq), MIN(seq) FROM saildata_changes"
+            ).fetchone()
+        return changes, last_seq or 0, oldest_seq or 0
 
-    def list_yacht_ids(self):
+    def list_yacht_ids(self, include_linked=False):
+        # include_linked: also clones that still read another yacht's record
+        query = "SELECT yacht_id FROM saildata"
+        if include_linked:
+            query += " UNION SELECT yacht_id FROM yacht_inheritance"
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("SELECT yacht_id FROM saildata")
+            cursor = conn.execute(query)
             return [row[0] for row in cursor.fetchall()]
+
+    def own_records_first(self, yacht_ids):
+        """yacht_ids with yachts holding their own record before clones reading another's."""
+        with sqlite3.connect(self.db_path) as conn:
+            sources = self.inheritance.sources(conn, "saildata", yacht_ids)
+        return sorted(sources, key=lambda yacht_id: sources[yacht_id] != yacht_id)
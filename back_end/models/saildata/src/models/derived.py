@@ -0,0 +1,127 @@
+"""
+Derived rig metrics for the Running Rigging Management system.
+
+Values that sails, ropes and the front end would otherwise each recompute from
+SailData (foretriangle and mainsail areas, sail area/displacement ratio and the
+hypotenuse luff lengths used by the headsail and halyard classes). They are
+computed when saildata is written and stored alongside it.
+"""
+
+import hashlib
+import json
+from math import sqrt
+
+# Bump when a formula below changes so stored metrics are recomputed
+# (2: luffs and the main diagonal in metres, like the areas)
+METRICS_VERSION = 2
+
+# Everything the metrics depend on; a change to any of these triggers a recompute
+METRIC_INPUTS = (
+    "i",
+    "j",
+    "p",
+    "e",
+    "genoa_i",
+    "genoa_j",
+    "jib_i",
+    "jib_j",
+    "spin_i",
+    "spin_j",
+    "codezero_i",
+    "codezero_j",
+    "staysail_i",
+    "staysail_j",
+    "trisail_i",
+    "trisail_j",
+    "main_p",
+    "main_e",
+    "displacement",
+)
+
+METRIC_COLUMNS = (
+    "foretriangle_area",
+    "mainsail_area",
+    "total_sail_area",
+    "sa_displacement",
+    "genoa_luff",
+    "jib_luff",
+    "spin_luff",
+    "codezero_luff",
+    "staysail_luff",
+    "trisail_luff",
+    "main_diagonal",
+)
+
+# Sea water, kg/m^3, for converting displacement mass to volume
+SEA_WATER_DENSITY = 1025.0
+
+
+def _mm_to_m(val):
+    """Convert mm to meters if value is likely in mm (val > 100), as BaseSail does."""
+    return val / 1000 if val and val > 100 else val
+
+
+def _hypot(a, b):
+    if a is None or b is None:
+        return None
+    return sqrt(_mm_to_m(a) ** 2 + _mm_to_m(b) ** 2)
+
+
+def _triangle_area(luff, foot):
+    if luff is None or foot is None:
+        return None
+    return 0.5 * _mm_to_m(luff) * _mm_to_m(foot)
+
+
+def inputs_hash(values: dict) -> str:
+    """Stable fingerprint of the metric inputs in `values`."""
+    inputs = {}
+    for key in METRIC_INPUTS:
+        val = values.get(key)
+        # SQLite hands REAL columns back as floats; hash 4000 and 4000.0 alike
+        if isinstance(val, (int, float)) and not isinstance(val, bool):
+            val = float(val)
+        inputs[key] = val
+    payload = json.dumps([METRICS_VERSION, inputs], sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+def compute_derived_metrics(values: dict) -> dict:
+    """
+    Compute the derived metrics from a saildata dict.
+
+    Areas are in m^2 and luffs in m, with dimensions over 100 read as mm.
+    sa_displacement is the usual SA / (displacement volume)^(2/3) and is only
+    available when the record carries a displacement in kg, kept in step with
+    the hull by the hull change subscriber.
+    """
+
+    def get(key, fallback=None):
+        val = values.get(key)
+        return val if val is not None else values.get(fallback)
+
+    foretriangle = _triangle_area(values.get("i"), values.get("j"))
+    mainsail = _triangle_area(get("main_p", "p"), get("main_e", "e"))
+    total = (
+        foretriangle + mainsail
+        if foretriangle is not None and mainsail is not None
+        else None
+    )
+    displacement = values.get("displacement")
+    sa_displacement = None
+    if total is not None and displacement:
+        volume = float(displacement) / SEA_WATER_DENSITY
+        sa_displacement = total / volume ** (2 / 3)
+    return {
+        "foretriangle_area": foretriangle,
+        "mainsail_area": mainsail,
+        "total_sail_area": total,
+        "sa_displacement": sa_displacement,
+        "genoa_luff": _hypot(get("genoa_i", "i"), get("genoa_j", "j")),
+        "jib_luff": _hypot(get("jib_i", "i"), get("jib_j", "j")),
+        "spin_luff": _hypot(get("spin_i", "i"), get("spin_j", "j")),
+        "codezero_luff": _hypot(get("codezero_i", "i"), get("codezero_j", "j")),
+        "staysail_luff": _hypot(get("staysail_i", "i"), get("staysail_j", "j")),
+        "trisail_luff": _hypot(get("trisail_i", "i"), get("trisail_j", "j")),
+        "main_diagonal": _hypot(get("main_p", "p"), get("main_e", "e")),
+    }
@@ -0,0 +1,253 @@
+"""
+Copy-on-write yacht inheritance.
+
+A clone is registered with `link(yacht_id, base_id)` and owns no rows: reads
+of a resource resolve to the nearest ancestor that owns that resource, i.e.
+one that has materialized it or is not a clone at all. The first write to a
+resource copies the inherited rows into the clone (`materialize`), after
+which the clone's rows are independent of its base. Once a clone owns every
+resource the link has no effect and is dropped.
+
+A resource is a name for one or more tables keyed by yacht_id that are
+always copied together (e.g. saildata with its derived metrics). The rows'
+own base_id columns keep recording what a yacht was copied from; the link
+tables here only describe live inheritance.
+"""
+
+import sqlite3
+
+# Longest base chain followed before giving up; links never form cycles
+MAX_DEPTH = 32
+
+
+class YachtInheritance:
+    def __init__(self, db_path, resources):
+        self.db_path = db_path
+        self.resources = dict(resources)
+        self._columns = {}
+        with sqlite3.connect(db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS yacht_inheritance (
+                    yacht_id INTEGER PRIMARY KEY,
+                    base_id INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS yacht_materialized (
+                    yacht_id INTEGER NOT NULL,
+                    resource TEXT NOT NULL,
+                    PRIMARY KEY (yacht_id, resource)
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_yacht_inheritance_base ON yacht_inheritance(base_id)"
+            )
+            conn.commit()
+
+    def _copy_columns(self, conn, table):
+        if table not in self._columns:
+            self._columns[table] = [
+                row[1]
+                for row in conn.execute(f"PRAGMA table_info({table})")
+                if row[1] not in ("id", "yacht_id")
+            ]
+        return self._columns[table]
+
+    def base_of(self, conn, yacht_id):
+        row = conn.execute(
+            "SELECT base_id FROM yacht_inheritance WHERE yacht_id = ?", (yacht_id,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def chain(self, conn, yacht_id):
+        """[yacht_id, base, base of base, ...] up to the first non-clone."""
+        chain = [yacht_id]
+        base = self.base_of(conn, yacht_id)
+        while base is not None and len(chain) < MAX_DEPTH:
+            chain.append(base)
+            base = self.base_of(conn, base)
+        return chain
+
+    def _is_materialized(self, conn, yacht_id, resource):
+        return (
+            conn.execute(
+                "SELECT 1 FROM yacht_materialized WHERE yacht_id = ? AND resource = ?",
+                (yacht_id, resource),
+            ).fetchone()
+            is not None
+        )
+
+    def source(self, conn, resource, yacht_id):
+        """The yacht whose rows of `resource` are served for `yacht_id`."""
+        current = yacht_id
+        for _ in range(MAX_DEPTH):
+            base = self.base_of(conn, current)
+            if base is None or self._is_materialized(conn, current, resource):
+                return current
+            current = base
+        return current
+
+    def sources(self, conn, resource, yacht_ids):
+        """
+        {yacht_id: source} for many yachts. Only the ids that are clones are
+        resolved one by one; pass at most a few hundred ids at a time.
+        """
+        result = {yacht_id: yacht_id for yacht_id in yacht_ids}
+        if not result:
+            return result
+        placeholders = ", ".join("?" for _ in result)
+        for (yacht_id,) in conn.execute(
+            f"SELECT yacht_id FROM yacht_inheritance WHERE yacht_id IN ({placeholders})",
+            list(result),
+        ).fetchall():
+            result[yacht_id] = self.source(conn, resource, yacht_id)
+        return result
+
+    def link(self, yacht_id, base_id):
+        """
+        Make `yacht_id` inherit everything from `base_id`. Resources the yacht
+        already has rows for stay its own.
+        """
+        if yacht_id == base_id:
+            raise ValueError("A yacht cannot inherit from itself")
+        with sqlite3.connect(self.db_path) as conn:
+            if yacht_id in self.chain(conn, base_id):
+                raise ValueError(f"Yacht {base_id} already inherits from {yacht_id}")
+            conn.execute(
+                "INSERT OR REPLACE INTO yacht_inheritance (yacht_id, base_id) VALUES (?, ?)",
+                (yacht_id, base_id),
+            )
+            conn.execute("DELETE FROM yacht_materialized WHERE yacht_id = ?", (yacht_id,))
+            for resource, tables in self.resources.items():
+                owned = any(
+                    conn.execute(
+                        f"SELECT 1 FROM {table} WHERE yacht_id = ? LIMIT 1", (yacht_id,)
+                    ).fetchone()
+                    for table in tables
+                )
+                if owned:
+                    self._mark(conn, yacht_id, resource)
+            self._prune(conn, yacht_id)
+            conn.commit()
+
+    def _mark(self, conn, yacht_id, resource):
+        conn.execute(
+            "INSERT OR IGNORE INTO yacht_materialized (yacht_id, resource) VALUES (?, ?)",
+            (yacht_id, resource),
+        )
+
+    def _prune(self, conn, yacht_id):
+        owned = conn.execute(
+            "SELECT COUNT(*) FROM yacht_materialized WHERE yacht_id = ?", (yacht_id,)
+        ).fetchone()[0]
+        if owned >= len(self.resources):
+            self.unlink(conn, yacht_id)
+
+    def unlink(self, conn, yacht_id):
+        conn.execute("DELETE FROM yacht_inheritance WHERE yacht_id = ?", (yacht_id,))
+        conn.execute("DELETE FROM yacht_materialized WHERE yacht_id = ?", (yacht_id,))
+
+    def materialize(self, conn, resource, yacht_id, copy=True):
+        """
+        Give `yacht_id` its own rows of `resource` before a write. With
+        copy=False (the write replaces everything anyway) nothing is copied.
+        No-op for yachts that already own the resource.
+        """
+        if self.base_of(conn, yacht_id) is None or self._is_materialized(
+            conn, yacht_id, resource
+        ):
+            return
+        source = self.source(conn, resource, yacht_id)
+        if copy and source != yacht_id:
+            for table in self.resources[resource]:
+                columns = self._copy_columns(conn, table)
+                names = ", ".join(columns)
+                # Stray rows (e.g. written while inheriting) would collide
+                conn.execute(f"DELETE FROM {table} WHERE yacht_id = ?", (yacht_id,))
+                conn.execute(
+                    f"INSERT INTO {table} (yacht_id, {names}) "
+                    f"SELECT ?, {names} FROM {table} WHERE yacht_id = ?",
+                    (yacht_id, source),
+                )
+        self._mark(conn, yacht_id, resource)
+        self._prune(conn, yacht_id)
+
+    def copy_yacht(self, conn, source_id, target_id):
+        """
+        Physically copy every resource of source_id, as served (so inherited
+        rows too), onto target_id in one INSERT ... SELECT per table,
+        replacing target_id's rows. Copied rows record source_id in their
+        base_id column where they have one. Returns {table: rows copied}.
+        """
+        if source_id == target_id:
+            raise ValueError("A yacht cannot be copied onto itself")
+        copied = {}
+        for resource, tables in self.resources.items():
+            # Clones reading target_id's rows keep what they had
+            self.detach_dependants(conn, resource, target_id)
+            source = self.source(conn, resource, source_id)
+            for table in tables:
+                columns = self._copy_columns(conn, table)
+                values = ", ".join("?" if col == "base_id" else col for col in columns)
+                params = (source_id,) if "base_id" in columns else ()
+                conn.execute(f"DELETE FROM {table} WHERE yacht_id = ?", (target_id,))
+                cursor = conn.execute(
+                    f"INSERT INTO {table} (yacht_id, {', '.join(columns)}) "
+                    f"SELECT ?, {values} FROM {table} WHERE yacht_id = ?",
+                    (target_id, *params, source),
+                )
+                copied[table] = cursor.rowcount
+        self.unlink(conn, target_id)
+        return copied
+
+    def delete_yachts(self, conn, yacht_ids, chunk_size=500):
+        """
+        Delete every resource of the given yachts with one DELETE ... IN per
+        table and chunk, after copying their rows into clones still reading
+        them. Returns {table: rows deleted}.
+        """
+        ids = list(dict.fromkeys(yacht_ids))
+        for yacht_id in ids:
+            for resource in self.resources:
+                self.detach_dependants(conn, resource, yacht_id)
+        deleted = {table: 0 for tables in self.resources.values() for table in tables}
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start : start + chunk_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            for table in deleted:
+                cursor = conn.execute(
+                    f"DELETE FROM {table} WHERE yacht_id IN ({placeholders})", chunk
+                )
+                deleted[table] += cursor.rowcount
+            for table in ("yacht_inheritance", "yacht_materialized"):
+                conn.execute(f"DELETE FROM {table} WHERE yacht_id IN ({placeholders})", chunk)
+        return deleted
+
+    def dependants(self, conn, resource, yacht_id):
+        """Clones (at any depth) whose reads of `resource` resolve to `yacht_id`."""
+        found = []
+        pending = [yacht_id]
+        while pending:
+            current = pending.pop()
+            for (child,) in conn.execute(
+                "SELECT yacht_id FROM yacht_inheritance WHERE base_id = ?", (current,)
+            ).fetchall():
+                if not self._is_materialized(conn, child, resource):
+                    found.append(child)
+                    pending.append(child)
+        return found
+
+    def detach_dependants(self, conn, resource, yacht_id):
+        """
+        Copy `resource` into the direct clones that still inherit it from
+        `yacht_id`, before its rows are deleted or replaced. Deeper clones
+        then resolve to those copies.
+        """
+        for (child,) in conn.execute(
+            "SELECT yacht_id FROM yacht_inheritance WHERE base_id = ?", (yacht_id,)
+        ).fetchall():
+            self.materialize(conn, resource, child)
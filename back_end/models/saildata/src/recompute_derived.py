@@ -0,0 +1,28 @@
+# recompute_derived.py: batch recompute of the derived rig metrics
+#
+# Usage (from the saildata service directory):
+#   python -m src.recompute_derived            # only yachts whose inputs changed
+#   python -m src.recompute_derived --all      # everything, e.g. after a formula change
+#   python -m src.recompute_derived 12 15 42   # specific yachts
+import argparse
+
+from src.models.database import SailDataDatabase
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute derived saildata metrics")
+    parser.add_argument("yacht_ids", nargs="*", type=int, help="Yachts to recompute")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Recompute even when the inputs are unchanged",
+    )
+    args = parser.parse_args(argv)
+    db = SailDataDatabase()
+    updated = db.recompute_derived(args.yacht_ids or None, force=args.all)
+    print(f"Recomputed derived metrics for {len(updated)} yachts")
+    return updated
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,23 @@
 from .models.saildata import SailData
 from .models.factory import SailDataFactory
-from .models.database import SailDataDatabase
+from .models.database import SailDataDatabase, DERIVED_KEY
 from .config import SAILDATA_DB_PATH
-import requests
 import threading
+import time
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Upper bound for a single /saildata/changes long-poll
+MAX_CHANGES_WAIT = 30.0
 
-class SailDataService:
-    _thread_local = threading.local()
 
+class SailDataService:
     def __init__(self, db_path=SAILDATA_DB_PATH, api_url=None):
         self.db = SailDataDatabase(db_path)
         self.api_url = api_url or "http://localhost:8001"  # Default saildata API URL
+        # Wakes long-polling /saildata/changes requests when this process writes
+        self._changed = threading.Condition()
 
     def initialize_from_base(self, yacht_id, base_yacht):
         saildata = SailDataFactory.create(
@@ -44,45 +47,113 @@ class SailDataService:
         )
 
     def save_saildata(self, saildata: SailData):
-        # Ensure only one entry per yacht_id by deleting before saving
-        self.db.delete_saildata_by_yacht(saildata.yacht_id)
+        # Replaces any existing row; the change event is recorded for the yacht
+        # and for every clone still reading it, and all of them are read fresh
         self.db.save_saildata(saildata)
+        self._notify_changed()
 
     def save_saildata_from_dict(self, yacht_id, data: dict):
         saildata = SailDataFactory.from_dict(yacht_id, data)
         self.save_saildata(saildata)
 
     def get_saildata(self, yacht_id):
-        # Use a thread-local cache to avoid repeated HTTP requests for the same yacht_id within a request
-        if not hasattr(self._thread_local, "saildata_cache"):
-            self._thread_local.saildata_cache = {}
-        cache = self._thread_local.saildata_cache
-        if yacht_id in cache:
-            return cache[yacht_id]
-        # Try HTTP API first for microservice orchestration
-        try:
-            resp = requests.get(f"{self.api_url}/saildata/{yacht_id}", timeout=2)
-            if resp.status_code == 200:
-                data = resp.json()
-                cache[yacht_id] = data
-                return data
-        except Exception:
-            pass  # Remove unused variable 'e' (F841)
+        # Always read the DB: it is the only copy every worker thread sees
+        # up to date, and subscribers refetch here after a change event
         result = self.db.get_saildata_by_yacht(yacht_id)
         if result is None:
             return None
         if hasattr(result, "to_dict"):
-            data = result.to_dict()
-            cache[yacht_id] = data
-            return data
-        cache[yacht_id] = result
+            return result.to_dict()
         return result
 
+    def get_saildata_batch(self, yacht_ids, fields=None):
+        # Read straight from the DB; no per-yacht HTTP round trips
+        return self.db.get_saildata_batch(yacht_ids, fields)
+
+    def find_yacht_ids(self, column, min_value=None, max_value=None):
+        return self.db.find_yacht_ids(column, min_value, max_value)
+
     def delete_saildata_by_yacht(self, yacht_id):
         self.db.delete_saildata_by_yacht(yacht_id)
+        self._notify_changed()
+
+    def link_yacht(self, yacht_id, base_id):
+        # Copy-on-write clone: no rows are copied until the clone saves its own
+        self.db.link_yacht(yacht_id, base_id)
+        self._notify_changed()
+        logger.info(f"Sail data for yacht {yacht_id} now inherited from {base_id}.")
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        copied = self.db.copy_from(source_yacht_id, target_yacht_id)
+        self._notify_changed()
+        return copied
+
+    def delete_many(self, yacht_ids):
+        deleted = self.db.delete_many(yacht_ids)
+        self._notify_changed()
+        return deleted
+
+    def list_yacht_ids(self):
+        return self.db.list_yacht_ids(include_linked=True)
+
+    def apply_displacements(self, displacements):
+        """
+        Store hull displacements, {yacht_id: kg or None}, where they differ
+        from the saildata record, so its SA/D ratio is recomputed. Yachts
+        without saildata are skipped. Returns the yacht_ids updated.
+        """
+        updated = []
+        # A clone whose base has just been updated then already matches and
+        # keeps inheriting instead of getting its own copy
+        for yacht_id in self.db.own_records_first(list(displacements)):
+            saildata = self.db.get_saildata_by_yacht(yacht_id)
+            if saildata is None:
+                continue
+            values = saildata.to_dict()
+            displacement = displacements[yacht_id]
+            if values.get("displacement") == displacement:
+                continue
+            values.pop(DERIVED_KEY, None)
+            if displacement is None:
+                values.pop("displacement", None)
+            else:
+                values["displacement"] = displacement
+            self.db.save_saildata(SailDataFactory.from_dict(yacht_id, values))
+            updated.append(yacht_id)
+        if updated:
+            self._notify_changed()
+        return updated
+
+    def _notify_changed(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def get_changes(self, since=None, timeout=0.0, limit=500):
+        """
+        Return saildata change events after the `since` sequence number.
+
+        Blocks for up to `timeout` seconds until at least one change exists
+        (long-poll). Without `since` it returns the current head immediately so
+        a new subscriber can start from there. `reset` tells the subscriber it
+        missed events (pruned outbox or a recreated DB) and must drop its cache.
+        """
+        timeout = min(max(timeout, 0.0), MAX_CHANGES_WAIT)
+        deadline = time.monotonic() + timeout
+        while True:
+            changes, head, oldest = self.db.get_changes_since(since or 0, limit)
+            if since is None:
+                return {"changes": [], "last_seq": head, "reset": False}
+            if since > head or (oldest and since < oldest - 1):
+                return {"changes": [], "last_seq": head, "reset": True}
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                last_seq = changes[-1]["seq"] if changes else since
+                return {"changes": changes, "last_seq": last_seq, "reset": False}
+            # Re-check the DB at least once a second so writes made by other
+            # worker processes are seen too
+            with self._changed:
+                self._changed.wait(min(remaining, 1.0))
 
     def close(self):
         self.db.close()
 
-
-# Ensure requests is in requirements.txt
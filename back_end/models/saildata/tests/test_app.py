@@ -5,6 +5,292 @@ from src.app import app
 client = TestClient(app)
 
 
+class _FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
 def test_get_saildata():
     response = client.get("/saildata/1")
     assert response.status_code in (200, 404, 422)
+
+
+def test_saildata_changes_feed_reports_writes():
+    head = client.get("/saildata/changes").json()
+    assert head["changes"] == []
+    since = head["last_seq"]
+
+    payload = {"yacht_id": 990027, "i": 10.0, "j": 3.0, "p": 9.0, "e": 3.5}
+    assert client.post("/saildata/", json=payload).status_code == 200
+    assert client.delete("/saildata/990027").status_code == 200
+
+    response = client.get("/saildata/changes", params={"since": since})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reset"] is False
+    changes = [c for c in body["changes"] if c["yacht_id"] == 990027]
+    assert [c["change_type"] for c in changes] == ["upsert", "delete"]
+    assert body["last_seq"] == body["changes"][-1]["seq"]
+
+
+def test_saildata_changes_feed_resets_unknown_cursor():
+    head = client.get("/saildata/changes").json()["last_seq"]
+    response = client.get("/saildata/changes", params={"since": head + 1000})
+    assert response.json()["reset"] is True
+
+
+def test_saildata_read_on_another_thread_sees_write():
+    from concurrent.futures import ThreadPoolExecutor
+    from src.app import saildata_service
+
+    reader, writer = ThreadPoolExecutor(max_workers=1), ThreadPoolExecutor(max_workers=1)
+    payload = {"yacht_id": 990030, "i": 10.0, "j": 3.0, "p": 9.0, "e": 3.5}
+    writer.submit(saildata_service.save_saildata_from_dict, 990030, payload).result()
+    assert reader.submit(saildata_service.get_saildata, 990030).result()["i"] == 10.0
+    writer.submit(saildata_service.save_saildata_from_dict, 990030, {**payload, "i": 20.0}).result()
+    assert reader.submit(saildata_service.get_saildata, 990030).result()["i"] == 20.0
+    writer.submit(saildata_service.delete_saildata_by_yacht, 990030).result()
+    assert reader.submit(saildata_service.get_saildata, 990030).result() is None
+    reader.shutdown()
+    writer.shutdown()
+
+
+def test_clone_read_on_another_thread_sees_base_write():
+    from concurrent.futures import ThreadPoolExecutor
+    from src.app import saildata_service
+
+    base_id, clone_id = 990031, 990032
+    reader, writer = ThreadPoolExecutor(max_workers=1), ThreadPoolExecutor(max_workers=1)
+    payload = {"yacht_id": base_id, "i": 10.0, "j": 3.0, "p": 9.0, "e": 3.5}
+    writer.submit(saildata_service.save_saildata_from_dict, base_id, payload).result()
+    writer.submit(saildata_service.link_yacht, clone_id, base_id).result()
+    assert reader.submit(saildata_service.get_saildata, clone_id).result()["i"] == 10.0
+
+    head = saildata_service.get_changes()["last_seq"]
+    writer.submit(saildata_service.save_saildata_from_dict, base_id, {**payload, "i": 20.0}).result()
+    assert reader.submit(saildata_service.get_saildata, clone_id).result()["i"] == 20.0
+    changed = {c["yacht_id"] for c in saildata_service.get_changes(since=head)["changes"]}
+    assert changed == {base_id, clone_id}
+
+    writer.submit(saildata_service.delete_many, [base_id, clone_id]).result()
+    reader.shutdown()
+    writer.shutdown()
+
+
+def test_saildata_batch_projection_and_search():
+    payload = {
+        "yacht_id": 990028,
+        "i": 14.0,
+        "j": 4.5,
+        "p": 13.0,
+        "e": 4.2,
+        "extras": {"spin_j": 5.0, "mast_colour": "silver"},
+    }
+    assert client.post("/saildata/", json=payload).status_code == 200
+
+    full = client.post("/saildata/batch", json={"yacht_ids": [990028, 990099]}).json()
+    assert list(full) == ["990028"]
+    assert full["990028"]["spin_j"] == 5.0
+    assert full["990028"]["genoa_i"] == 14.0
+    assert full["990028"]["mast_colour"] == "silver"
+
+    projected = client.post(
+        "/saildata/batch", json={"yacht_ids": [990028], "fields": ["j", "mast_colour"]}
+    ).json()
+    assert projected["990028"] == {"yacht_id": 990028, "j": 4.5, "mast_colour": "silver"}
+
+    ids = client.get("/saildata/search", params={"field": "j", "min": 4.0}).json()
+    assert 990028 in ids
+    assert client.get("/saildata/search", params={"field": "data"}).status_code == 400
+
+    single = client.get("/saildata/990028").json()
+    assert single["spin_j"] == 5.0 and single["mast_colour"] == "silver"
+    client.delete("/saildata/990028")
+
+
+def test_saildata_served_with_derived_metrics():
+    payload = {
+        "yacht_id": 990029,
+        "i": 12000,
+        "j": 4000,
+        "p": 11000,
+        "e": 4000,
+        "extras": {"displacement": 5000},
+    }
+    assert client.post("/saildata/", json=payload).status_code == 200
+
+    derived = client.get("/saildata/990029").json()["derived"]
+    assert derived["foretriangle_area"] == pytest.approx(24.0)
+    assert derived["mainsail_area"] == pytest.approx(22.0)
+    assert derived["total_sail_area"] == pytest.approx(46.0)
+    # Lengths in metres like the areas, whatever unit the dimensions came in
+    assert derived["genoa_luff"] == pytest.approx((12**2 + 4**2) ** 0.5)
+    assert derived["main_diagonal"] == pytest.approx((11**2 + 4**2) ** 0.5)
+    assert derived["sa_displacement"] == pytest.approx(46.0 / (5000 / 1025) ** (2 / 3))
+
+    ids = client.get(
+        "/saildata/search", params={"field": "total_sail_area", "min": 45}
+    ).json()
+    assert 990029 in ids
+    client.delete("/saildata/990029")
+
+
+def test_hull_displacement_change_recomputes_sa_displacement(monkeypatch):
+    from src.app import saildata_service
+    from src.hull_events import HullChangeSubscriber
+
+    base_id, clone_id = 990033, 990034
+    payload = {"yacht_id": base_id, "i": 12000, "j": 4000, "p": 11000, "e": 4000, "extras": {"displacement": 5000}}
+    client.post("/saildata/", json=payload)
+    client.post("/saildata/inherit", json={"yacht_id": clone_id, "base_id": base_id})
+
+    hulls = {base_id: 6000.0, clone_id: 6000.0}
+    feed = {"changes": [], "last_seq": 7, "reset": False}
+
+    def fake_get(url, params=None, timeout=None):
+        assert url == "http://hull/hull/changes"
+        return _FakeResponse(feed)
+
+    def fake_post(url, json=None, timeout=None):
+        assert url == "http://hull/hull/bundle"
+        return _FakeResponse(
+            {str(y): {"hull": {"displacement": hulls[y]}} for y in json["yacht_ids"] if y in hulls}
+        )
+
+    monkeypatch.setattr("src.hull_events.requests.get", fake_get)
+    monkeypatch.setattr("src.hull_events.requests.post", fake_post)
+    subscriber = HullChangeSubscriber("http://hull", saildata_service)
+    head = client.get("/saildata/changes").json()["last_seq"]
+
+    # The first poll syncs every yacht; the clone follows its base
+    subscriber.poll_once()
+    sa_d = 46.0 / (6000 / 1025) ** (2 / 3)
+    for yacht_id in (base_id, clone_id):
+        assert client.get(f"/saildata/{yacht_id}").json()["derived"]["sa_displacement"] == pytest.approx(sa_d)
+    changed = {c["yacht_id"] for c in client.get("/saildata/changes", params={"since": head}).json()["changes"]}
+    assert {base_id, clone_id} <= changed
+
+    # Later polls only sync the hulls the feed reports
+    hulls[base_id] = hulls[clone_id] = 7000.0
+    feed = {"changes": [{"seq": 8, "yacht_id": base_id}, {"seq": 9, "yacht_id": clone_id}], "last_seq": 9, "reset": False}
+    subscriber.poll_once()
+    assert subscriber._since == 9
+    clone = client.get(f"/saildata/{clone_id}").json()
+    assert clone["displacement"] == 7000.0 and clone["base_id"] == base_id
+    assert clone["derived"]["sa_displacement"] == pytest.approx(46.0 / (7000 / 1025) ** (2 / 3))
+    # The clone still reads the base's record rather than a copy
+    client.post("/saildata/", json=dict(payload, j=4500))
+    assert client.get(f"/saildata/{clone_id}").json()["j"] == 4500
+
+    client.delete(f"/saildata/{clone_id}")
+    client.delete(f"/saildata/{base_id}")
+
+
+def test_inherited_saildata_copy_on_write():
+    base_id, clone_id = 990040, 990041
+    client.delete(f"/saildata/{clone_id}")
+    payload = {"yacht_id": base_id, "i": 12000, "j": 4000, "p": 11000, "e": 4000}
+    assert client.post("/saildata/", json=payload).status_code == 200
+    head = client.get("/saildata/changes").json()["last_seq"]
+    assert client.post("/saildata/inherit", json={"yacht_id": clone_id, "base_id": base_id}).status_code == 200
+
+    clone = client.get(f"/saildata/{clone_id}").json()
+    assert clone["yacht_id"] == clone_id and clone["base_id"] == base_id
+    assert clone["derived"]["foretriangle_area"] == pytest.approx(24.0)
+    batch = client.post("/saildata/batch", json={"yacht_ids": [base_id, clone_id], "fields": ["j"]}).json()
+    assert batch[str(clone_id)] == {"yacht_id": clone_id, "j": 4000}
+    assert clone_id in client.get("/saildata/search", params={"field": "j", "min": 3999, "max": 4001}).json()
+
+    # A write to the base reaches the clone, and its feed says so
+    client.post("/saildata/", json=dict(payload, j=4500))
+    assert client.get(f"/saildata/{clone_id}").json()["j"] == 4500
+    changed = {c["yacht_id"] for c in client.get("/saildata/changes", params={"since": head}).json()["changes"]}
+    assert {base_id, clone_id} <= changed
+
+    # The clone's own write doesn't touch the base
+    client.post("/saildata/", json=dict(payload, yacht_id=clone_id, j=5000))
+    assert client.get(f"/saildata/{base_id}").json()["j"] == 4500
+    assert client.get(f"/saildata/{clone_id}").json()["j"] == 5000
+    client.delete(f"/saildata/{base_id}")
+    client.delete(f"/saildata/{clone_id}")
+
+
+def test_saildata_copy_from():
+    source_id, target_id = 990042, 990043
+    client.post("/saildata/", json={"yacht_id": source_id, "i": 12000, "j": 4000, "p": 11000, "e": 4000})
+    resp = client.post("/saildata/copy_from", json={"source_yacht_id": source_id, "target_yacht_id": target_id})
+    assert resp.json()["copied"] == {"saildata": 1, "saildata_derived": 1}
+    client.delete(f"/saildata/{source_id}")
+    copy = client.get(f"/saildata/{target_id}").json()
+    assert copy["j"] == 4000 and copy["base_id"] == source_id
+    assert copy["derived"]["foretriangle_area"] == pytest.approx(24.0)
+    client.delete(f"/saildata/{target_id}")
+
+
+def test_saildata_delete_batch():
+    ids = [990045, 990046]
+    for yacht_id in ids:
+        client.post("/saildata/", json={"yacht_id": yacht_id, "i": 1, "j": 2, "p": 3, "e": 4})
+    head = client.get("/saildata/changes").json()["last_seq"]
+    resp = client.post("/saildata/delete_batch", json={"yacht_ids": ids + [990047]})
+    assert resp.json()["deleted"] == {"saildata": 2, "saildata_derived": 2}
+    changes = client.get("/saildata/changes", params={"since": head}).json()["changes"]
+    assert sorted((c["yacht_id"], c["change_type"]) for c in changes) == [(990045, "delete"), (990046, "delete")]
+
+
+def test_dimension_migration_is_all_or_nothing(tmp_path):
+    import json
+    import sqlite3
+    from src.models.database import DIMENSION_COLUMNS, SailDataDatabase
+
+    path = str(tmp_path / "saildata.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE saildata (id INTEGER PRIMARY KEY AUTOINCREMENT, yacht_id INTEGER NOT NULL, "
+            "base_id INTEGER, i REAL, j REAL, p REAL, e REAL, data TEXT NOT NULL)"
+        )
+        conn.execute(
+            "INSERT INTO saildata (yacht_id, i, j, p, e, data) VALUES (1, 10, 3, 9, 3.5, ?)",
+            (json.dumps({"spin_j": 5.0, "mast_colour": "silver"}),),
+        )
+        conn.execute("INSERT INTO saildata (yacht_id, data) VALUES (2, '{not json')")
+
+    def columns():
+        with sqlite3.connect(path) as conn:
+            return {row[1] for row in conn.execute("PRAGMA table_info(saildata)")}
+
+    # A failed backfill takes the new columns with it, so the next start retries
+    with pytest.raises(json.JSONDecodeError):
+        SailDataDatabase(path)
+    assert not columns() & set(DIMENSION_COLUMNS)
+
+    with sqlite3.connect(path) as conn:
+        conn.execute("DELETE FROM saildata WHERE yacht_id = 2")
+    db = SailDataDatabase(path)
+    assert set(DIMENSION_COLUMNS) <= columns()
+    migrated = db.get_saildata_by_yacht(1).to_dict()
+    assert migrated["spin_j"] == 5.0 and migrated["mast_colour"] == "silver"
+
+
+def test_recompute_derived_skips_inheriting_clone():
+    from src.app import saildata_service
+
+    base_id, clone_id = 990033, 990034
+    payload = {"yacht_id": base_id, "i": 10.0, "j": 3.0, "p": 9.0, "e": 3.5}
+    saildata_service.save_saildata_from_dict(base_id, payload)
+    saildata_service.link_yacht(clone_id, base_id)
+    assert saildata_service.db.recompute_derived([clone_id], force=True) == []
+
+    # The clone gets its own copy of the record, derived metrics included
+    saildata_service.delete_saildata_by_yacht(base_id)
+    clone = saildata_service.get_saildata(clone_id)
+    assert clone["i"] == 10.0 and clone["yacht_id"] == clone_id
+    saildata_service.delete_many([clone_id])
@@ -1,11 +1,27 @@
 # Minimal FastAPI app for Docker build
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from .service import SailService
+from .config import SAILDATA_API_URL, SAILDATA_EVENTS_ENABLED
+from .saildata_events import SaildataChangeSubscriber
 
 app = FastAPI()
 sail_service = SailService()
+saildata_subscriber = SaildataChangeSubscriber(
+    SAILDATA_API_URL, sail_service.saildata_cache
+)
+
+
+@app.on_event("startup")
+def start_saildata_subscriber():
+    if SAILDATA_EVENTS_ENABLED:
+        saildata_subscriber.start()
+
+
+@app.on_event("shutdown")
+def stop_saildata_subscriber():
+    saildata_subscriber.stop()
 
 
 class SailTypeRequest(BaseModel):
@@ -29,6 +45,59 @@ class PossibleSailRequest(BaseModel):
     config: Optional[Dict[str, Any]] = None
 
 
+class PossibleSailsRequest(BaseModel):
+    sails: List[PossibleSailRequest]
+
+
+class InheritRequest(BaseModel):
+    yacht_id: int
+    base_id: int
+
+
+class CopyFromRequest(BaseModel):
+    source_yacht_id: int
+    target_yacht_id: int
+
+
+class DeleteBatchRequest(BaseModel):
+    yacht_ids: List[int]
+
+
+@app.post("/sails/inherit")
+def inherit_sails(req: InheritRequest):
+    """
+    Make yacht_id a copy-on-write clone of base_id: it serves the base's
+    sails and possible sails until it first changes them.
+    """
+    try:
+        sail_service.link_yacht(req.yacht_id, req.base_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok"}
+
+
+@app.post("/sails/copy_from")
+def copy_sails_from(req: CopyFromRequest):
+    """
+    Physically copy the source yacht's sails and possible sails onto the target yacht,
+    replacing the target's. Returns the number of rows copied per table.
+    """
+    try:
+        copied = sail_service.copy_from(req.source_yacht_id, req.target_yacht_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"status": "ok", "copied": copied}
+
+
+@app.post("/sails/delete_batch")
+def delete_sails_batch(req: DeleteBatchRequest):
+    """
+    Delete the sails and possible sails of every listed yacht in one transaction.
+    Returns the number of rows deleted per table.
+    """
+    return {"status": "deleted", "deleted": sail_service.delete_yachts(req.yacht_ids)}
+
+
 # --- POSSIBLE SAILS ROUTES (must be before generic /sails/{yacht_id}) ---
 @app.get("/sails/possible/{yacht_id}")
 def get_possible_sails(yacht_id: int):
@@ -45,6 +114,20 @@ def add_possible_sail(yacht_id: int, req: PossibleSailRequest):
     return {"status": "ok"}
 
 
+@app.post("/sails/possible/{yacht_id}/bulk")
+def add_possible_sails(yacht_id: int, req: PossibleSailsRequest):
+    """
+    Add or update all listed sails in one transaction and return the yacht's
+    resulting possible sails.
+    """
+    try:
+        return sail_service.add_possible_sails(
+            yacht_id, [(s.sail_type, s.config) for s in req.sails]
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @app.delete("/sails/possible/{yacht_id}")
 def remove_possible_sail(yacht_id: int, sail_type: str):
     return sail_service.remove_possible_sail(yacht_id, sail_type)
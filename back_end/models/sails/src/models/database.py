@@ -1,12 +1,17 @@
 import sqlite3
 from config import SAILS_DB_PATH
 from .sail_utils import normalize_sail_type
+from .inheritance import YachtInheritance
+
+# Copy-on-write resources: a clone inherits each until it first writes to it
+SAIL_RESOURCES = {"sails": ("sails",), "sails_possible": ("sails_possible",)}
 
 
 class Database:
     def __init__(self, db_path=SAILS_DB_PATH):
         self.db_path = db_path
         self.create_tables()
+        self.inheritance = YachtInheritance(db_path, SAIL_RESOURCES)
 
     def create_tables(self):
         with sqlite3.connect(self.db_path) as conn:
@@ -46,6 +51,7 @@ class Database:
             sail_type = normalize_sail_type(
                 sail_dict["name"] if sail_dict.get("name") else None
             )
+            self.inheritance.materialize(conn, "sails", sail_dict["yacht_id"])
             cursor.execute(
                 """
             INSERT INTO sails (yacht_id, base_id, sail_type, luff, leech, foot, area, config)
@@ -67,7 +73,8 @@ class Database:
     def get_sails_by_yacht(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute("SELECT * FROM sails WHERE yacht_id = ?", (yacht_id,))
+            source = self.inheritance.source(conn, "sails", yacht_id)
+            cursor.execute("SELECT * FROM sails WHERE yacht_id = ?", (source,))
             return cursor.fetchall()
 
     def get_sails_by_type(self, sail_type):
@@ -81,15 +88,18 @@ class Database:
         sail_type = normalize_sail_type(sail_type)
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            source = self.inheritance.source(conn, "sails", yacht_id)
             cursor.execute(
                 "SELECT * FROM sails WHERE yacht_id = ? AND sail_type = ?",
-                (yacht_id, sail_type),
+                (source, sail_type),
             )
             return cursor.fetchone()
 
     def delete_sails_by_yacht(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            # The yacht now has no sails of its own rather than inheriting
+            self.inheritance.materialize(conn, "sails", yacht_id, copy=False)
             cursor.execute("DELETE FROM sails WHERE yacht_id = ?", (yacht_id,))
             conn.commit()
 
@@ -97,25 +107,95 @@ class Database:
         sail_type = normalize_sail_type(sail_type)
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            self.inheritance.materialize(conn, "sails_possible", yacht_id)
             cursor.execute(
                 "INSERT OR REPLACE INTO sails_possible (yacht_id, sail_type, config) VALUES (?, ?, ?)",
                 (yacht_id, sail_type, str(config) if config else None),
             )
             conn.commit()
 
+    def save_possible_sails(self, yacht_id, entries):
+        """
+        Add or update many possible sails in one transaction. `entries` are
+        (sail_type, config) pairs; an entry without config keeps the config
+        already stored for that sail.
+        """
+        wanted = {normalize_sail_type(sail_type): config for sail_type, config in entries}
+        with sqlite3.connect(self.db_path) as conn:
+            self.inheritance.materialize(conn, "sails_possible", yacht_id)
+            existing = {
+                normalize_sail_type(row[0])
+                for row in conn.execute(
+                    "SELECT sail_type FROM sails_possible WHERE yacht_id = ?", (yacht_id,)
+                )
+            }
+            conn.executemany(
+                "INSERT OR REPLACE INTO sails_possible (yacht_id, sail_type, config) VALUES (?, ?, ?)",
+                [
+                    (yacht_id, sail_type, str(config) if config else None)
+                    for sail_type, config in wanted.items()
+                    if config or sail_type not in existing
+                ],
+            )
+            conn.commit()
+
     def get_possible_sails(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            source = self.inheritance.source(conn, "sails_possible", yacht_id)
             cursor.execute(
                 "SELECT sail_type, config FROM sails_possible WHERE yacht_id = ?",
-                (yacht_id,),
+                (source,),
             )
             # Normalize all sail_type values on load
             sails = [(normalize_sail_type(row[0]), row[1]) for row in cursor.fetchall()]
         return sails
 
+    def delete_possible_sail(self, yacht_id, sail_type):
+        sail_type = normalize_sail_type(sail_type)
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            self.inheritance.materialize(conn, "sails_possible", yacht_id)
+            cursor.execute(
+                "DELETE FROM sails_possible WHERE yacht_id = ? AND sail_type = ?",
+                (yacht_id, sail_type),
+            )
+            conn.commit()
+
     def delete_possible_sails(self, yacht_id):
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
+            self.inheritance.materialize(conn, "sails_possible", yacht_id, copy=False)
             cursor.execute("DELETE FROM sails_possible WHERE yacht_id = ?", (yacht_id,))
             conn.commit()
+
+    def link_yacht(self, yacht_id, base_id):
+        """Make yacht_id a copy-on-write clone of base_id's sails."""
+        self.inheritance.link(yacht_id, base_id)
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        """Copy source_yacht_id's sails and possible sails onto target_yacht_id in one transaction."""
+        with sqlite3.connect(self.db_path) as conn:
+            copied = self.inheritance.copy_yacht(conn, source_yacht_id, target_yacht_id)
+            conn.commit()
+        return copied
+
+    def delete_yachts(self, yacht_ids):
+        """Delete the sails and possible sails of many yachts in one transaction."""
+        with sqlite3.connect(self.db_path) as conn:
+            deleted = self.inheritance.delete_yachts(conn, yacht_ids)
+            conn.commit()
+        return deleted
+
+    def delete_yacht(self, yacht_id):
+        """
+        Remove everything stored for a yacht. Clones still inheriting from it
+        get their own copies first.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            for resource, tables in SAIL_RESOURCES.items():
+                self.inheritance.detach_dependants(conn, resource, yacht_id)
+                for table in tables:
+                    conn.execute(f"DELETE FROM {table} WHERE yacht_id = ?", (yacht_id,))
+            self.inheritance.unlink(conn, yacht_id)
+            conn.commit()
@@ -1,4 +1,5 @@
 import inspect
+from collections.abc import Mapping
 from enum import Enum
 from .sails.jib import Jib
 from .sails.genoa import Genoa
@@ -36,7 +37,7 @@ class SailFactory:
         SailType.TRISAIL: Trisail,
     }
 
-    def __init__(self, saildata: dict, yacht_id):
+    def __init__(self, saildata: Mapping, yacht_id):
         self.yacht_id = yacht_id
         self.saildata = saildata
         self.sails_possible_on_boat: list[SailType] = []
@@ -82,7 +83,7 @@ class SailFactory:
 
     def generate_all_sails_on_boat(self):
         self.load_possible_sails_from_db()
-        if not isinstance(self.saildata, dict):
+        if not isinstance(self.saildata, Mapping):
             raise ValueError(
                 f"No saildata found for yacht_id={self.yacht_id}. Cannot generate sails."
             )
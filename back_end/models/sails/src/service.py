@@ -1,8 +1,10 @@
 import requests
-from .config import SAILS_DB_PATH, SAILDATA_API_URL
-from .models.sail_factory import SailFactory
+from .config import SAILS_DB_PATH, SAILDATA_API_URL, SAILDATA_CACHE_TTL
+from .models.sail_factory import SailFactory, SailType
+from .models.lazy_saildata import LazySailData
 from .models.database import Database
 from .models.sail_utils import normalize_sail_type
+from .saildata_events import SaildataCache
 from src.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,8 +13,13 @@ logger = get_logger(__name__)
 class SailService:
     def __init__(self, db_path=SAILS_DB_PATH):
         self.db = Database(db_path)
+        self.saildata_cache = SaildataCache(SAILDATA_CACHE_TTL)
 
     def _fetch_saildata_http(self, yacht_id):
+        cached = self.saildata_cache.get(yacht_id)
+        if cached is not None:
+            return cached
+        version = self.saildata_cache.version(yacht_id)
         url = f"{SAILDATA_API_URL}/saildata/{yacht_id}"
         logger.debug(f"[DEBUG] Fetching saildata via HTTP: {url}")
         try:
@@ -20,6 +27,7 @@ class SailService:
             if resp.status_code == 200:
                 data = resp.json()
                 logger.debug(f"[DEBUG] saildata HTTP response: {data}")
+                self.saildata_cache.set(yacht_id, data, version)
                 return data
             else:
                 logger.warning(
@@ -55,12 +63,9 @@ class SailService:
 
     def _get_factory(self, yacht_id):
         logger.debug(f"[DEBUG] _get_factory called for yacht_id={yacht_id}")
-        saildata = self._fetch_saildata_http(yacht_id)
-        logger.debug(f"[DEBUG] _fetch_saildata_http({yacht_id}) returned: {saildata}")
-        if saildata is None:
-            raise ValueError(
-                f"No saildata found for yacht_id={yacht_id}. Cannot create SailFactory."
-            )
+        # Saildata is only fetched once a sail actually needs its geometry, so
+        # possible-sail CRUD never depends on the saildata service being up.
+        saildata = LazySailData(yacht_id, self._fetch_saildata_http)
         return SailFactory(saildata, yacht_id)
 
     def add_sail_type(self, yacht_id, sail_type, config=None):
@@ -118,6 +123,8 @@ class SailService:
         result = []
         for row in rows:
             d = dict(zip(keys, row))
+            # Inherited rows are stored under the base yacht
+            d["yacht_id"] = yacht_id
             d["name"] = d["sail_type"]  # Add a name field for API compatibility
             result.append(d)
         return result
@@ -138,13 +145,7 @@ class SailService:
 
     def get_possible_sails(self, yacht_id):
         logger.debug(f"[DEBUG] get_possible_sails called for yacht_id={yacht_id}")
-        try:
-            factory = self._get_factory(yacht_id)
-        except Exception as e:
-            logger.error(
-                f"[DEBUG] Exception in get_possible_sails for yacht_id={yacht_id}: {e}"
-            )
-            raise
+        factory = self._get_factory(yacht_id)
         factory.load_possible_sails_from_db()
         # Return a list of dicts with type and config (minimal info for overview)
         result = []
@@ -175,24 +176,31 @@ class SailService:
             factory.add_sail_type_to_possible_on_boat(sail_type, config)
         return self.get_possible_sails(yacht_id)
 
+    def add_possible_sails(self, yacht_id, sails):
+        """
+        Add many (sail_type, config) pairs in one write and return the yacht's
+        resulting possible sails. Raises ValueError for an unknown sail type.
+        """
+        entries = []
+        for sail_type, config in sails:
+            sail_type_str = normalize_sail_type(sail_type)
+            SailType(sail_type_str)
+            entries.append((sail_type_str, config))
+        self.db.save_possible_sails(yacht_id, entries)
+        return self.get_possible_sails(yacht_id)
+
     def remove_possible_sail(self, yacht_id, sail_type):
-        sail_type_str = normalize_sail_type(sail_type)
-        # Remove from DB directly
-        with self.db.db_path and self.db.db_path:
-            import sqlite3
-
-            with sqlite3.connect(self.db.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    "DELETE FROM sails_possible WHERE yacht_id = ? AND sail_type = ?",
-                    (yacht_id, sail_type_str),
-                )
-                conn.commit()
-        # Reload possible sails
-        factory = self._get_factory(yacht_id)
-        factory.load_possible_sails_from_db()
+        self.db.delete_possible_sail(yacht_id, sail_type)
         return self.get_possible_sails(yacht_id)
 
+    def link_yacht(self, yacht_id, base_id):
+        self.db.link_yacht(yacht_id, base_id)
+
+    def copy_from(self, source_yacht_id, target_yacht_id):
+        return self.db.copy_from(source_yacht_id, target_yacht_id)
+
+    def delete_yachts(self, yacht_ids):
+        return self.db.delete_yachts(yacht_ids)
+
     def delete_sails_by_yacht(self, yacht_id):
-        self.db.delete_sails_by_yacht(yacht_id)
-        self.db.delete_possible_sails(yacht_id)
+        self.db.delete_yacht(yacht_id)
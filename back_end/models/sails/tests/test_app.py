@@ -13,3 +13,74 @@ client = TestClient(app)
 def test_possible_sails():
     response = client.get("/sails/possible/1")
     assert response.status_code in (200, 404, 422)
+
+
+def test_possible_sail_crud_without_saildata_service():
+    # Possible-sail CRUD only touches the local DB, so it must not need saildata
+    response = client.post("/sails/possible/999001", json={"sail_type": "genoa"})
+    assert response.status_code == 200
+    assert {"type": "Genoa"} in client.get("/sails/possible/999001").json()
+    response = client.delete("/sails/possible/999001", params={"sail_type": "genoa"})
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_inherited_possible_sails_copy_on_write():
+    base_id, clone_id = 999040, 999041
+    client.delete(f"/sails/{base_id}")
+    client.delete(f"/sails/{clone_id}")
+    client.post(f"/sails/possible/{base_id}", json={"sail_type": "genoa"})
+    assert client.post("/sails/inherit", json={"yacht_id": clone_id, "base_id": base_id}).status_code == 200
+    assert [s["type"] for s in client.get(f"/sails/possible/{clone_id}").json()] == ["Genoa"]
+
+    # The clone's first change copies the list; the base is untouched
+    client.post(f"/sails/possible/{clone_id}", json={"sail_type": "jib"})
+    assert sorted(s["type"] for s in client.get(f"/sails/possible/{clone_id}").json()) == ["Genoa", "Jib"]
+    assert [s["type"] for s in client.get(f"/sails/possible/{base_id}").json()] == ["Genoa"]
+
+    # Deleting the base leaves the clone with its own copy
+    client.delete(f"/sails/{base_id}")
+    assert len(client.get(f"/sails/possible/{clone_id}").json()) == 2
+    assert client.post("/sails/inherit", json={"yacht_id": clone_id, "base_id": clone_id}).status_code == 400
+    client.delete(f"/sails/{clone_id}")
+
+
+def test_copy_from_duplicates_possible_sails():
+    source_id, target_id = 999042, 999043
+    client.delete(f"/sails/{target_id}")
+    client.post(f"/sails/possible/{source_id}", json={"sail_type": "genoa"})
+    client.post(f"/sails/possible/{target_id}", json={"sail_type": "jib"})
+    resp = client.post("/sails/copy_from", json={"source_yacht_id": source_id, "target_yacht_id": target_id})
+    assert resp.status_code == 200 and resp.json()["copied"]["sails_possible"] == 1
+    # The copy replaces the target's list and doesn't follow later source edits
+    client.delete(f"/sails/{source_id}")
+    assert [s["type"] for s in client.get(f"/sails/possible/{target_id}").json()] == ["Genoa"]
+    client.delete(f"/sails/{target_id}")
+
+
+def test_bulk_possible_sails():
+    yacht_id = 999044
+    client.delete(f"/sails/{yacht_id}")
+    client.post(f"/sails/possible/{yacht_id}", json={"sail_type": "genoa", "config": {"area": 30}})
+    resp = client.post(
+        f"/sails/possible/{yacht_id}/bulk",
+        json={"sails": [{"sail_type": "genoa"}, {"sail_type": "mainsail"}, {"sail_type": "jib", "config": {"area": 20}}]},
+    )
+    assert resp.status_code == 200
+    # The genoa keeps its stored config since none was sent
+    assert sorted(resp.json(), key=lambda s: s["type"]) == [
+        {"type": "Genoa", "area": 30},
+        {"type": "Jib", "area": 20},
+        {"type": "Mainsail"},
+    ]
+    assert client.post(f"/sails/possible/{yacht_id}/bulk", json={"sails": [{"sail_type": "kite"}]}).status_code == 400
+    client.delete(f"/sails/{yacht_id}")
+
+
+def test_delete_batch():
+    ids = [999045, 999046]
+    for yacht_id in ids:
+        client.post(f"/sails/possible/{yacht_id}", json={"sail_type": "genoa"})
+    resp = client.post("/sails/delete_batch", json={"yacht_ids": ids + [999047]})
+    assert resp.json()["deleted"]["sails_possible"] == 2
+    assert all(client.get(f"/sails/possible/{yacht_id}").json() == [] for yacht_id in ids)
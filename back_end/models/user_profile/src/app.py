@@ -1,10 +1,13 @@
-from fastapi import FastAPI, HTTPException, Request, Depends, Body
+from fastapi import FastAPI, HTTPException, Depends, Body, Query
 from src.models import BaseUser  # Only BaseUser is used
 import src.services as services
 from src.database import initialize_db
-from jose import jwt, JWTError
+from src.auth import JWTAuth
 import os
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import json
 
 app = FastAPI()
 
@@ -20,23 +23,13 @@ app.add_middleware(
 initialize_db()
 
 AUTH_JS_SECRET = os.environ.get("AUTH_JS_SECRET", "your_authjs_secret")
+AUTH_TOKEN_CACHE_SIZE = int(os.environ.get("AUTH_TOKEN_CACHE_SIZE", "1024"))
+AUTH_TOKEN_CACHE_TTL = float(os.environ.get("AUTH_TOKEN_CACHE_TTL", "300"))
 
-# Dependency to extract user_id from JWT
-
-
-def get_user_id_from_jwt(request: Request):
-    auth = request.headers.get("Authorization")
-    if not auth or not auth.startswith("Bearer "):
-        raise HTTPException(status_code=401, detail="Missing or invalid token")
-    token = auth.split(" ")[1]
-    try:
-        payload = jwt.decode(token, AUTH_JS_SECRET, algorithms=["HS256"])
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=401, detail="User ID not found in token")
-        return user_id
-    except JWTError:
-        raise HTTPException(status_code=401, detail="Invalid token")
+# Dependency to extract user_id from JWT; verified tokens are cached until exp
+get_user_id_from_jwt = JWTAuth(
+    AUTH_JS_SECRET, cache_size=AUTH_TOKEN_CACHE_SIZE, max_ttl=AUTH_TOKEN_CACHE_TTL
+)
 
 
 @app.get("/users/me", response_model=BaseUser)
@@ -47,6 +40,36 @@ def get_my_profile(user_id: str = Depends(get_user_id_from_jwt)):
     return user
 
 
+def _parse_fields(fields: Optional[str]):
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in services.USER_FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown user fields: {', '.join(unknown)}")
+    return requested
+
+
+# Must be declared before /users/{user_id}
+@app.get("/users/page")
+def list_users_page(
+    after: str = Query("", description="next_after from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    format: str = Query("json", pattern="^(json|ndjson)$"),
+):
+    """
+    Users ordered by user_id, a page at a time. With format=ndjson every user
+    after `after` is streamed as one JSON object per line and `limit` is ignored.
+    """
+    requested = _parse_fields(fields)
+    if format == "ndjson":
+        lines = (json.dumps(user) + "\n" for user in services.iter_users(after, None, requested))
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+    users, next_after = services.list_users(after, limit, requested)
+    return {"users": users, "next_after": next_after}
+
+
 @app.get("/users/{user_id}", response_model=BaseUser)
 def get_user(user_id: str):
     user = services.get_user(user_id)
@@ -63,11 +86,11 @@ def create_user(user: BaseUser):
 
 @app.put("/users/{user_id}", response_model=BaseUser)
 def update_user(user_id: str, user: BaseUser):
-    existing = services.get_user(user_id)
-    if not existing:
+    if not services.user_exists(user_id):
         raise HTTPException(status_code=404, detail="User not found")
     services.save_user(user)
-    return user
+    # yacht_ids are merged with the stored ones, so return what is stored
+    return services.get_user(user.user_id)
 
 
 @app.delete("/users/{user_id}")
@@ -85,15 +108,41 @@ def health():
 
 @app.get("/users/", response_model=list[BaseUser])
 def list_users():
-    return services.list_users()
+    return list(services.iter_users())
 
 
 @app.post("/users/{user_id}/add_yacht")
 def add_yacht_to_user_endpoint(user_id: str, yacht_id: str = Body(..., embed=True)):
-    user = services.get_user(user_id)
-    if not user:
+    if not services.user_exists(user_id):
         raise HTTPException(status_code=404, detail="User not found")
-    if yacht_id not in user.yacht_ids:
-        user.yacht_ids.append(yacht_id)
-        services.save_user(user)
-    return user
+    services.add_yacht_to_user(user_id, yacht_id)
+    return services.get_user(user_id)
+
+
+@app.get("/users/{user_id}/yachts")
+def list_user_yachts(
+    user_id: str,
+    after: int = Query(0, ge=0, description="next_after from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    if not services.user_exists(user_id):
+        raise HTTPException(status_code=404, detail="User not found")
+    yacht_ids, next_after = services.list_user_yachts(user_id, after, limit)
+    return {"user_id": user_id, "yacht_ids": yacht_ids, "next_after": next_after}
+
+
+@app.delete("/users/{user_id}/yachts/{yacht_id}")
+def remove_yacht_from_user(user_id: str, yacht_id: str):
+    if not services.remove_yacht_from_user(user_id, yacht_id):
+        raise HTTPException(status_code=404, detail="User does not own this yacht")
+    return {"message": "Yacht removed from user"}
+
+
+@app.get("/yachts/{yacht_id}/owners")
+def list_yacht_owners(
+    yacht_id: str,
+    after: str = Query("", description="next_after from the previous page"),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    user_ids, next_after = services.list_yacht_owners(yacht_id, after, limit)
+    return {"yacht_id": yacht_id, "user_ids": user_ids, "next_after": next_after}
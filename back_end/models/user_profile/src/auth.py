@@ -0,0 +1,113 @@
+"""
+Bearer-token authentication for the FastAPI services.
+
+JWTAuth verifies Auth.js HS256 tokens and remembers verified tokens in a
+bounded LRU, so a client reusing its token skips the signature check until
+the token expires (or `max_ttl` passes, whichever is sooner). Entries are
+keyed by the token's SHA-256 and the stored token is checked with a
+constant-time comparison before a cached result is trusted.
+
+Use it as a dependency:
+
+    auth = JWTAuth(os.environ.get("AUTH_JS_SECRET"))
+
+    @app.get("/things/mine")
+    def my_things(user_id: str = Depends(auth)):
+        ...
+
+The module only depends on FastAPI and python-jose, so services that need
+authentication copy it into their own src/ alongside their app.
+"""
+
+import hashlib
+import hmac
+import threading
+import time
+from collections import OrderedDict
+
+from fastapi import HTTPException, Request
+from jose import JWTError, jwt
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of verified tokens: sha256(token) -> (token, claims, expires_at)."""
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str, now=None):
+        now = time.time() if now is None else now
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            cached_token, claims, expires_at = entry
+            if expires_at <= now or not hmac.compare_digest(
+                cached_token.encode("utf-8"), token.encode("utf-8")
+            ):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def set(self, token: str, claims: dict, expires_at: float):
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (token, claims, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class JWTAuth:
+    """
+    FastAPI dependency returning the `sub` claim of a valid Bearer token and
+    raising 401 otherwise. Verified claims are cached per token.
+    """
+
+    def __init__(self, secret, algorithms=("HS256",), cache_size=1024, max_ttl=300.0):
+        self.secret = secret
+        self.algorithms = list(algorithms)
+        self.max_ttl = max_ttl
+        self.cache = VerifiedTokenCache(cache_size)
+
+    def verify(self, token: str) -> dict:
+        """Claims of `token`, from the cache when possible. Raises JWTError."""
+        now = time.time()
+        claims = self.cache.get(token, now)
+        if claims is not None:
+            return claims
+        claims = jwt.decode(token, self.secret, algorithms=self.algorithms)
+        expires_at = now + self.max_ttl
+        if claims.get("exp") is not None:
+            expires_at = min(expires_at, float(claims["exp"]))
+        self.cache.set(token, claims, expires_at)
+        return claims
+
+    def __call__(self, request: Request) -> str:
+        auth = request.headers.get("Authorization")
+        if not auth or not auth.startswith("Bearer "):
+            raise HTTPException(status_code=401, detail="Missing or invalid token")
+        token = auth.split(" ")[1]
+        try:
+            claims = self.verify(token)
+        except JWTError:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        user_id = claims.get("sub")
+        if not user_id:
+            raise HTTPException(status_code=401, detail="User ID not found in token")
+        return user_id
@@ -1,3 +1,4 @@
+import json
 import os
 import sqlite3
 
@@ -27,5 +28,46 @@ def initialize_db():
     )
     """
     )
+    # Ownership lives here rather than in users.yacht_ids: one row per
+    # (user, yacht), indexed both ways, so appends are a single atomic insert
+    c.execute(
+        """
+    CREATE TABLE IF NOT EXISTS user_yachts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id TEXT NOT NULL,
+        yacht_id TEXT NOT NULL,
+        UNIQUE (user_id, yacht_id)
+    )
+    """
+    )
+    c.execute("CREATE INDEX IF NOT EXISTS idx_user_yachts_user ON user_yachts (user_id, id)")
+    c.execute("CREATE INDEX IF NOT EXISTS idx_user_yachts_yacht ON user_yachts (yacht_id, user_id)")
     conn.commit()
+    migrate_yacht_ids(conn)
     conn.close()
+
+
+def migrate_yacht_ids(conn):
+    """
+    Move ownership out of the legacy users.yacht_ids JSON column into
+    user_yachts, keeping each user's order. The column is cleared as rows are
+    moved, so this is a no-op once every user has been migrated.
+    """
+    rows = conn.execute(
+        "SELECT user_id, yacht_ids FROM users WHERE yacht_ids IS NOT NULL"
+    ).fetchall()
+    if not rows:
+        return 0
+    pairs = []
+    for row in rows:
+        try:
+            yacht_ids = json.loads(row["yacht_ids"]) or []
+        except (TypeError, ValueError):
+            yacht_ids = []
+        pairs.extend((row["user_id"], str(yacht_id)) for yacht_id in yacht_ids)
+    with conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO user_yachts (user_id, yacht_id) VALUES (?, ?)", pairs
+        )
+        conn.execute("UPDATE users SET yacht_ids = NULL WHERE yacht_ids IS NOT NULL")
+    return len(pairs)
@@ -4,66 +4,218 @@ from src.models import BaseUser, TradeUser, CustomerUser
 
 
 def save_user(user: BaseUser):
+    """
+    Upsert the user row and add user.yacht_ids to the user's yachts, in one
+    transaction. Ownership is merged, never replaced: a save carrying a stale
+    yacht_ids list can't drop yachts added meanwhile. Yachts are removed with
+    remove_yacht_from_user.
+    """
     conn = get_connection()
-    c = conn.cursor()
-    c.execute(
-        """
-    INSERT OR REPLACE INTO users (user_id, role, yacht_ids, telephone, address, subscription_status, payment_info, company_name)
-    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-    """,
-        (
-            user.user_id,
-            user.role,
-            json.dumps(user.yacht_ids),
-            user.telephone,
-            json.dumps(user.address.dict()) if user.address else None,
-            user.subscription_status,
-            json.dumps(user.payment_info.dict()) if user.payment_info else None,
-            getattr(user, "company_name", None),
-        ),
-    )
-    conn.commit()
+    with conn:
+        conn.execute(
+            """
+        INSERT OR REPLACE INTO users (user_id, role, yacht_ids, telephone, address, subscription_status, payment_info, company_name)
+        VALUES (?, ?, NULL, ?, ?, ?, ?, ?)
+        """,
+            (
+                user.user_id,
+                user.role,
+                user.telephone,
+                json.dumps(user.address.dict()) if user.address else None,
+                user.subscription_status,
+                json.dumps(user.payment_info.dict()) if user.payment_info else None,
+                getattr(user, "company_name", None),
+            ),
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO user_yachts (user_id, yacht_id) VALUES (?, ?)",
+            [(user.user_id, str(yacht_id)) for yacht_id in user.yacht_ids],
+        )
     conn.close()
 
 
-def get_user(user_id: str):
-    conn = get_connection()
-    c = conn.cursor()
-    c.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
-    row = c.fetchone()
-    conn.close()
-    if not row:
-        return None
-
+def _user_from_row(row, yacht_ids):
     data = dict(row)
-    data["yacht_ids"] = json.loads(data["yacht_ids"]) if data["yacht_ids"] else []
+    data["yacht_ids"] = yacht_ids
     data["address"] = json.loads(data["address"]) if data["address"] else None
     data["payment_info"] = (
         json.loads(data["payment_info"]) if data["payment_info"] else None
     )
-
     if data["role"] == "trade":
         return TradeUser(**data)
     else:
         return CustomerUser(**data)
 
 
-def list_users():
+def get_user(user_id: str):
     conn = get_connection()
     c = conn.cursor()
-    c.execute("SELECT * FROM users")
-    rows = c.fetchall()
+    c.execute("SELECT * FROM users WHERE user_id = ?", (user_id,))
+    row = c.fetchone()
+    if not row:
+        conn.close()
+        return None
+    c.execute(
+        "SELECT yacht_id FROM user_yachts WHERE user_id = ? ORDER BY id", (user_id,)
+    )
+    yacht_ids = [r["yacht_id"] for r in c.fetchall()]
     conn.close()
-    users = []
-    for row in rows:
-        data = dict(row)
-        data["yacht_ids"] = json.loads(data["yacht_ids"]) if data["yacht_ids"] else []
-        data["address"] = json.loads(data["address"]) if data["address"] else None
-        data["payment_info"] = (
-            json.loads(data["payment_info"]) if data["payment_info"] else None
-        )
-        if data["role"] == "trade":
-            users.append(TradeUser(**data))
-        else:
-            users.append(CustomerUser(**data))
-    return users
+    return _user_from_row(row, yacht_ids)
+
+
+def user_exists(user_id: str) -> bool:
+    conn = get_connection()
+    row = conn.execute("SELECT 1 FROM users WHERE user_id = ?", (user_id,)).fetchone()
+    conn.close()
+    return row is not None
+
+
+def delete_user(user_id: str) -> bool:
+    conn = get_connection()
+    with conn:
+        deleted = conn.execute("DELETE FROM users WHERE user_id = ?", (user_id,)).rowcount
+        conn.execute("DELETE FROM user_yachts WHERE user_id = ?", (user_id,))
+    conn.close()
+    return deleted > 0
+
+
+USER_COLUMNS = (
+    "user_id",
+    "role",
+    "telephone",
+    "address",
+    "subscription_status",
+    "payment_info",
+    "company_name",
+)
+JSON_COLUMNS = ("address", "payment_info")
+# Listable fields; yacht_ids comes from user_yachts rather than a column
+USER_FIELDS = USER_COLUMNS + ("yacht_ids",)
+LIST_CHUNK = 500
+
+
+def _users_chunk(columns, with_yachts, after, size):
+    """
+    Up to `size` user rows after the user_id `after`, with their yacht_ids
+    when asked for. Uses its own connection, so each chunk of a stream can be
+    read on whichever thread asks for it.
+    """
+    conn = get_connection()
+    try:
+        rows = conn.execute(
+            f"SELECT {', '.join(columns)} FROM users WHERE user_id > ? ORDER BY user_id LIMIT ?",
+            (after, size),
+        ).fetchall()
+        owned = {}
+        if with_yachts and rows:
+            placeholders = ", ".join("?" for _ in rows)
+            for r in conn.execute(
+                f"SELECT user_id, yacht_id FROM user_yachts WHERE user_id IN ({placeholders}) ORDER BY id",
+                [row["user_id"] for row in rows],
+            ):
+                owned.setdefault(r["user_id"], []).append(r["yacht_id"])
+    finally:
+        conn.close()
+    return rows, owned
+
+
+def iter_users(after: str = "", limit: int = None, fields=None):
+    """
+    Yield user dicts ordered by user_id, starting after `after`, one row at a
+    time. Only the requested `fields` are read (user_id is always included);
+    address/payment_info are only JSON-decoded, and user_yachts only queried,
+    when they are requested.
+
+    Rows are read LIST_CHUNK at a time, each chunk keyed on the last user_id
+    seen and read with a fresh connection: a streaming response may resume
+    the generator on a different thread.
+    """
+    wanted = USER_FIELDS if fields is None else ("user_id",) + tuple(
+        f for f in fields if f != "user_id"
+    )
+    columns = [f for f in wanted if f in USER_COLUMNS]
+    decode = [f for f in JSON_COLUMNS if f in wanted]
+    with_yachts = "yacht_ids" in wanted
+    after = after or ""
+    remaining = limit
+    while remaining is None or remaining > 0:
+        size = LIST_CHUNK if remaining is None else min(LIST_CHUNK, remaining)
+        rows, owned = _users_chunk(columns, with_yachts, after, size)
+        for row in rows:
+            data = dict(row)
+            for field in decode:
+                data[field] = json.loads(data[field]) if data[field] else None
+            if with_yachts:
+                data["yacht_ids"] = owned.get(data["user_id"], [])
+            yield data
+        if len(rows) < size:
+            return
+        after = rows[-1]["user_id"]
+        if remaining is not None:
+            remaining -= len(rows)
+
+
+def list_users(after: str = "", limit: int = 100, fields=None):
+    """
+    One page of users as dicts (see iter_users). Returns (users, next_after);
+    next_after is None on the last page.
+    """
+    users = list(iter_users(after, limit + 1, fields))
+    page = users[:limit]
+    next_after = page[-1]["user_id"] if len(users) > limit else None
+    return page, next_after
+
+
+def add_yacht_to_user(user_id: str, yacht_id: str) -> bool:
+    """Record ownership atomically. Returns False if the user already owned it."""
+    conn = get_connection()
+    with conn:
+        added = conn.execute(
+            "INSERT OR IGNORE INTO user_yachts (user_id, yacht_id) VALUES (?, ?)",
+            (user_id, str(yacht_id)),
+        ).rowcount
+    conn.close()
+    return added > 0
+
+
+def remove_yacht_from_user(user_id: str, yacht_id: str) -> bool:
+    conn = get_connection()
+    with conn:
+        removed = conn.execute(
+            "DELETE FROM user_yachts WHERE user_id = ? AND yacht_id = ?",
+            (user_id, str(yacht_id)),
+        ).rowcount
+    conn.close()
+    return removed > 0
+
+
+def list_user_yachts(user_id: str, after: int = 0, limit: int = 100):
+    """
+    One page of a user's yacht_ids in the order they were added. Returns
+    (yacht_ids, next_after); next_after is None on the last page.
+    """
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT id, yacht_id FROM user_yachts WHERE user_id = ? AND id > ? ORDER BY id LIMIT ?",
+        (user_id, after, limit + 1),
+    ).fetchall()
+    conn.close()
+    page = rows[:limit]
+    next_after = page[-1]["id"] if len(rows) > limit else None
+    return [r["yacht_id"] for r in page], next_after
+
+
+def list_yacht_owners(yacht_id: str, after: str = "", limit: int = 100):
+    """
+    One page of the user_ids owning a yacht, ordered by user_id. Returns
+    (user_ids, next_after); next_after is None on the last page.
+    """
+    conn = get_connection()
+    rows = conn.execute(
+        "SELECT user_id FROM user_yachts WHERE yacht_id = ? AND user_id > ? ORDER BY user_id LIMIT ?",
+        (str(yacht_id), after, limit + 1),
+    ).fetchall()
+    conn.close()
+    page = [r["user_id"] for r in rows[:limit]]
+    next_after = page[-1] if len(rows) > limit else None
+    return page, next_after
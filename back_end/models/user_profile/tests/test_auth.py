@@ -0,0 +1,58 @@
+import sys
+import os
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from jose import jwt
+
+from src.auth import JWTAuth, VerifiedTokenCache
+
+SECRET = "test-secret"
+
+
+def make_token(sub="user-1", exp_in=60):
+    return jwt.encode({"sub": sub, "exp": int(time.time()) + exp_in}, SECRET, algorithm="HS256")
+
+
+def test_verified_tokens_are_cached(monkeypatch):
+    auth = JWTAuth(SECRET)
+    token = make_token()
+    assert auth.verify(token)["sub"] == "user-1"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("token verified twice")
+
+    monkeypatch.setattr("src.auth.jwt.decode", fail)
+    assert auth.verify(token)["sub"] == "user-1"
+
+
+def test_cache_honours_exp_and_size():
+    cache = VerifiedTokenCache(maxsize=2)
+    cache.set("a", {"sub": "a"}, expires_at=100)
+    assert cache.get("a", now=99) == {"sub": "a"}
+    assert cache.get("a", now=100) is None
+    cache.set("b", {}, 200)
+    cache.set("c", {}, 200)
+    cache.set("d", {}, 200)
+    assert len(cache) == 2 and cache.get("b", now=0) is None
+
+
+def test_dependency_rejects_bad_tokens():
+    auth = JWTAuth(SECRET)
+    app = FastAPI()
+
+    @app.get("/me")
+    def me(user_id: str = Depends(auth)):
+        return {"user_id": user_id}
+
+    client = TestClient(app)
+    ok = client.get("/me", headers={"Authorization": f"Bearer {make_token()}"})
+    assert ok.json() == {"user_id": "user-1"}
+    assert client.get("/me").status_code == 401
+    forged = jwt.encode({"sub": "user-1"}, "other-secret", algorithm="HS256")
+    assert client.get("/me", headers={"Authorization": f"Bearer {forged}"}).status_code == 401
+    expired = make_token(exp_in=-10)
+    assert client.get("/me", headers={"Authorization": f"Bearer {expired}"}).status_code == 401
@@ -0,0 +1,150 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.testclient import TestClient
+
+import src.database as database
+from src.app import app
+
+client = TestClient(app)
+
+
+@pytest.fixture(autouse=True)
+def users_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, "DB_FILE", str(tmp_path / "users.db"))
+    database.initialize_db()
+
+
+def _create(user_id, **fields):
+    resp = client.post("/users/", json={"user_id": user_id, **fields})
+    assert resp.status_code == 200
+    return resp.json()
+
+
+def test_legacy_yacht_ids_are_migrated_once():
+    conn = database.get_connection()
+    with conn:
+        conn.execute(
+            "INSERT INTO users (user_id, role, yacht_ids) VALUES (?, 'customer', ?)",
+            ("u1", json.dumps(["7", "3", "7", 5])),
+        )
+        conn.execute("INSERT INTO users (user_id, role, yacht_ids) VALUES ('u2', 'customer', 'not json')")
+    conn.close()
+
+    database.initialize_db()
+    database.initialize_db()
+    assert client.get("/users/u1").json()["yacht_ids"] == ["7", "3", "5"]
+    assert client.get("/users/u2").json()["yacht_ids"] == []
+    conn = database.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM users WHERE yacht_ids IS NOT NULL").fetchone()[0] == 0
+    conn.close()
+
+
+def test_add_yacht_returns_the_user():
+    _create("u1", telephone="0123")
+    first = client.post("/users/u1/add_yacht", json={"yacht_id": "42"})
+    assert first.status_code == 200
+    assert first.json()["user_id"] == "u1" and first.json()["telephone"] == "0123"
+    assert first.json()["yacht_ids"] == ["42"]
+    again = client.post("/users/u1/add_yacht", json={"yacht_id": "42"})
+    assert again.json()["yacht_ids"] == ["42"]
+    assert client.post("/users/nobody/add_yacht", json={"yacht_id": "42"}).status_code == 404
+
+
+def test_put_merges_ownership():
+    _create("u1", yacht_ids=["1"])
+    # Added after the client read the user, so missing from its PUT body
+    client.post("/users/u1/add_yacht", json={"yacht_id": "2"})
+    resp = client.put("/users/u1", json={"user_id": "u1", "yacht_ids": ["1", "3"], "telephone": "0456"})
+    assert resp.status_code == 200
+    assert resp.json()["yacht_ids"] == ["1", "2", "3"] and resp.json()["telephone"] == "0456"
+    assert client.get("/users/u1").json()["yacht_ids"] == ["1", "2", "3"]
+    assert client.put("/users/nobody", json={"user_id": "nobody"}).status_code == 404
+
+
+def test_user_yachts_and_owners_are_paginated():
+    _create("u1", yacht_ids=["10", "11", "12"])
+    _create("u2", yacht_ids=["11"])
+
+    first = client.get("/users/u1/yachts", params={"limit": 2}).json()
+    assert first["yacht_ids"] == ["10", "11"] and first["next_after"] is not None
+    rest = client.get("/users/u1/yachts", params={"after": first["next_after"], "limit": 2}).json()
+    assert rest == {"user_id": "u1", "yacht_ids": ["12"], "next_after": None}
+    assert client.get("/users/nobody/yachts").status_code == 404
+
+    owners = client.get("/yachts/11/owners", params={"limit": 1}).json()
+    assert owners["user_ids"] == ["u1"]
+    assert client.get("/yachts/11/owners", params={"after": owners["next_after"]}).json()["user_ids"] == ["u2"]
+
+    assert client.delete("/users/u1/yachts/11").status_code == 200
+    assert client.delete("/users/u1/yachts/11").status_code == 404
+    assert client.get("/users/u1").json()["yacht_ids"] == ["10", "12"]
+    assert client.get("/yachts/11/owners").json()["user_ids"] == ["u2"]
+
+
+def test_list_users_returns_every_user():
+    _create("u2", yacht_ids=["5"])
+    _create("u1", role="trade", company_name="Rigging Ltd", address={"street": "1 Quay", "city": "Cowes", "postcode": "PO31", "country": "UK"})
+    users = client.get("/users/").json()
+    assert isinstance(users, list)
+    assert {u["user_id"]: u["yacht_ids"] for u in users} == {"u1": [], "u2": ["5"]}
+    trade = next(u for u in users if u["user_id"] == "u1")
+    assert trade["role"] == "trade" and trade["address"]["city"] == "Cowes"
+
+
+def test_users_page_paginates_and_projects():
+    for user_id in ("u1", "u2", "u3"):
+        _create(user_id, yacht_ids=[user_id[1]])
+
+    first = client.get("/users/page", params={"limit": 2, "fields": "yacht_ids"}).json()
+    assert first == {
+        "users": [{"user_id": "u1", "yacht_ids": ["1"]}, {"user_id": "u2", "yacht_ids": ["2"]}],
+        "next_after": "u2",
+    }
+    rest = client.get("/users/page", params={"after": "u2", "limit": 2}).json()
+    assert [u["user_id"] for u in rest["users"]] == ["u3"] and rest["next_after"] is None
+    assert client.get("/users/page", params={"fields": "password"}).status_code == 400
+
+    resp = client.get("/users/page", params={"after": "u1", "format": "ndjson", "fields": "role"})
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert lines == [{"user_id": "u2", "role": "customer"}, {"user_id": "u3", "role": "customer"}]
+
+
+def test_ndjson_streams_many_chunks_concurrently(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import src.services as services
+
+    monkeypatch.setattr(services, "LIST_CHUNK", 3)
+    user_ids = [f"u{i:02d}" for i in range(20)]
+    for user_id in user_ids:
+        _create(user_id, yacht_ids=[user_id[1:]])
+
+    def stream(_):
+        resp = client.get("/users/page", params={"format": "ndjson", "fields": "yacht_ids"})
+        assert resp.status_code == 200
+        return [json.loads(line) for line in resp.text.splitlines()]
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(stream, range(8)))
+    expected = [{"user_id": u, "yacht_ids": [u[1:]]} for u in user_ids]
+    assert all(lines == expected for lines in results)
+    # Under load Starlette resumes a stream on whichever pool thread is free
+    threads = [ThreadPoolExecutor(max_workers=1) for _ in range(2)]
+    stream = services.iter_users(fields=["yacht_ids"])
+    hopped = []
+    for i in range(len(user_ids) + 1):
+        try:
+            hopped.append(threads[i % 2].submit(next, stream).result())
+        except StopIteration:
+            break
+    for pool in threads:
+        pool.shutdown()
+    assert hopped == expected
+    # A limit spanning several chunks stops exactly at it
+    assert [u["user_id"] for u in services.iter_users("u03", 7, ["role"])] == user_ids[4:11]
@@ -10,7 +10,14 @@ from pydantic import BaseModel
 from typing import Optional, Dict, Any, List, Union
 import requests
 from fastapi.middleware.cors import CORSMiddleware
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
 from src.logger import get_logger
+from src.saildata_events import SaildataCache, SaildataChangeSubscriber
+from src.tombstones import PurgeWorker, TombstoneStore
+from src.service import BaseYachtService
+import os
+import sqlite3
 import sys
 import traceback
 
@@ -23,8 +30,51 @@ ROPES_API = "http://ropes:8010"
 HULL_API = "http://hull_structure:8004"
 PROFILE_API = "http://profile:8003"
 USER_PROFILE_API = "http://user_profile:8005"
+FURLER_API = "http://furler:8002"
+
+# Saildata is cached for this long; the saildata change feed invalidates it early
+SAILDATA_CACHE_TTL = float(os.environ.get("SAILDATA_CACHE_TTL", "3600"))
+SAILDATA_EVENTS_ENABLED = os.environ.get("SAILDATA_EVENTS_ENABLED", "1") == "1"
+
+# Per-boat fields for the my-boats summary, fetched with the batch endpoints
+PROFILE_SUMMARY_FIELDS = ["name", "model", "yacht_class", "builder", "designer", "year_introduced", "base_id"]
+HULL_SUMMARY_FIELDS = ["hull_type", "loa", "lwl", "beam", "displacement"]
+KEEL_SUMMARY_FIELDS = ["keel_type", "draft"]
+SAILDATA_SUMMARY_FIELDS = ["i", "j", "p", "e", "mh_frac", "total_sail_area"]
+USER_YACHTS_PAGE_SIZE = 1000
+
+# Deleted yachts are tombstoned here and purged from the services in the background
+YACHT_DB_PATH = os.environ.get(
+    "YACHT_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.db")
+)
+YACHT_PURGE_ENABLED = os.environ.get("YACHT_PURGE_ENABLED", "1") == "1"
+# Base yacht records; their standing rigging supplies the forestay for furler specs
+BASE_YACHTS_DB_PATH = os.environ.get(
+    "BASE_YACHTS_DB_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "base_yachts.db")
+)
+FURLER_RIGGING_FIELDS = ("forestay_wire_size", "forestay_wire_length")
+YACHT_PURGE_RETRY_DELAY = float(os.environ.get("YACHT_PURGE_RETRY_DELAY", "2"))
+YACHT_PURGE_MAX_BACKOFF = float(os.environ.get("YACHT_PURGE_MAX_BACKOFF", "300"))
+# Bulk delete endpoint of each service. Profile goes last, see src/tombstones.py
+PURGE_SERVICES = {
+    "hull_structure": f"{HULL_API}/hull/delete_batch",
+    "saildata": f"{SAILDATA_API}/saildata/delete_batch",
+    "sails": f"{SAILS_API}/sails/delete_batch",
+    "ropes": f"{ROPES_API}/ropes/delete_batch",
+    "profile": f"{PROFILE_API}/profile/delete_batch",
+}
 
 app = FastAPI()
+saildata_cache = SaildataCache(SAILDATA_CACHE_TTL)
+saildata_subscriber = SaildataChangeSubscriber(SAILDATA_API, saildata_cache)
+tombstones = TombstoneStore(YACHT_DB_PATH)
+purge_worker = PurgeWorker(
+    tombstones,
+    PURGE_SERVICES,
+    last=("profile",),
+    retry_delay=YACHT_PURGE_RETRY_DELAY,
+    max_backoff=YACHT_PURGE_MAX_BACKOFF,
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -70,12 +120,33 @@ class YachtCreateRequest(BaseModel):
     # Add more as needed
 
 
+@app.on_event("startup")
+def start_saildata_subscriber():
+    if SAILDATA_EVENTS_ENABLED:
+        saildata_subscriber.start()
+
+
+@app.on_event("shutdown")
+def stop_saildata_subscriber():
+    saildata_subscriber.stop()
+
+
+@app.on_event("startup")
+def start_purge_worker():
+    if YACHT_PURGE_ENABLED:
+        purge_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_purge_worker():
+    purge_worker.stop()
+
+
 # --- Microservice Registry ---
 MICROSERVICES = {
     "profile": f"{PROFILE_API}/profile/{{yacht_id}}",
-    "hull": f"{HULL_API}/hull/{{yacht_id}}",
-    "keel": f"{HULL_API}/hull/keel/{{yacht_id}}",
-    "rudder": f"{HULL_API}/hull/rudder/{{yacht_id}}",
+    # hull, keel and rudder in one round trip; unpacked via BUNDLED_PARTS
+    "hull_structure": f"{HULL_API}/hull/bundle/{{yacht_id}}",
     "sails": f"{SAILS_API}/sails/{{yacht_id}}",
     "saildata": f"{SAILDATA_API}/saildata/{{yacht_id}}",
     "ropes": f"{ROPES_API}/ropes/{{yacht_id}}",
@@ -83,29 +154,137 @@ MICROSERVICES = {
     "possible_ropes": f"{ROPES_API}/ropes/possible/{{yacht_id}}",
 }
 
+# Registry entries whose response is a bundle of several top-level keys
+BUNDLED_PARTS = {
+    "hull_structure": ("hull", "keel", "rudder"),
+}
+
+
+SEARCH_RESULTS = 10
+# Profile fields counted by the profile service's facets; year_introduced is
+# counted per decade under "year"
+FACET_FIELDS = ("builder", "designer", "yacht_class", "country_of_origin")
+
+
+def _result_facets(profiles):
+    """Facet counts over `profiles` only, shaped like /profile/facets."""
+    counts = {facet: Counter() for facet in FACET_FIELDS + ("year",)}
+    for profile in profiles:
+        for facet in FACET_FIELDS:
+            if profile.get(facet) not in (None, ""):
+                counts[facet][str(profile[facet])] += 1
+        try:
+            counts["year"][f"{int(profile.get('year_introduced')) // 10 * 10}s"] += 1
+        except (TypeError, ValueError):
+            pass
+    return {
+        facet: [
+            {"value": value, "count": n}
+            for value, n in sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+        ]
+        for facet, counter in counts.items()
+    }
+
 
 @app.get("/yachts/search")
-def search_yachts(query: str = Query("", description="Free-form search query")):
-    # Call the profile microservice to get all profiles
+def search_yachts(
+    query: str = Query("", description="Free-form search query"),
+    facets: bool = Query(False, description="Include facet counts of the results"),
+):
+    """
+    The best matches for `query` by model, builder, designer, class or
+    version, tolerating typos; the newest yachts when the query is empty. With facets
+    the response is {items, facets}, counted over the returned yachts only.
+    """
+    if not query.strip():
+        results = list_yachts(
+            after=None, limit=SEARCH_RESULTS, builder=None, designer=None,
+            yacht_class=None, desc=True, facets=False,
+        )["items"]
+    else:
+        try:
+            # Ask for extra matches in case some are deleted yachts awaiting purge
+            resp = requests.get(
+                f"{PROFILE_API}/profile/search",
+                params={"q": query, "limit": SEARCH_RESULTS * 2},
+                timeout=5,
+            )
+            resp.raise_for_status()
+            profiles = resp.json()
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Profile service unavailable: {e}")
+        results = [p for p in profiles if not tombstones.is_deleted(p["yacht_id"])][:SEARCH_RESULTS]
+    if facets:
+        return {"items": results, "facets": _result_facets(results)}
+    return results
+
+
+@app.get("/yachts/list")
+def list_yachts(
+    after: Optional[int] = Query(None, description="next_after of the previous page"),
+    limit: int = Query(50, ge=1, le=500),
+    builder: Optional[str] = None,
+    designer: Optional[str] = None,
+    yacht_class: Optional[str] = None,
+    desc: bool = Query(False, description="Newest yachts first"),
+    facets: bool = Query(False, description="Include catalogue-wide facet counts"),
+):
+    """
+    Browse every yacht profile a page at a time. Paging and filters are
+    handled by the profile service, so a page costs the same however large
+    the catalogue is. Deleted yachts are skipped. With facets,
+    `catalogue_facets` counts the whole catalogue, not just the filtered yachts.
+    """
+    params = {"limit": limit, "desc": desc, "facets": facets}
+    result = {}
+    params.update(
+        {k: v for k, v in (("builder", builder), ("designer", designer), ("yacht_class", yacht_class)) if v is not None}
+    )
+    items = []
+    while True:
+        if after is not None:
+            params["after"] = after
+        try:
+            resp = requests.get(f"{PROFILE_API}/profile/list", params=params, timeout=5)
+            resp.raise_for_status()
+            page = resp.json()
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Profile service unavailable: {e}")
+        items.extend(p for p in page["items"] if not tombstones.is_deleted(p["yacht_id"]))
+        after = page["next_after"]
+        if params["facets"]:
+            # Facets cover the whole catalogue; the first page carries them
+            result["catalogue_facets"] = page.get("catalogue_facets")
+            params["facets"] = False
+        # Top up pages thinned out by yachts awaiting purge
+        if after is None or len(items) >= limit:
+            break
+        params["limit"] = limit - len(items)
+    return {"items": items, "next_after": after, **result}
+
+
+@app.get("/yachts/facets")
+def get_yacht_facets(limit: int = Query(20, ge=1, le=500)):
+    """Yacht counts per builder, designer, class, country and decade."""
     try:
-        resp = requests.get("http://profile:8003/profile/all", timeout=5)
+        resp = requests.get(f"{PROFILE_API}/profile/facets", params={"limit": limit}, timeout=5)
         resp.raise_for_status()
-        profiles = resp.json()
     except Exception as e:
         raise HTTPException(status_code=502, detail=f"Profile service unavailable: {e}")
-    # Fields to search
-    search_fields = ["yacht_class", "model", "builder", "designer", "version"]
-    query_lower = query.lower()
-    results = []
-    for profile in profiles:
-        for field in search_fields:
-            value = str(profile.get(field, "")).lower()
-            if query_lower in value:
-                results.append(profile)
-                break
-    # Sort by yacht_id descending and limit to 10
-    results = sorted(results, key=lambda x: int(x.get("yacht_id", 0)), reverse=True)[:10]
-    return results
+    return resp.json()
+
+
+@app.get("/yachts/suggest")
+def suggest_yachts(prefix: str = "", limit: int = Query(10, ge=1, le=10)):
+    """Typeahead names for the search box, from the profile service's in-memory index."""
+    try:
+        resp = requests.get(
+            f"{PROFILE_API}/profile/suggest", params={"prefix": prefix, "limit": limit}, timeout=2
+        )
+        resp.raise_for_status()
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Profile service unavailable: {e}")
+    return resp.json()
 
 
 @app.get("/yacht/{yacht_id}")
@@ -115,21 +294,39 @@ def get_yacht(yacht_id: int):
     Orchestrate calls to all microservices to build a full yacht profile.
     Be tolerant of missing data: return partial results if any component exists.
     """
+    if tombstones.is_deleted(yacht_id):
+        raise HTTPException(status_code=404, detail="Yacht has been deleted")
     result = {"yacht_id": yacht_id}
     found_any = False
     errors = {}
     # Query each microservice for this yacht_id
     for key, url_template in MICROSERVICES.items():
         url = url_template.format(yacht_id=yacht_id)
+        if key == "saildata":
+            cached = saildata_cache.get(yacht_id)
+            if cached is not None:
+                result[key] = cached
+                found_any = True
+                continue
+            saildata_version = saildata_cache.version(yacht_id)
         try:
             resp = requests.get(url, timeout=5)
             if resp.status_code == 404:
                 logger.warning(f"[DEBUG] {key}: 404 Not Found")
-                result[key] = None
+                for part in BUNDLED_PARTS.get(key, (key,)):
+                    result[part] = None
                 continue
             resp.raise_for_status()
             data = resp.json()
+            if key == "saildata" and data:
+                saildata_cache.set(yacht_id, data, saildata_version)
             logger.debug(f"[DEBUG] {key}:", data)
+            if key in BUNDLED_PARTS:
+                for part in BUNDLED_PARTS[key]:
+                    result[part] = data.get(part)
+                    if result[part]:
+                        found_any = True
+                continue
             # Tolerant: found_any if any non-empty dict or non-empty list
             if (isinstance(data, dict) and data) or (
                 isinstance(data, list) and len(data) > 0
@@ -139,7 +336,8 @@ def get_yacht(yacht_id: int):
             result[key] = data
         except Exception as e:
             errors[key] = str(e)
-            result[key] = None
+            for part in BUNDLED_PARTS.get(key, (key,)):
+                result[part] = None
             logger.debug(f"[DEBUG] {key}: Exception {e}")
     # For backward compatibility, also add possible_sails/ropes to top-level if present
     if result.get("possible_sails") is not None:
@@ -157,12 +355,95 @@ def get_yacht(yacht_id: int):
     return result
 
 
+def _base_yacht_rigging(yacht_id):
+    """
+    Forestay fields of the base yacht record for yacht_id: its own, or that
+    of the nearest yacht up its profile base_id chain that has one. An
+    unreadable base-yacht database counts as no record, so the furler
+    service reports the forestay as a missing input.
+    """
+    try:
+        service = BaseYachtService(BASE_YACHTS_DB_PATH)
+    except sqlite3.Error as e:
+        logger.warning(f"Base yacht records unavailable at {BASE_YACHTS_DB_PATH}: {e}")
+        return None
+    try:
+        seen = set()
+        current = yacht_id
+        while current is not None and current not in seen:
+            seen.add(current)
+            try:
+                rigging = service.get_base_yacht_by_id(current, fields=FURLER_RIGGING_FIELDS)
+            except sqlite3.Error as e:
+                logger.warning(f"Base yacht record {current} unreadable: {e}")
+                return None
+            if rigging is not None:
+                return rigging
+            resp = requests.get(f"{PROFILE_API}/profile/{current}", timeout=5)
+            if resp.status_code == 404:
+                return None
+            resp.raise_for_status()
+            current = resp.json().get("base_id")
+    finally:
+        service.close()
+    return None
+
+
+@app.get("/yacht/{yacht_id}/furlers")
+def get_yacht_furlers(
+    yacht_id: int,
+    stay_diameter: Optional[float] = None,
+    stay_length: Optional[float] = None,
+    clevis_pin_diameter: Optional[float] = None,
+    rm: Optional[float] = None,
+    rod: Optional[bool] = None,
+    fractional_rig: Optional[bool] = None,
+):
+    """
+    Furler spec for a yacht. Kept out of GET /yacht/{yacht_id} so a yacht
+    view doesn't wait on it. The forestay size and length come from the base
+    yacht's standing rigging unless given; the furler service reads the rest
+    from the hull and saildata.
+    """
+    if tombstones.is_deleted(yacht_id):
+        raise HTTPException(status_code=404, detail="Yacht has been deleted")
+    params = {
+        "stay_diameter": stay_diameter,
+        "stay_length": stay_length,
+        "clevis_pin_diameter": clevis_pin_diameter,
+        "rm": rm,
+        "rod": rod,
+        "fractional_rig": fractional_rig,
+    }
+    try:
+        if stay_diameter is None or stay_length is None:
+            rigging = _base_yacht_rigging(yacht_id) or {}
+            if params["stay_diameter"] is None:
+                params["stay_diameter"] = rigging.get("forestay_wire_size")
+            if params["stay_length"] is None:
+                params["stay_length"] = rigging.get("forestay_wire_length")
+        resp = requests.get(
+            f"{FURLER_API}/spec_furlers/yacht/{yacht_id}",
+            params={key: value for key, value in params.items() if value is not None},
+            timeout=5,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"Furler inputs unavailable: {e}")
+    if resp.status_code in (404, 422):
+        raise HTTPException(status_code=resp.status_code, detail=resp.json().get("detail"))
+    if resp.status_code != 200:
+        raise HTTPException(status_code=502, detail=f"Furler service returned {resp.status_code}")
+    return resp.json()
+
+
 @app.post("/yacht/")
 def create_yacht(req: YachtCreateRequest):
     """
     Orchestrate creation of a yacht by sending data to all relevant microservices.
     """
     yacht_id = req.yacht_id
+    if yacht_id is not None and tombstones.is_deleted(yacht_id) and not tombstones.revive(yacht_id):
+        raise HTTPException(status_code=409, detail=f"Yacht {yacht_id} is still being purged")
     responses = {}
     errors = {}
     # Profile
@@ -199,9 +480,16 @@ def create_yacht(req: YachtCreateRequest):
             errors["rudder"] = str(e)
     # Saildata
     if req.saildata:
+        saildata = dict(req.saildata)
+        # Displacement lives on the hull; saildata needs it for the derived SA/D ratio
+        displacement = (req.hull or {}).get("displacement")
+        if displacement is not None:
+            extras = dict(saildata.get("extras") or {})
+            extras.setdefault("displacement", displacement)
+            saildata["extras"] = extras
         try:
             resp = requests.post(
-                f"{SAILDATA_API}/saildata/", json=req.saildata, timeout=5
+                f"{SAILDATA_API}/saildata/", json=saildata, timeout=5
             )
             resp.raise_for_status()
             responses["saildata"] = resp.json()
@@ -229,60 +517,39 @@ def create_yacht(req: YachtCreateRequest):
                 responses.setdefault("ropes", []).append(resp.json())
             except Exception as e:
                 errors.setdefault("ropes", []).append(str(e))
-    # Possible Sails
+    # Possible sails and ropes: one bulk request each
     if req.possible_sails:
         logger.info(f"[Orchestrator] possible_sails: {req.possible_sails}")
+        sails = [
+            {"sail_type": sail_type, "config": None}
+            if isinstance(sail_type, str)
+            else {"sail_type": sail_type.get("sail_type"), "config": sail_type.get("config")}
+            for sail_type in req.possible_sails
+        ]
         try:
-            for sail_type in req.possible_sails:
-                sail_payload = {
-                    "yacht_id": yacht_id,
-                    "sail_type": (
-                        sail_type
-                        if isinstance(sail_type, str)
-                        else sail_type.get("sail_type")
-                    ),
-                    "config": (
-                        sail_type.get("config") if isinstance(sail_type, dict) else None
-                    ),
-                }
-                logger.info(
-                    f"[Orchestrator] POST /sails/possible/{yacht_id} payload: {sail_payload}"
-                )
-                resp = requests.post(
-                    f"{SAILS_API}/sails/possible/{yacht_id}",
-                    json=sail_payload,
-                    timeout=5,
-                )
-                resp.raise_for_status()
-            responses["possible_sails"] = "ok"
+            resp = requests.post(
+                f"{SAILS_API}/sails/possible/{yacht_id}/bulk",
+                json={"sails": sails},
+                timeout=5,
+            )
+            resp.raise_for_status()
+            responses["possible_sails"] = resp.json()
         except Exception as e:
             errors["possible_sails"] = str(e)
-    # Possible Ropes
     if req.possible_ropes:
         logger.info(f"[Orchestrator] possible_ropes: {req.possible_ropes}")
+        ropes = [
+            {"rope_type": rope_type if isinstance(rope_type, str) else rope_type.get("rope_type")}
+            for rope_type in req.possible_ropes
+        ]
         try:
-            for rope_type in req.possible_ropes:
-                rope_payload = {
-                    "yacht_id": yacht_id,
-                    "rope_type": (
-                        rope_type
-                        if isinstance(rope_type, str)
-                        else rope_type.get("rope_type")
-                    ),
-                    "config": (
-                        rope_type.get("config") if isinstance(rope_type, dict) else None
-                    ),
-                }
-                logger.info(
-                    f"[Orchestrator] POST /ropes/possible/{yacht_id} payload: {rope_payload}"
-                )
-                resp = requests.post(
-                    f"{ROPES_API}/ropes/possible/{yacht_id}",
-                    json=rope_payload,
-                    timeout=5,
-                )
-                resp.raise_for_status()
-            responses["possible_ropes"] = "ok"
+            resp = requests.post(
+                f"{ROPES_API}/ropes/possible/{yacht_id}/bulk",
+                json={"ropes": ropes},
+                timeout=5,
+            )
+            resp.raise_for_status()
+            responses["possible_ropes"] = resp.json()
         except Exception as e:
             errors["possible_ropes"] = str(e)
     # Add more as needed for rig, etc.
@@ -294,100 +561,52 @@ def create_yacht(req: YachtCreateRequest):
 
 @app.delete("/yacht/{yacht_id}")
 def delete_yacht(yacht_id: int):
-    errors = {}
-    responses = {}
-    # Profile
-    try:
-        resp = requests.delete(f"{PROFILE_API}/profile/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["profile"] = resp.text
-        else:
-            responses["profile"] = resp.status_code
-    except Exception as e:
-        errors["profile"] = str(e)
-    # Hull
-    try:
-        resp = requests.delete(f"{HULL_API}/hull/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["hull"] = resp.text
-        else:
-            responses["hull"] = resp.status_code
-    except Exception as e:
-        errors["hull"] = str(e)
-    # Keel
-    try:
-        resp = requests.delete(f"{HULL_API}/hull/keel/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["keel"] = resp.text
-        else:
-            responses["keel"] = resp.status_code
-    except Exception as e:
-        errors["keel"] = str(e)
-    # Rudder
-    try:
-        resp = requests.delete(f"{HULL_API}/hull/rudder/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["rudder"] = resp.text
-        else:
-            responses["rudder"] = resp.status_code
-    except Exception as e:
-        errors["rudder"] = str(e)
-    # Saildata
-    try:
-        resp = requests.delete(f"{SAILDATA_API}/saildata/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["saildata"] = resp.text
-        else:
-            responses["saildata"] = resp.status_code
-    except Exception as e:
-        errors["saildata"] = str(e)
-    # Sails
-    try:
-        resp = requests.delete(f"{SAILS_API}/sails/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["sails"] = resp.text
-        else:
-            responses["sails"] = resp.status_code
-    except Exception as e:
-        errors["sails"] = str(e)
-    # Ropes
-    try:
-        resp = requests.delete(f"{ROPES_API}/ropes/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["ropes"] = resp.text
-        else:
-            responses["ropes"] = resp.status_code
-    except Exception as e:
-        errors["ropes"] = str(e)
-    # Possible Sails
-    try:
-        resp = requests.delete(f"{SAILS_API}/sails/possible/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["possible_sails"] = resp.text
-        else:
-            responses["possible_sails"] = resp.status_code
-    except Exception as e:
-        errors["possible_sails"] = str(e)
-    # Possible Ropes
-    try:
-        resp = requests.delete(f"{ROPES_API}/ropes/possible/{yacht_id}", timeout=5)
-        if resp.status_code not in (200, 204, 404):
-            errors["possible_ropes"] = resp.text
-        else:
-            responses["possible_ropes"] = resp.status_code
-    except Exception as e:
-        errors["possible_ropes"] = str(e)
-    result = {"responses": responses}
-    if errors:
-        result["errors"] = errors
-    if errors:
-        return JSONResponse(status_code=207, content=result)
-    return {"status": "ok", **result}
+    """
+    Tombstone the yacht, so it reads as 404 at once, and leave purging its
+    data from every service to the background worker. Safe to repeat.
+    """
+    tombstones.mark([yacht_id], PURGE_SERVICES)
+    purge_worker.notify()
+    return JSONResponse(
+        status_code=202,
+        content={"status": "deleted", "purge": tombstones.status(yacht_id)},
+    )
+
+
+class YachtDeleteBatchRequest(BaseModel):
+    yacht_ids: List[int]
+
+
+@app.post("/yachts/delete_batch")
+def delete_yachts_batch(req: YachtDeleteBatchRequest):
+    """
+    Tombstone many yachts at once. The background worker purges them with one
+    delete_batch request per service rather than one per yacht.
+    """
+    newly_deleted = tombstones.mark(req.yacht_ids, PURGE_SERVICES)
+    purge_worker.notify()
+    return JSONResponse(
+        status_code=202,
+        content={
+            "status": "deleted",
+            "yacht_ids": list(dict.fromkeys(req.yacht_ids)),
+            "newly_deleted": newly_deleted,
+        },
+    )
+
+
+@app.get("/yacht/{yacht_id}/purge")
+def get_yacht_purge(yacht_id: int):
+    """Progress of a deleted yacht's purge: the services still pending and the last error."""
+    status = tombstones.status(yacht_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Yacht has not been deleted")
+    return status
 
 
 def add_yacht_to_user(user_id: str, yacht_id: int):
     """
-    Add a yacht to the user's yacht_ids list using the dedicated endpoint.
+    Record the user's ownership of a yacht via the dedicated endpoint.
     """
     resp = requests.post(
         f"{USER_PROFILE_API}/users/{user_id}/add_yacht",
@@ -399,75 +618,174 @@ def add_yacht_to_user(user_id: str, yacht_id: int):
     return resp.json()
 
 
-def clone_yacht(yacht_id: int, user_id: int, name: str = None, spec: str = None, notes: str = None):
+def get_user_yacht_ids(user_id: str):
+    """All yacht_ids owned by the user, following user_profile's pagination."""
+    yacht_ids, after = [], 0
+    while True:
+        resp = requests.get(
+            f"{USER_PROFILE_API}/users/{user_id}/yachts",
+            params={"after": after, "limit": USER_YACHTS_PAGE_SIZE},
+            timeout=5,
+        )
+        if resp.status_code == 404:
+            raise HTTPException(status_code=404, detail="User not found")
+        resp.raise_for_status()
+        page = resp.json()
+        yacht_ids.extend(page["yacht_ids"])
+        after = page["next_after"]
+        if after is None:
+            return yacht_ids
+
+
+def _post_batch(url: str, payload: dict):
+    resp = requests.post(url, json=payload, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+@app.get("/users/{user_id}/boats/summary")
+def get_user_boats_summary(user_id: str):
     """
-    Clone a yacht by copying its profile, hull, keel, rudder, saildata, sails, and ropes.
-    Assign the new yacht to the user by updating their yacht_ids list.
-    Optionally override name, spec, notes.
+    Summary of every boat a user owns: profile, a few hull and rig fields.
+    Uses one batch call per service, made concurrently, whatever the fleet
+    size. A failing service leaves its fields empty and is listed in "errors".
     """
-    print(f"[clone_yacht] called with yacht_id={yacht_id}, user_id={user_id}, name={name}, spec={spec}, notes={notes}", flush=True)
-    logger.info(f"[clone_yacht] called with yacht_id={yacht_id}, user_id={user_id}, name={name}, spec={spec}, notes={notes}")
     try:
-        yacht = get_yacht(yacht_id)
-        print(f"[clone_yacht] get_yacht returned: {yacht}", flush=True)
-        yacht_data = yacht.dict() if hasattr(yacht, 'dict') else dict(yacht)
-        base_id = yacht_data.pop("yacht_id", None)
-        yacht_data["base_id"] = base_id
-        # Override profile fields if provided
-        if "profile" in yacht_data and isinstance(yacht_data["profile"], dict):
-            if name:
-                yacht_data["profile"]["model"] = name
-            if spec:
-                yacht_data["profile"]["spec"] = spec
-            if notes:
-                yacht_data["profile"]["notes"] = notes
-        # Remove possible_sails and possible_ropes from yacht_data before creation
-        possible_sails = yacht_data.pop("possible_sails", None)
-        possible_ropes = yacht_data.pop("possible_ropes", None)
-        print(f"[clone_yacht] yacht_data for create_yacht: {yacht_data}", flush=True)
-        create_result = create_yacht(YachtCreateRequest(**yacht_data))
-        print(f"[clone_yacht] create_yacht result: {create_result}", flush=True)
-        # Try to extract new yacht_id from the profile response
-        new_yacht_id = None
-        if isinstance(create_result, dict):
-            profile_resp = create_result.get("responses", {}).get("profile")
-            if profile_resp and isinstance(profile_resp, dict):
-                new_yacht_id = profile_resp.get("yacht_id") or profile_resp.get("id")
-        if not new_yacht_id:
-            print("[clone_yacht] Could not determine new yacht_id", flush=True)
-            logger.error("[clone_yacht] Could not determine new yacht_id")
-            raise HTTPException(status_code=500, detail="Could not determine new yacht_id")
-        # --- Now POST possible_sails and possible_ropes with new_yacht_id ---
-        if possible_sails:
-            for sail_type in possible_sails:
-                sail_payload = {
-                    "yacht_id": new_yacht_id,
-                    "sail_type": sail_type if isinstance(sail_type, str) else sail_type.get("sail_type") or sail_type.get("type"),
-                    "config": sail_type.get("config") if isinstance(sail_type, dict) else None,
-                }
-                logger.info(f"[Orchestrator] POST /sails/possible/{new_yacht_id} payload: {sail_payload}")
-                requests.post(f"{SAILS_API}/sails/possible/{new_yacht_id}", json=sail_payload, timeout=5)
-        if possible_ropes:
-            for rope_type in possible_ropes:
-                rope_payload = {
-                    "yacht_id": new_yacht_id,
-                    "rope_type": rope_type if isinstance(rope_type, str) else rope_type.get("rope_type"),
-                    "config": rope_type.get("config") if isinstance(rope_type, dict) else None,
-                }
-                logger.info(f"[Orchestrator] POST /ropes/possible/{new_yacht_id} payload: {rope_payload}")
-                requests.post(f"{ROPES_API}/ropes/possible/{new_yacht_id}", json=rope_payload, timeout=5)
-        add_yacht_to_user(user_id, new_yacht_id)
-        print(f"[clone_yacht] Successfully cloned yacht. new_yacht_id={new_yacht_id}", flush=True)
-        logger.info(f"[clone_yacht] Successfully cloned yacht. new_yacht_id={new_yacht_id}")
-        return {"new_yacht_id": new_yacht_id}
-    except HTTPException as e:
-        print(f"[clone_yacht] HTTPException: {e}", flush=True)
-        logger.error(f"[clone_yacht] HTTPException: {e}")
-        raise HTTPException(status_code=e.status_code, detail=f"Yacht not found: {e.detail}")
-    except Exception as e:
-        print(f"[clone_yacht] Exception: {e}", flush=True)
-        logger.error(f"[clone_yacht] Exception: {e}")
+        owned = get_user_yacht_ids(user_id)
+    except HTTPException:
         raise
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=f"User profile service unavailable: {e}")
+    yacht_ids = tombstones.filter_live(
+        int(yacht_id) for yacht_id in owned if str(yacht_id).isdigit()
+    )
+    if not yacht_ids:
+        return {"user_id": user_id, "boats": []}
+
+    calls = {
+        "profile": (
+            f"{PROFILE_API}/profile/batch",
+            {"yacht_ids": yacht_ids, "fields": PROFILE_SUMMARY_FIELDS},
+        ),
+        "hull_structure": (f"{HULL_API}/hull/bundle", {"yacht_ids": yacht_ids}),
+        "saildata": (
+            f"{SAILDATA_API}/saildata/batch",
+            {"yacht_ids": yacht_ids, "fields": SAILDATA_SUMMARY_FIELDS},
+        ),
+    }
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=len(calls)) as pool:
+        futures = {key: pool.submit(_post_batch, url, payload) for key, (url, payload) in calls.items()}
+        for key, future in futures.items():
+            try:
+                results[key] = future.result()
+            except Exception as e:
+                logger.warning(f"[DEBUG] boats summary {key}: {e}")
+                errors[key] = str(e)
+                results[key] = {}
+
+    boats = []
+    for yacht_id in yacht_ids:
+        # Batch responses are JSON objects, so their yacht_id keys are strings
+        key = str(yacht_id)
+        profile = results["profile"].get(key) or {}
+        bundle = results["hull_structure"].get(key) or {}
+        hull = bundle.get("hull") or {}
+        keel = bundle.get("keel") or {}
+        saildata = results["saildata"].get(key) or {}
+        boats.append(
+            {
+                "yacht_id": yacht_id,
+                **{field: profile.get(field) for field in PROFILE_SUMMARY_FIELDS},
+                "hull": {
+                    **{field: hull.get(field) for field in HULL_SUMMARY_FIELDS},
+                    **{field: keel.get(field) for field in KEEL_SUMMARY_FIELDS},
+                },
+                "rig": {field: saildata.get(field) for field in SAILDATA_SUMMARY_FIELDS},
+            }
+        )
+    result = {"user_id": user_id, "boats": boats}
+    if errors:
+        result["errors"] = errors
+    return result
+
+
+# Services holding per-yacht parts, with the endpoint prefix of each
+CLONE_SERVICES = {
+    "hull": f"{HULL_API}/hull",
+    "saildata": f"{SAILDATA_API}/saildata",
+    "sails": f"{SAILS_API}/sails",
+    "ropes": f"{ROPES_API}/ropes",
+}
+
+
+def _post_clone_step(url: str, payload: dict):
+    resp = requests.post(url, json=payload, timeout=10)
+    resp.raise_for_status()
+    return resp.json()
+
+
+def clone_yacht(yacht_id: int, user_id: int, name: str = None, spec: str = None, notes: str = None, copy: bool = False):
+    """
+    Clone a yacht and assign the new yacht to the user. Profile allocates the
+    new yacht_id; the other services are then called concurrently, one request
+    each.
+
+    By default the clone is copy-on-write: profile stores only the overridden
+    name/spec/notes and the other services link the clone to its base, copying
+    a part the first time it is edited. With `copy` every service duplicates
+    the rows up front with its /copy_from endpoint.
+    """
+    logger.info(f"[clone_yacht] called with yacht_id={yacht_id}, user_id={user_id}, name={name}, spec={spec}, notes={notes}, copy={copy}")
+    if tombstones.is_deleted(yacht_id):
+        raise HTTPException(status_code=404, detail=f"Yacht not found: {yacht_id}")
+    overrides = {"model": name, "spec": spec, "notes": notes}
+    if copy:
+        resp = requests.post(
+            f"{PROFILE_API}/profile/copy_from",
+            json={"source_yacht_id": yacht_id, **overrides},
+            timeout=5,
+        )
+    else:
+        resp = requests.post(
+            f"{PROFILE_API}/profile/clone", json={"base_id": yacht_id, **overrides}, timeout=5
+        )
+    if resp.status_code == 404:
+        raise HTTPException(status_code=404, detail=f"Yacht not found: {yacht_id}")
+    resp.raise_for_status()
+    new_yacht_id = resp.json().get("yacht_id")
+    if not new_yacht_id:
+        logger.error("[clone_yacht] Could not determine new yacht_id")
+        raise HTTPException(status_code=500, detail="Could not determine new yacht_id")
+    # Profile reissues the ids of fully purged yachts
+    tombstones.revive(new_yacht_id)
+
+    if copy:
+        step = "copy_from"
+        payload = {"source_yacht_id": yacht_id, "target_yacht_id": new_yacht_id}
+    else:
+        step = "inherit"
+        payload = {"yacht_id": new_yacht_id, "base_id": yacht_id}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=len(CLONE_SERVICES)) as pool:
+        futures = {
+            key: pool.submit(_post_clone_step, f"{prefix}/{step}", payload)
+            for key, prefix in CLONE_SERVICES.items()
+        }
+        for key, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                errors[key] = str(e)
+    if errors:
+        logger.error(f"[clone_yacht] {step} {yacht_id} -> {new_yacht_id} failed for: {errors}")
+
+    add_yacht_to_user(user_id, new_yacht_id)
+    logger.info(f"[clone_yacht] Successfully cloned yacht. new_yacht_id={new_yacht_id}")
+    result = {"new_yacht_id": new_yacht_id}
+    if errors:
+        result["errors"] = errors
+    return result
 
 
 @app.post("/yacht/clone")
@@ -479,12 +797,13 @@ def clone_yacht_endpoint(data: dict = Body(...)):
     name = data.get("name")
     spec = data.get("spec")
     notes = data.get("notes")
+    copy = bool(data.get("copy", False))
     if not original_yacht_id or not user_id:
         print("[clone_yacht_endpoint] Missing originalBoatId or userId", flush=True)
         logger.error("[clone_yacht_endpoint] Missing originalBoatId or userId")
         raise HTTPException(status_code=400, detail="Missing originalBoatId or userId")
     try:
-        result = clone_yacht(original_yacht_id, user_id, name=name, spec=spec, notes=notes)
+        result = clone_yacht(original_yacht_id, user_id, name=name, spec=spec, notes=notes, copy=copy)
         print(f"[clone_yacht_endpoint] clone_yacht result: {result}", flush=True)
         logger.info(f"[clone_yacht_endpoint] clone_yacht result: {result}")
         return result
@@ -1,5 +1,217 @@
 import sqlite3
 
+# A base yacht is stored across domain tables sharing the base_yachts id, so
+# readers only touch the parts they ask for: standing rigging alone is over
+# a hundred columns that a yacht picker never needs.
+BASE_YACHT_TABLES = {
+    "profile": "base_yachts",
+    "hull": "base_yacht_hulls",
+    "rig": "base_yacht_rigs",
+    "saildata": "base_yacht_saildata",
+    "standing_rigging": "base_yacht_standing_rigging",
+}
+
+BASE_YACHT_PARTS = {
+    "profile": (
+        ("yacht_class", "TEXT"),
+        ("model", "TEXT"),
+        ("version", "TEXT"),
+        ("builder", "TEXT"),
+        ("designer", "TEXT"),
+        ("year_introduced", "INTEGER"),
+        ("production_start", "INTEGER"),
+        ("production_end", "INTEGER"),
+        ("country_of_origin", "TEXT"),
+        ("notes", "TEXT"),
+    ),
+    "hull": (
+        ("hull_type", "TEXT"),
+        ("loa", "INTEGER"),
+        ("lwl", "INTEGER"),
+        ("beam", "INTEGER"),
+        ("draft", "INTEGER"),
+        ("displacement", "INTEGER"),
+        ("ballast", "INTEGER"),
+        ("construction", "TEXT"),
+        ("keel_type", "TEXT"),
+        ("keel_draft", "REAL"),
+        ("rudder_type", "TEXT"),
+    ),
+    "rig": (
+        ("rig_type", "TEXT"),
+        ("boom_above_deck", "REAL"),
+        ("mh_frac", "TEXT"),
+        ("mast_height", "REAL"),
+        ("mizzen_mast_height", "REAL"),
+        ("bury", "REAL"),
+        ("bury_mizzen", "REAL"),
+        ("DK_or_KL", "REAL"),
+        ("DK_or_KL_mizzen", "REAL"),
+        ("No_of_spreaders", "INTEGER"),
+        ("spreader_angle", "REAL"),
+        ("No_of_spreaders_mizzen", "INTEGER"),
+        ("spreader_angle_mizzen", "REAL"),
+        ("mast_section", "TEXT"),
+        ("mast_section_mizzen", "TEXT"),
+        ("boom_section", "TEXT"),
+        ("boom_section_mizzen", "TEXT"),
+        ("spin_pole_diameter", "REAL"),
+        ("telescope_pole_diameter", "REAL"),
+        ("rodkicker", "TEXT"),
+        ("headsail_furler", "TEXT"),
+        ("max_hoist", "REAL"),
+        ("jocky_pole", "TEXT"),
+    ),
+    "saildata": (
+        ("i", "REAL"),
+        ("j", "REAL"),
+        ("p", "REAL"),
+        ("e", "REAL"),
+        ("mizzen_i", "REAL"),
+        ("mizzen_j", "REAL"),
+        ("mizzen_p", "REAL"),
+        ("mizzen_e", "REAL"),
+        ("genoa_i", "REAL"),
+        ("genoa_j", "REAL"),
+        ("main_p", "REAL"),
+        ("main_e", "REAL"),
+        ("codezero_i", "REAL"),
+        ("codezero_j", "REAL"),
+        ("jib_i", "REAL"),
+        ("jib_j", "REAL"),
+        ("spin_i", "REAL"),
+        ("spin_j", "REAL"),
+        ("staysail_i", "REAL"),
+        ("staysail_j", "REAL"),
+        ("trisail_i", "REAL"),
+        ("trisail_j", "REAL"),
+        ("mainsail", "TEXT"),
+        ("jib", "TEXT"),
+        ("genoa", "TEXT"),
+        ("symmetric_spinnaker", "TEXT"),
+        ("asymmetric_spinnaker", "TEXT"),
+        ("codezero", "TEXT"),
+        ("staysail", "TEXT"),
+        ("trisail", "TEXT"),
+        ("stormjib", "TEXT"),
+    ),
+    "standing_rigging": (
+        ("forestay_wire_size", "INTEGER"),
+        ("forestay_wire_upper", "INTEGER"),
+        ("forestay_wire_lower", "INTEGER"),
+        ("forestay_wire_length", "INTEGER"),
+        ("mizzen_forestay_wire_size", "INTEGER"),
+        ("mizzen_forestay_wire_upper", "TEXT"),
+        ("mizzen_forestay_wire_lower", "TEXT"),
+        ("mizzen_forestay_wire_length", "INTEGER"),
+        ("backstay_type", "TEXT"),
+        ("backstay_wire_size", "INTEGER"),
+        ("backstay_wire_upper", "TEXT"),
+        ("backstay_wire_lower", "TEXT"),
+        ("backstay_wire_length", "INTEGER"),
+        ("mizzen_backstay_type", "INTEGER"),
+        ("mizzen_backstay_wire_size", "INTEGER"),
+        ("mizzen_backstay_wire_upper", "TEXT"),
+        ("mizzen_backstay_wire_lower", "TEXT"),
+        ("mizzen_backstay_wire_length", "INTEGER"),
+        ("capshrouds_wire_size", "INTEGER"),
+        ("capshrouds_wire_upper", "TEXT"),
+        ("capshrouds_wire_lower", "TEXT"),
+        ("capshrouds_wire_length", "INTEGER"),
+        ("mizzen_capshrouds_wire_size", "INTEGER"),
+        ("mizzen_capshrouds_wire_upper", "TEXT"),
+        ("mizzen_capshrouds_wire_lower", "TEXT"),
+        ("mizzen_capshrouds_wire_length", "INTEGER"),
+        ("intermediate_shrouds_wire_size", "INTEGER"),
+        ("intermediate_shrouds_wire_upper", "TEXT"),
+        ("intermediate_shrouds_wire_lower", "TEXT"),
+        ("intermediate_shrouds_wire_length", "INTEGER"),
+        ("mizzen_intermediate_shrouds_wire_size", "INTEGER"),
+        ("mizzen_intermediate_shrouds_wire_upper", "TEXT"),
+        ("mizzen_intermediate_shrouds_wire_lower", "TEXT"),
+        ("mizzen_intermediate_shrouds_length", "INTEGER"),
+        ("forward_lower_shrouds_wire_size", "INTEGER"),
+        ("forward_lower_shrouds_wire_upper", "TEXT"),
+        ("forward_lower_shrouds_wire_lower", "TEXT"),
+        ("forward_lower_shrouds_wire_length", "INTEGER"),
+        ("mizzen_forward_lower_shrouds_wire_size", "INTEGER"),
+        ("mizzen_forward_lower_shrouds_wire_upper", "TEXT"),
+        ("mizzen_forward_lower_shrouds_wire_lower", "TEXT"),
+        ("mizzen_forward_lower_shrouds_wire_length", "INTEGER"),
+        ("aft_lower_shrouds_wire_size", "INTEGER"),
+        ("aft_lower_shrouds_wire_upper", "TEXT"),
+        ("aft_lower_shrouds_wire_lower", "TEXT"),
+        ("aft_lower_shrouds_wire_length", "INTEGER"),
+        ("mizzen_aft_lower_shrouds_wire_size", "INTEGER"),
+        ("mizzen_aft_lower_shrouds_wire_upper", "TEXT"),
+        ("mizzen_aft_lower_shrouds_wire_lower", "TEXT"),
+        ("mizzen_aft_lower_shrouds_wire_length", "INTEGER"),
+        ("inner_forestay_wire_size", "INTEGER"),
+        ("inner_forestay_wire_upper", "TEXT"),
+        ("inner_forestay_wire_lower", "TEXT"),
+        ("inner_forestay_wire_length", "INTEGER"),
+        ("runner_wire_size", "INTEGER"),
+        ("runner_wire_upper", "TEXT"),
+        ("runner_wire_lower", "TEXT"),
+        ("runner_wire_length", "INTEGER"),
+        ("mizzen_runner_wire_size", "INTEGER"),
+        ("mizzen_runner_wire_upper", "TEXT"),
+        ("mizzen_runner_wire_lower", "TEXT"),
+        ("mizzen_runner_wire_length", "INTEGER"),
+        ("babystay_wire_size", "INTEGER"),
+        ("babystay_wire_upper", "TEXT"),
+        ("babystay_wire_lower", "TEXT"),
+        ("babystay_wire_length", "INTEGER"),
+        ("triatic_stay_wire_size", "INTEGER"),
+        ("triatic_stay_wire_upper", "TEXT"),
+        ("triatic_stay_wire_lower", "TEXT"),
+        ("triatic_stay_wire_length", "INTEGER"),
+        ("jumper_wire_size", "INTEGER"),
+        ("jumper_wire_upper", "TEXT"),
+        ("jumper_wire_lower", "TEXT"),
+        ("jumper_wire_length", "INTEGER"),
+        ("mizzen_jumper_wire_size", "INTEGER"),
+        ("mizzen_jumper_wire_upper", "TEXT"),
+        ("mizzen_jumper_wire_lower", "TEXT"),
+        ("mizzen_jumper_wire_length", "INTEGER"),
+        ("v1_wire_size", "INTEGER"),
+        ("v1_wire_upper", "TEXT"),
+        ("v1_wire_lower", "TEXT"),
+        ("v1_wire_length", "INTEGER"),
+        ("v2_wire_size", "INTEGER"),
+        ("v2_wire_upper", "TEXT"),
+        ("v2_wire_lower", "TEXT"),
+        ("v2_wire_length", "INTEGER"),
+        ("v2_d3_wire_size", "INTEGER"),
+        ("v2_d3_wire_upper", "TEXT"),
+        ("v2_d3_wire_lower", "TEXT"),
+        ("v2_d3_wire_length", "INTEGER"),
+        ("d1a_wire_size", "INTEGER"),
+        ("d1a_wire_upper", "TEXT"),
+        ("d1a_wire_lower", "TEXT"),
+        ("d1a_wire_length", "INTEGER"),
+        ("d1f_wire_size", "INTEGER"),
+        ("d1f_wire_upper", "TEXT"),
+        ("d1f_wire_lower", "TEXT"),
+        ("d1f_wire_length", "INTEGER"),
+        ("d2_wire_size", "INTEGER"),
+        ("d2_wire_upper", "TEXT"),
+        ("d2_wire_lower", "TEXT"),
+        ("d2_wire_length", "INTEGER"),
+        ("d3_wire_size", "INTEGER"),
+        ("d3_wire_upper", "TEXT"),
+        ("d3_wire_lower", "TEXT"),
+        ("d3_wire_length", "INTEGER"),
+    ),
+}
+
+# Column name -> part, built once rather than read with PRAGMA table_info
+COLUMN_PARTS = {col: part for part, cols in BASE_YACHT_PARTS.items() for col, _ in cols}
+BASE_YACHT_COLUMNS = ("id",) + tuple(COLUMN_PARTS)
+
+# Enough to choose a base yacht from a list
+PICKER_FIELDS = ("id", "yacht_class", "model", "version", "builder", "designer", "year_introduced")
+
 
 class BaseYachtDatabase:
     def __init__(self, db_path="data/base_yachts.db"):
@@ -7,202 +219,95 @@ class BaseYachtDatabase:
         self.create_table()
 
     def create_table(self):
+        for part, table in BASE_YACHT_TABLES.items():
+            key = (
+                "id INTEGER PRIMARY KEY AUTOINCREMENT"
+                if part == "profile"
+                else "id INTEGER PRIMARY KEY REFERENCES base_yachts(id)"
+            )
+            columns = ",\n".join(f"{col} {col_type}" for col, col_type in BASE_YACHT_PARTS[part])
+            self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} (\n{key},\n{columns}\n)")
+        self.conn.commit()
+        return True
+
+    @staticmethod
+    def _part_columns(part):
+        return [col for col, _ in BASE_YACHT_PARTS[part]]
+
+    def insert(self, data):
+        """Store a base yacht given as {column: value} and return its id."""
+        columns = self._part_columns("profile")
+        cursor = self.conn.execute(
+            f"INSERT INTO base_yachts ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            [data.get(col) for col in columns],
+        )
+        self._write_parts(cursor.lastrowid, data)
+        self.conn.commit()
+        return cursor.lastrowid
+
+    def update(self, yacht_id, data):
+        """Replace every column of a base yacht; columns missing from data become NULL."""
+        columns = self._part_columns("profile")
         self.conn.execute(
-            """
-        CREATE TABLE IF NOT EXISTS base_yachts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            yacht_class TEXT,
-            model TEXT,
-            version TEXT,
-            builder TEXT,
-            designer TEXT,
-            year_introduced INTEGER,
-            production_start INTEGER,
-            production_end INTEGER,
-            country_of_origin TEXT,
-            notes TEXT,
-            hull_type TEXT,
-            loa INTEGER,
-            lwl INTEGER,
-            beam INTEGER,
-            draft INTEGER,
-            displacement INTEGER,
-            ballast INTEGER,
-            construction TEXT,
-            keel_type TEXT,
-            keel_draft REAL,
-            rudder_type TEXT,
-            rig_type TEXT,
-            boom_above_deck REAL,
-            mh_frac TEXT,
-            i REAL,
-            j REAL,
-            p REAL,
-            e REAL,
-            mizzen_i REAL,
-            mizzen_j REAL,
-            mizzen_p REAL,
-            mizzen_e REAL,
-            genoa_i REAL,
-            genoa_j REAL,
-            main_p REAL,
-            main_e REAL,
-            codezero_i REAL,
-            codezero_j REAL,
-            jib_i REAL,
-            jib_j REAL,
-            spin_i REAL,
-            spin_j REAL,
-            staysail_i REAL,
-            staysail_j REAL,
-            trisail_i REAL,
-            trisail_j REAL,
-            mainsail TEXT,
-            jib TEXT,
-            genoa TEXT,
-            symmetric_spinnaker TEXT,
-            asymmetric_spinnaker TEXT,
-            codezero TEXT,
-            staysail TEXT,
-            trisail TEXT,
-            stormjib TEXT,
-            mast_height REAL,
-            mizzen_mast_height REAL,
-            bury REAL,
-            bury_mizzen REAL,
-            DK_or_KL REAL,
-            DK_or_KL_mizzen REAL,
-            No_of_spreaders INTEGER,
-            spreader_angle REAL,
-            No_of_spreaders_mizzen INTEGER,
-            spreader_angle_mizzen REAL,
-            mast_section TEXT,
-            mast_section_mizzen TEXT,
-            boom_section TEXT,
-            boom_section_mizzen TEXT,
-            spin_pole_diameter REAL,
-            telescope_pole_diameter REAL,
-            rodkicker TEXT,
-            headsail_furler TEXT,
-            max_hoist REAL,
-            jocky_pole TEXT,
-            forestay_wire_size INTEGER,
-            forestay_wire_upper INTEGER,
-            forestay_wire_lower INTEGER,
-            forestay_wire_length INTEGER,
-            mizzen_forestay_wire_size INTEGER,
-            mizzen_forestay_wire_upper TEXT,
-            mizzen_forestay_wire_lower TEXT,
-            mizzen_forestay_wire_length INTEGER,
-            backstay_type TEXT,
-            backstay_wire_size INTEGER,
-            backstay_wire_upper TEXT,
-            backstay_wire_lower TEXT,
-            backstay_wire_length INTEGER,
-            mizzen_backstay_type INTEGER,
-            mizzen_backstay_wire_size INTEGER,
-            mizzen_backstay_wire_upper TEXT,
-            mizzen_backstay_wire_lower TEXT,
-            mizzen_backstay_wire_length INTEGER,
-            capshrouds_wire_size INTEGER,
-            capshrouds_wire_upper TEXT,
-            capshrouds_wire_lower TEXT,
-            capshrouds_wire_length INTEGER,
-            mizzen_capshrouds_wire_size INTEGER,
-            mizzen_capshrouds_wire_upper TEXT,
-            mizzen_capshrouds_wire_lower TEXT,
-            mizzen_capshrouds_wire_length INTEGER,
-            intermediate_shrouds_wire_size INTEGER,
-            intermediate_shrouds_wire_upper TEXT,
-            intermediate_shrouds_wire_lower TEXT,
-            intermediate_shrouds_wire_length INTEGER,
-            mizzen_intermediate_shrouds_wire_size INTEGER,
-            mizzen_intermediate_shrouds_wire_upper TEXT,
-            mizzen_intermediate_shrouds_wire_lower TEXT,
-            mizzen_intermediate_shrouds_length INTEGER,
-            forward_lower_shrouds_wire_size INTEGER,
-            forward_lower_shrouds_wire_size INTEGER,
-            forward_lower_shrouds_wire_upper TEXT,
-            forward_lower_shrouds_wire_lower TEXT,
-            forward_lower_shrouds_wire_length INTEGER,
-            mizzen_forward_lower_shrouds_wire_size INTEGER,
-            mizzen_forward_lower_shrouds_wire_upper TEXT,
-            mizzen_forward_lower_shrouds_wire_lower TEXT,
-            mizzen_forward_lower_shrouds_wire_length INTEGER,
-            aft_lower_shrouds_wire_size INTEGER,
-            aft_lower_shrouds_wire_upper TEXT,
-            aft_lower_shrouds_wire_lower TEXT,
-            aft_lower_shrouds_wire_length INTEGER,
-            mizzen_aft_lower_shrouds_wire_size INTEGER,
-            mizzen_aft_lower_shrouds_wire_upper TEXT,
-            mizzen_aft_lower_shrouds_wire_lower TEXT,
-            mizzen_aft_lower_shrouds_wire_length INTEGER,
-            inner_forestay_wire_size INTEGER,
-            inner_forestay_wire_upper TEXT,
-            inner_forestay_wire_lower TEXT,
-            inner_forestay_wire_length INTEGER,
-            runner_wire_size INTEGER,
-            runner_wire_upper TEXT,
-            runner_wire_lower TEXT,
-            runner_wire_length INTEGER,
-            mizzen_runner_wire_size INTEGER,
-            mizzen_runner_wire_upper TEXT,
-            mizzen_runner_wire_lower TEXT,
-            mizzen_runner_wire_length INTEGER,
-            babystay_wire_size INTEGER,
-            babystay_wire_upper TEXT,
-            babystay_wire_lower TEXT,
-            babystay_wire_length INTEGER,
-            triatic_stay_wire_size INTEGER,
-            triatic_stay_wire_upper TEXT,
-            triatic_stay_wire_lower TEXT,
-            triatic_stay_wire_length INTEGER,
-            jumper_wire_size INTEGER,
-            jumper_wire_upper TEXT,
-            jumper_wire_lower TEXT,
-            jumper_wire_length INTEGER,
-            mizzen_jumper_wire_size INTEGER,
-            mizzen_jumper_wire_upper TEXT,
-            mizzen_jumper_wire_lower TEXT,
-            mizzen_jumper_wire_length INTEGER,
-            v1_wire_size INTEGER,
-            v1_wire_upper TEXT,
-            v1_wire_lower TEXT,
-            v1_wire_length INTEGER,
-            v2_wire_size INTEGER,
-            v2_wire_upper TEXT,
-            v2_wire_lower TEXT,
-            v2_wire_length INTEGER,
-            v2_d3_wire_size INTEGER,
-            v2_d3_wire_upper TEXT,
-            v2_d3_wire_lower TEXT,
-            v2_d3_wire_length INTEGER,
-            d1a_wire_size INTEGER,
-            d1a_wire_upper TEXT,
-            d1a_wire_lower TEXT,
-            d1a_wire_length INTEGER,
-            d1f_wire_size INTEGER,
-            d1f_wire_upper TEXT,
-            d1f_wire_lower TEXT,
-            d1f_wire_length INTEGER,
-            d2_wire_size INTEGER,
-            d2_wire_upper TEXT,
-            d2_wire_lower TEXT,
-            d2_wire_length INTEGER,
-            d3_wire_size INTEGER,
-            d3_wire_upper TEXT,
-            d3_wire_lower TEXT,
-            d3_wire_length INTEGER
+            f"UPDATE base_yachts SET {', '.join(f'{col} = ?' for col in columns)} WHERE id = ?",
+            [data.get(col) for col in columns] + [yacht_id],
         )
+        self._write_parts(yacht_id, data)
+        self.conn.commit()
+
+    def _write_parts(self, yacht_id, data):
+        # A part with no values has no row; reads LEFT JOIN it back as NULLs
+        for part, table in BASE_YACHT_TABLES.items():
+            if part == "profile":
+                continue
+            columns = self._part_columns(part)
+            values = [data.get(col) for col in columns]
+            if all(value is None for value in values):
+                self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (yacht_id,))
+                continue
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO {table} (id, {', '.join(columns)}) "
+                f"VALUES (?, {', '.join('?' for _ in columns)})",
+                [yacht_id] + values,
+            )
+
+    def select(self, fields=None, yacht_id=None):
+        """
+        Return (rows, columns) for one base yacht or all of them, in id order.
+        Only the tables holding `fields` are read; None means every column.
         """
+        if fields is None:
+            fields = BASE_YACHT_COLUMNS
+        else:
+            fields = tuple(dict.fromkeys(("id",) + tuple(fields)))
+            unknown = [f for f in fields if f != "id" and f not in COLUMN_PARTS]
+            if unknown:
+                raise ValueError(f"Unknown base yacht fields: {', '.join(unknown)}")
+        select = [
+            "base_yachts.id" if f == "id" else f"{BASE_YACHT_TABLES[COLUMN_PARTS[f]]}.{f}"
+            for f in fields
+        ]
+        joins = "".join(
+            f" LEFT JOIN {table} ON {table}.id = base_yachts.id"
+            for part, table in BASE_YACHT_TABLES.items()
+            if part != "profile" and any(COLUMN_PARTS.get(f) == part for f in fields)
         )
+        query = f"SELECT {', '.join(select)} FROM base_yachts{joins}"
+        params = ()
+        if yacht_id is not None:
+            query += " WHERE base_yachts.id = ?"
+            params = (yacht_id,)
+        rows = self.conn.execute(query + " ORDER BY base_yachts.id", params).fetchall()
+        return rows, list(fields)
+
+    def delete(self, yacht_id):
+        for table in BASE_YACHT_TABLES.values():
+            self.conn.execute(f"DELETE FROM {table} WHERE id = ?", (yacht_id,))
         self.conn.commit()
-        return True
 
     def get_yacht(self, yacht_id):
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM yachts WHERE id = ?", (yacht_id,))
-        return cursor.fetchone()
+        rows, _ = self.select(yacht_id=yacht_id)
+        return rows[0] if rows else None
 
     def close(self):
         self.conn.close()
@@ -0,0 +1,287 @@
+"""
+Yacht deletion tombstones and the background purge.
+
+Deleting a yacht only writes a tombstone, so the orchestrator answers 404 for
+it at once. A PurgeWorker then deletes the data of all tombstoned yachts with
+one delete_batch request per service, made concurrently, and retries with
+backoff whatever has not been confirmed yet. Deletes are idempotent:
+tombstoning a yacht again keeps its purge progress.
+
+Profile is purged only after every other service has confirmed. It allocates
+new yacht_ids as MAX(yacht_id) + 1, so a yacht_id can't be handed out again
+while other services still hold rows for it.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+# delete_batch answers 200 even when none of the yachts had rows; a 404 means
+# the route itself is missing, so the rows are still there
+PURGED_STATUS = 200
+
+# Backoff doubles per attempt only this many times: 2**attempts overflows a float
+MAX_BACKOFF_DOUBLINGS = 20
+
+
+class TombstoneStore:
+    """SQLite-backed tombstones with an in-memory set for the read path."""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS yacht_tombstones (
+                    yacht_id INTEGER PRIMARY KEY,
+                    deleted_at REAL NOT NULL,
+                    pending TEXT NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    next_attempt_at REAL NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    purged_at REAL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_yacht_tombstones_next "
+                "ON yacht_tombstones(purged_at, next_attempt_at)"
+            )
+            conn.commit()
+            self._deleted = {
+                row[0] for row in conn.execute("SELECT yacht_id FROM yacht_tombstones")
+            }
+
+    def is_deleted(self, yacht_id):
+        with self._lock:
+            return int(yacht_id) in self._deleted
+
+    def filter_live(self, yacht_ids):
+        with self._lock:
+            return [y for y in yacht_ids if int(y) not in self._deleted]
+
+    def mark(self, yacht_ids, services):
+        """
+        Tombstone the yachts with every service pending. Yachts that already
+        have a tombstone keep it. Returns the newly tombstoned yacht_ids.
+        """
+        now = time.time()
+        ids = [int(y) for y in dict.fromkeys(yacht_ids)]
+        with sqlite3.connect(self.db_path) as conn:
+            existing = set()
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                existing.update(
+                    row[0]
+                    for row in conn.execute(
+                        f"SELECT yacht_id FROM yacht_tombstones WHERE yacht_id IN ({placeholders})",
+                        chunk,
+                    )
+                )
+            new = [y for y in ids if y not in existing]
+            conn.executemany(
+                "INSERT INTO yacht_tombstones (yacht_id, deleted_at, pending) VALUES (?, ?, ?)",
+                [(y, now, json.dumps(list(services))) for y in new],
+            )
+            conn.commit()
+        with self._lock:
+            self._deleted.update(ids)
+        return new
+
+    def revive(self, yacht_id):
+        """Drop a fully purged tombstone when its yacht_id is issued again."""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.execute(
+                "DELETE FROM yacht_tombstones WHERE yacht_id = ? AND purged_at IS NOT NULL",
+                (int(yacht_id),),
+            )
+            conn.commit()
+        if cursor.rowcount:
+            with self._lock:
+                self._deleted.discard(int(yacht_id))
+        return bool(cursor.rowcount)
+
+    def due(self, limit=100, now=None):
+        """
+        [(yacht_id, pending services, attempts)] whose next purge attempt is
+        due. Pending is None where the stored progress can't be read.
+        """
+        now = time.time() if now is None else now
+        with sqlite3.connect(self.db_path) as conn:
+            rows = conn.execute(
+                "SELECT yacht_id, pending, attempts FROM yacht_tombstones "
+                "WHERE purged_at IS NULL AND next_attempt_at <= ? "
+                "ORDER BY next_attempt_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+        due = []
+        for yacht_id, pending, attempts in rows:
+            try:
+                services = json.loads(pending)
+            except ValueError:
+                # Purging everywhere again is safe: deletes are idempotent
+                logger.warning(f"Unreadable purge progress for yacht {yacht_id}: {pending!r}")
+                services = None
+            due.append((yacht_id, services, attempts))
+        return due
+
+    def record_attempts(self, results):
+        """
+        Store the outcome of purge attempts, given as (yacht_id, services still
+        pending, error, retry delay). A tombstone is purged once nothing is pending.
+        """
+        now = time.time()
+        with sqlite3.connect(self.db_path) as conn:
+            conn.executemany(
+                "UPDATE yacht_tombstones SET pending = ?, attempts = attempts + 1, "
+                "next_attempt_at = ?, last_error = ?, purged_at = ? WHERE yacht_id = ?",
+                [
+                    (json.dumps(pending), now + delay, error, None if pending else now, yacht_id)
+                    for yacht_id, pending, error, delay in results
+                ],
+            )
+            conn.commit()
+
+    def status(self, yacht_id):
+        with sqlite3.connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT deleted_at, pending, attempts, last_error, purged_at "
+                "FROM yacht_tombstones WHERE yacht_id = ?",
+                (int(yacht_id),),
+            ).fetchone()
+        if row is None:
+            return None
+        deleted_at, pending, attempts, last_error, purged_at = row
+        return {
+            "yacht_id": int(yacht_id),
+            "deleted_at": deleted_at,
+            "pending": json.loads(pending),
+            "attempts": attempts,
+            "last_error": last_error,
+            "purged": purged_at is not None,
+        }
+
+
+class PurgeWorker:
+    """
+    Background loop purging tombstoned yachts in batches.
+
+    `services` maps a service name to its POST delete_batch url, which takes
+    {"yacht_ids": [...]}: each round makes one request per service for all
+    the due yachts, concurrently. The names in `last` are only purged for
+    yachts whose other services have all confirmed.
+    """
+
+    def __init__(self, store, services, last=(), retry_delay=2.0, max_backoff=300.0, batch_size=200, timeout=10.0):
+        self.store = store
+        self.services = dict(services)
+        self.last = tuple(last)
+        self.retry_delay = retry_delay
+        self.max_backoff = max_backoff
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(len(self.services), 1), thread_name_prefix="yacht-purge"
+        )
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="yacht-purge", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def notify(self):
+        self._wake.set()
+
+    def _delete_batch(self, service, yacht_ids):
+        resp = requests.post(
+            self.services[service], json={"yacht_ids": yacht_ids}, timeout=self.timeout
+        )
+        if resp.status_code != PURGED_STATUS:
+            raise RuntimeError(f"HTTP {resp.status_code}: {resp.text[:200]}")
+
+    def _purge_phase(self, pending, errors, last):
+        """One concurrent delete_batch per service still pending for any yacht."""
+        by_service = {}
+        for yacht_id, services in pending.items():
+            if errors[yacht_id]:
+                continue
+            for service in services:
+                if (service in self.last) == last:
+                    by_service.setdefault(service, []).append(yacht_id)
+        futures = {
+            service: self._pool.submit(self._delete_batch, service, yacht_ids)
+            for service, yacht_ids in by_service.items()
+        }
+        for service, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                for yacht_id in by_service[service]:
+                    errors[yacht_id][service] = str(e)
+                continue
+            for yacht_id in by_service[service]:
+                pending[yacht_id].remove(service)
+
+    def _result(self, yacht_id, pending, errors, attempts):
+        """(yacht_id, pending, error, retry delay) for record_attempts."""
+        if not errors:
+            return (yacht_id, pending, None, 0.0)
+        doublings = min(max(attempts, 0), MAX_BACKOFF_DOUBLINGS)
+        delay = min(self.retry_delay * 2**doublings, self.max_backoff)
+        logger.warning(
+            f"Purging yacht {yacht_id} failed for {sorted(errors)}; retrying in {delay:.0f}s"
+        )
+        return (yacht_id, pending, json.dumps(errors), delay)
+
+    def run_once(self):
+        """Attempt every due tombstone once. Returns how many were attempted."""
+        due = self.store.due(limit=self.batch_size)
+        pending = {
+            yacht_id: list(self.services if services is None else services)
+            for yacht_id, services, _ in due
+        }
+        errors = {yacht_id: {} for yacht_id in pending}
+        self._purge_phase(pending, errors, last=False)
+        # Yachts whose other services all confirmed can lose the rest now
+        self._purge_phase(pending, errors, last=True)
+        results = []
+        for yacht_id, _, attempts in due:
+            try:
+                results.append(self._result(yacht_id, pending[yacht_id], errors[yacht_id], attempts))
+            except Exception as e:
+                # One bad tombstone must not keep the rest of the round unrecorded
+                logger.warning(f"Recording the purge of yacht {yacht_id} failed: {e}")
+                errors[yacht_id]["purge"] = str(e)
+                results.append((yacht_id, pending[yacht_id], str(e), self.max_backoff))
+        self.store.record_attempts(results)
+        if due:
+            logger.info(f"Purge round: {sum(not e for e in errors.values())} of {len(due)} yachts purged")
+        return len(due)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                attempted = self.run_once()
+            except Exception as e:
+                logger.warning(f"yacht purge loop failed: {e}")
+                attempted = 0
+            if not attempted:
+                self._wake.wait(self.retry_delay)
+                self._wake.clear()
@@ -16,3 +16,354 @@ client = TestClient(app)
 def test_search_yachts():
     response = client.get("/yachts/search?query=")
     assert response.status_code in (200, 404, 422)
+
+
+
+class _FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise Exception(f"HTTP {self.status_code}")
+
+
+def test_user_boats_summary(monkeypatch):
+    import app as orchestrator
+
+    def fake_get(url, params=None, timeout=None):
+        assert url.endswith("/users/u1/yachts")
+        return _FakeResponse({"yacht_ids": ["7", "8"], "next_after": None})
+
+    def fake_post(url, json=None, timeout=None):
+        assert json["yacht_ids"] == [7, 8]
+        if url.endswith("/profile/batch"):
+            return _FakeResponse({"7": {"yacht_id": 7, "model": "First 40"}})
+        if url.endswith("/hull/bundle"):
+            return _FakeResponse({"7": {"hull": {"loa": 12.0}, "keel": {"draft": 2.1}, "rudder": None}})
+        return _FakeResponse(None, status_code=503)
+
+    monkeypatch.setattr(orchestrator.requests, "get", fake_get)
+    monkeypatch.setattr(orchestrator.requests, "post", fake_post)
+    body = client.get("/users/u1/boats/summary").json()
+    first, second = body["boats"]
+    assert first["model"] == "First 40"
+    assert first["hull"]["loa"] == 12.0 and first["hull"]["draft"] == 2.1
+    assert first["rig"]["i"] is None
+    assert second["yacht_id"] == 8 and second["model"] is None
+    assert "saildata" in body["errors"]
+
+
+def test_clone_yacht_links_instead_of_copying(monkeypatch):
+    import app as orchestrator
+
+    posted = []
+
+    def fake_post(url, json=None, timeout=None):
+        posted.append((url, json))
+        if url.endswith("/profile/clone"):
+            assert json == {"base_id": 7, "model": "Mine", "spec": None, "notes": None}
+            return _FakeResponse({"yacht_id": 42, "base_id": 7})
+        if url.endswith("/users/u1/add_yacht"):
+            return _FakeResponse({"user_id": "u1", "role": "customer", "yacht_ids": ["42"]})
+        if url.endswith("/ropes/inherit"):
+            return _FakeResponse(None, status_code=503)
+        return _FakeResponse({"status": "ok"})
+
+    monkeypatch.setattr(orchestrator.requests, "post", fake_post)
+    body = client.post("/yacht/clone", json={"originalBoatId": 7, "userId": "u1", "name": "Mine"}).json()
+    assert body["new_yacht_id"] == 42
+    assert list(body["errors"]) == ["ropes"]
+    links = {url.rsplit("/", 2)[-2] for url, payload in posted if url.endswith("/inherit")}
+    assert links == {"hull", "saildata", "sails", "ropes"}
+    assert all(payload == {"yacht_id": 42, "base_id": 7} for url, payload in posted if url.endswith("/inherit"))
+
+
+def test_clone_yacht_physical_copy(monkeypatch):
+    import app as orchestrator
+
+    posted = []
+
+    def fake_post(url, json=None, timeout=None):
+        posted.append((url, json))
+        if url.endswith("/profile/copy_from"):
+            assert json["source_yacht_id"] == 7 and json["model"] == "Mine"
+            return _FakeResponse({"yacht_id": 43, "base_id": 7})
+        if url.endswith("/users/u1/add_yacht"):
+            return _FakeResponse({"user_id": "u1", "role": "customer", "yacht_ids": ["43"]})
+        return _FakeResponse({"status": "ok", "copied": {}})
+
+    monkeypatch.setattr(orchestrator.requests, "post", fake_post)
+    body = client.post("/yacht/clone", json={"originalBoatId": 7, "userId": "u1", "name": "Mine", "copy": True}).json()
+    assert body == {"new_yacht_id": 43}
+    copies = [payload for url, payload in posted if url.endswith("/copy_from") and "/profile/" not in url]
+    assert copies == [{"source_yacht_id": 7, "target_yacht_id": 43}] * 4
+
+
+def test_create_yacht_posts_possible_items_in_bulk(monkeypatch):
+    import app as orchestrator
+
+    posted = []
+
+    def fake_post(url, json=None, timeout=None):
+        posted.append(url)
+        return _FakeResponse([])
+
+    monkeypatch.setattr(orchestrator.requests, "post", fake_post)
+    body = client.post(
+        "/yacht/",
+        json={
+            "yacht_id": 9,
+            "possible_sails": ["genoa", {"sail_type": "jib", "config": {"area": 20}}],
+            "possible_ropes": ["MainsailHalyard", "JibSheet", {"rope_type": "Vang"}],
+        },
+    ).json()
+    assert "errors" not in body
+    assert posted == [f"{orchestrator.SAILS_API}/sails/possible/9/bulk", f"{orchestrator.ROPES_API}/ropes/possible/9/bulk"]
+
+
+def test_delete_yacht_tombstones_then_purges(monkeypatch, tmp_path):
+    import app as orchestrator
+    from src.tombstones import PurgeWorker, TombstoneStore
+
+    store = TombstoneStore(str(tmp_path / "yacht.db"))
+    worker = PurgeWorker(store, orchestrator.PURGE_SERVICES, last=("profile",), retry_delay=0)
+    monkeypatch.setattr(orchestrator, "tombstones", store)
+    monkeypatch.setattr(orchestrator, "purge_worker", worker)
+
+    def no_reads(*args, **kwargs):
+        raise AssertionError("deleted yachts are answered without calling the services")
+
+    monkeypatch.setattr(orchestrator.requests, "get", no_reads)
+    resp = client.delete("/yacht/77")
+    assert resp.status_code == 202 and resp.json()["purge"]["pending"] == list(orchestrator.PURGE_SERVICES)
+    assert client.get("/yacht/77").status_code == 404
+    resp = client.post("/yachts/delete_batch", json={"yacht_ids": [77, 78, 79]})
+    assert resp.status_code == 202 and resp.json()["newly_deleted"] == [78, 79]
+
+    calls = []
+    sails_up = [False]
+
+    def fake_post(url, json=None, timeout=None):
+        calls.append((url, sorted(json["yacht_ids"])))
+        if "/sails/" in url and not sails_up[0]:
+            return _FakeResponse(None, status_code=503)
+        return _FakeResponse({"status": "deleted"})
+
+    monkeypatch.setattr("src.tombstones.requests.post", fake_post)
+    worker.run_once()
+    # One request per service for all three yachts; profile waits for sails
+    assert sorted(url.rsplit("/", 2)[-2] for url, _ in calls) == ["hull", "ropes", "saildata", "sails"]
+    assert all(ids == [77, 78, 79] for _, ids in calls)
+    assert client.get("/yacht/77/purge").json()["pending"] == ["sails", "profile"]
+
+    sails_up[0] = True
+    calls.clear()
+    worker.run_once()
+    assert [url.rsplit("/", 2)[-2] for url, _ in calls] == ["sails", "profile"]
+    assert client.get("/yacht/79/purge").json()["purged"] is True
+    # Deleting again is a no-op
+    assert client.delete("/yacht/77").json()["purge"]["purged"] is True
+
+
+def test_purge_keeps_tombstone_when_delete_batch_is_missing(monkeypatch, tmp_path):
+    from src.tombstones import PurgeWorker, TombstoneStore
+
+    store = TombstoneStore(str(tmp_path / "yacht.db"))
+    services = {"saildata": "http://saildata/saildata/delete_batch"}
+    worker = PurgeWorker(store, services, retry_delay=0)
+    store.mark([80], list(services))
+
+    monkeypatch.setattr(
+        "src.tombstones.requests.post",
+        lambda url, json=None, timeout=None: _FakeResponse({"detail": "Not Found"}, status_code=404),
+    )
+    worker.run_once()
+    status = store.status(80)
+    assert status["pending"] == ["saildata"] and status["purged"] is False
+    assert "HTTP 404" in status["last_error"]
+
+
+def test_purge_round_survives_huge_attempts_and_bad_rows(monkeypatch, tmp_path):
+    import sqlite3
+    import time
+
+    from src.tombstones import PurgeWorker, TombstoneStore
+
+    store = TombstoneStore(str(tmp_path / "yacht.db"))
+    services = {"saildata": "http://saildata/saildata/delete_batch"}
+    worker = PurgeWorker(store, services, retry_delay=2.0, max_backoff=300.0)
+    store.mark([81, 82, 83], list(services))
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE yacht_tombstones SET attempts = 5000 WHERE yacht_id = 81")
+        conn.execute("UPDATE yacht_tombstones SET pending = 'not json' WHERE yacht_id = 82")
+
+    monkeypatch.setattr(
+        "src.tombstones.requests.post",
+        lambda url, json=None, timeout=None: _FakeResponse({"detail": "unavailable"}, status_code=503),
+    )
+    assert worker.run_once() == 3
+    status = store.status(81)
+    assert status["attempts"] == 5001 and "HTTP 503" in status["last_error"]
+    # Backoff is capped rather than overflowing
+    assert [y for y, _, _ in store.due(now=time.time() + 299)] == [82, 83]
+    assert 81 in [y for y, _, _ in store.due(now=time.time() + 301)]
+    # Unreadable progress is replaced by every service pending again
+    assert store.status(82)["pending"] == ["saildata"]
+
+    posted = []
+
+    def fake_post(url, json=None, timeout=None):
+        posted.extend(json["yacht_ids"])
+        return _FakeResponse({"deleted": {}})
+
+    monkeypatch.setattr("src.tombstones.requests.post", fake_post)
+    with sqlite3.connect(store.db_path) as conn:
+        conn.execute("UPDATE yacht_tombstones SET next_attempt_at = 0")
+    worker.run_once()
+    assert sorted(posted) == [81, 82, 83]
+    assert all(store.status(y)["purged"] for y in (81, 82, 83))
+
+
+def test_list_yachts_pages_past_deleted(monkeypatch, tmp_path):
+    import app as orchestrator
+    from src.tombstones import TombstoneStore
+
+    store = TombstoneStore(str(tmp_path / "yacht.db"))
+    store.mark([2], ["profile"])
+    monkeypatch.setattr(orchestrator, "tombstones", store)
+    pages = {None: ([1, 2], 2), 2: ([3], None)}
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        assert url.endswith("/profile/list") and params["builder"] == "Yard"
+        calls.append(dict(params))
+        ids, next_after = pages[params.get("after")]
+        page = {"items": [{"yacht_id": i} for i in ids], "next_after": next_after}
+        if params["facets"]:
+            page["catalogue_facets"] = {"builder": [{"value": "Yard", "count": 3}]}
+        return _FakeResponse(page)
+
+    monkeypatch.setattr(orchestrator.requests, "get", fake_get)
+    body = client.get("/yachts/list", params={"limit": 2, "builder": "Yard", "facets": True}).json()
+    assert body["items"] == [{"yacht_id": 1}, {"yacht_id": 3}] and body["next_after"] is None
+    assert body["catalogue_facets"]["builder"][0]["count"] == 3
+    assert calls[1]["limit"] == 1 and not calls[1]["facets"]
+
+
+def test_search_yachts_uses_fuzzy_profile_search(monkeypatch):
+    import app as orchestrator
+
+    def fake_get(url, params=None, timeout=None):
+        assert url.endswith("/profile/search") and params["q"] == "Jenneau"
+        return _FakeResponse([{"yacht_id": 5, "builder": "Jeanneau", "score": 0.545}])
+
+    monkeypatch.setattr(orchestrator.requests, "get", fake_get)
+    assert client.get("/yachts/search", params={"query": "Jenneau"}).json()[0]["yacht_id"] == 5
+
+
+def test_search_yachts_facets_count_the_results(tmp_path, monkeypatch):
+    import app as orchestrator
+    from src.tombstones import TombstoneStore
+
+    store = TombstoneStore(str(tmp_path / "yacht.db"))
+    store.mark([6], ["profile"])
+    monkeypatch.setattr(orchestrator, "tombstones", store)
+    profiles = [
+        {"yacht_id": 5, "builder": "Jeanneau", "designer": "Finot", "year_introduced": 1984},
+        {"yacht_id": 6, "builder": "Jeanneau", "designer": "Finot", "year_introduced": 1986},
+        {"yacht_id": 7, "builder": "Jeanneau", "designer": "", "year_introduced": 1992},
+    ]
+    monkeypatch.setattr(orchestrator.requests, "get", lambda url, params=None, timeout=None: _FakeResponse(profiles))
+
+    body = client.get("/yachts/search", params={"query": "Jenneau", "facets": True}).json()
+    assert [p["yacht_id"] for p in body["items"]] == [5, 7]
+    # Counted over the returned yachts only, without the deleted one
+    assert body["facets"]["builder"] == [{"value": "Jeanneau", "count": 2}]
+    assert body["facets"]["designer"] == [{"value": "Finot", "count": 1}]
+    assert body["facets"]["year"] == [{"value": "1980s", "count": 1}, {"value": "1990s", "count": 1}]
+    assert body["facets"]["yacht_class"] == []
+
+
+def test_base_yacht_picker_reads_only_profile(tmp_path):
+    from types import SimpleNamespace
+    from src.service import BaseYachtService
+    from src.models.base_yacht.database import PICKER_FIELDS
+
+    service = BaseYachtService(str(tmp_path / "base_yachts.db"))
+    yacht_id = service.save_base_yacht(
+        SimpleNamespace(model="First 40", builder="Beneteau", loa=12240, forestay_wire_size=10)
+    )
+    queries = []
+    service.db.conn.set_trace_callback(queries.append)
+    picker = service.list_base_yachts(fields=PICKER_FIELDS)
+    assert picker[0]["id"] == yacht_id and picker[0]["model"] == "First 40"
+    assert not any("base_yacht_standing_rigging" in q for q in queries)
+    assert service.get_base_yacht_by_id(yacht_id, fields=["loa", "forestay_wire_size"]) == {
+        "id": yacht_id, "loa": 12240, "forestay_wire_size": 10,
+    }
+    service.delete_base_yacht(yacht_id)
+    assert service.list_base_yachts(fields=PICKER_FIELDS) == []
+
+
+def test_yacht_furlers_use_base_yacht_rigging(monkeypatch, tmp_path):
+    import app as orchestrator
+    from src.models.base_yacht.database import BaseYachtDatabase
+
+    db_path = str(tmp_path / "base_yachts.db")
+    db = BaseYachtDatabase(db_path)
+    base_id = db.insert({"model": "First 40", "forestay_wire_size": 8, "forestay_wire_length": 14250})
+    db.close()
+    monkeypatch.setattr(orchestrator, "BASE_YACHTS_DB_PATH", db_path)
+
+    calls = []
+
+    def fake_get(url, params=None, timeout=None):
+        calls.append((url, params))
+        if url == f"{orchestrator.PROFILE_API}/profile/42":
+            return _FakeResponse({"yacht_id": 42, "base_id": base_id})
+        if url.startswith(f"{orchestrator.FURLER_API}/spec_furlers/yacht/"):
+            if url.endswith("/43"):
+                return _FakeResponse({"detail": {"missing": ["stay_diameter"]}}, status_code=422)
+            return _FakeResponse({"yacht_id": 42, "inputs": params})
+        return _FakeResponse(None, status_code=404)
+
+    monkeypatch.setattr(orchestrator.requests, "get", fake_get)
+    body = client.get("/yacht/42/furlers", params={"rm": 20}).json()
+    assert body["inputs"] == {"stay_diameter": 8, "stay_length": 14250, "rm": 20.0}
+
+    # Explicit forestay details skip the rigging lookup
+    calls.clear()
+    client.get("/yacht/42/furlers", params={"stay_diameter": 10, "stay_length": 15000})
+    assert [url for url, _ in calls] == [f"{orchestrator.FURLER_API}/spec_furlers/yacht/42"]
+
+    resp = client.get("/yacht/43/furlers")
+    assert resp.status_code == 422 and resp.json()["detail"] == {"missing": ["stay_diameter"]}
+
+    # The yacht view itself no longer waits on the furler service
+    calls.clear()
+    client.get("/yacht/42")
+    assert not any(url.startswith(orchestrator.FURLER_API) for url, _ in calls)
+
+
+def test_yacht_furlers_without_base_yacht_records(monkeypatch, tmp_path):
+    import app as orchestrator
+
+    monkeypatch.setattr(orchestrator, "BASE_YACHTS_DB_PATH", str(tmp_path / "missing" / "base_yachts.db"))
+    sent = []
+
+    def fake_get(url, params=None, timeout=None):
+        assert url.startswith(f"{orchestrator.FURLER_API}/spec_furlers/yacht/")
+        sent.append(params)
+        return _FakeResponse({"detail": {"missing": ["stay_diameter"]}}, status_code=422)
+
+    monkeypatch.setattr(orchestrator.requests, "get", fake_get)
+    resp = client.get("/yacht/42/furlers")
+    # No forestay data: the furler service names what is missing
+    assert resp.status_code == 422 and resp.json()["detail"] == {"missing": ["stay_diameter"]}
+    assert sent == [{}]
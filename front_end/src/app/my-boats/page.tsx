@@ -23,43 +23,28 @@ export default function MyBoatsPage() {
     // Fetch user's boats from backend
     async function fetchUserBoats() {
       try {
-        // 1. Get user profile (to get yacht_ids)
-        const userProfileRes = await fetch(`${process.env.NEXT_PUBLIC_USER_PROFILE_API_URL}/users/${user.id}`)
-        if (!userProfileRes.ok) {
-          console.log('Failed to fetch user profile', userProfileRes.status)
+        // One call: the orchestrator batches profile, hull and rig summaries
+        const summaryRes = await fetch(`${process.env.NEXT_PUBLIC_YACHT_API_URL}/users/${user.id}/boats/summary`)
+        if (!summaryRes.ok) {
+          console.log('Failed to fetch boats summary', summaryRes.status)
           return setUserBoats([])
         }
-        const userProfile = await userProfileRes.json()
-        console.log('Fetched userProfile:', userProfile)
-        const yachtIds: string[] = userProfile.yacht_ids || []
-        console.log('User yachtIds:', yachtIds)
-        if (yachtIds.length === 0) return setUserBoats([])
-        // 2. Fetch each yacht's details
-        const boats: Boat[] = await Promise.all(
-          yachtIds.map(async (yachtId) => {
-            console.log('Fetching yacht:', yachtId)
-            const yachtRes = await fetch(`${process.env.NEXT_PUBLIC_YACHT_API_URL}/yacht/${yachtId}`)
-            if (!yachtRes.ok) {
-              console.log('Failed to fetch yacht', yachtId, yachtRes.status)
-              return null
-            }
-            const yacht = await yachtRes.json()
-            console.log('Fetched yacht:', yacht)
-            // Map backend yacht to Boat type (add more fields as needed)
-            return {
-              id: yacht.yacht_id?.toString() || yachtId,
-              name: yacht.profile?.model || yacht.profile?.name || `Yacht ${yachtId}`,
-              model: yacht.profile?.model || "",
-              type: yacht.profile?.yacht_class || "",
-              hull: yacht.hull || {},
-              rig: yacht.rig || {},
-              sailData: yacht.saildata || {},
-              sails: yacht.sails || [],
-              ropes: yacht.ropes || [],
-              // ...add more fields as needed
-            } as Boat
-          })
-        )
+        const summary = await summaryRes.json()
+        const boats: Boat[] = (summary.boats || []).map((yacht: any) => ({
+          id: yacht.yacht_id.toString(),
+          yacht_id: yacht.yacht_id,
+          name: yacht.name || yacht.model || `Yacht ${yacht.yacht_id}`,
+          model: yacht.model || "",
+          builder: yacht.builder || undefined,
+          designer: yacht.designer || undefined,
+          year_introduced: yacht.year_introduced || undefined,
+          type: yacht.yacht_class || "",
+          hull: yacht.hull || {},
+          rig: { type: yacht.rig?.mh_frac || "" },
+          sailData: yacht.rig || {},
+          sails: [],
+          ropes: [],
+        }) as Boat)
         setUserBoats(boats.filter(Boolean))
       } catch (err) {
         console.error('Error in fetchUserBoats:', err)
@@ -8,10 +8,12 @@ import { Search } from "lucide-react"
 import { Input } from "@/components/ui/input"
 import { Button } from "@/components/ui/button"
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@/components/ui/select"
+import { useYachtSuggestions } from "@/hooks/use-yacht-suggestions"
 
 export function SearchBoatsNav() {
   const router = useRouter()
   const [searchQuery, setSearchQuery] = useState("")
+  const suggestions = useYachtSuggestions(searchQuery)
 
   const handleSearch = (e: React.FormEvent) => {
     e.preventDefault()
@@ -28,7 +30,13 @@ export function SearchBoatsNav() {
               value={searchQuery}
               onChange={(e) => setSearchQuery(e.target.value)}
               className="w-full"
+              list="yacht-suggestions-nav"
             />
+            <datalist id="yacht-suggestions-nav">
+              {suggestions.map((s) => (
+                <option key={`${s.field}:${s.value}`} value={s.value} />
+              ))}
+            </datalist>
           </div>
           <Button type="submit" className="w-full md:w-auto">
             <Search className="mr-2 h-4 w-4" />
@@ -5,34 +5,56 @@ import { Button } from "@/components/ui/button"
 import { Card, CardContent } from "@/components/ui/card"
 import { getApiBase } from "@/lib/getApiBase"
 
+// "12, 15-18 20" -> [12, 15, 16, 17, 18, 20]
+function parseYachtIds(input: string): number[] {
+  const ids = new Set<number>()
+  for (const part of input.split(/[\s,]+/).filter(Boolean)) {
+    const range = part.match(/^(\d+)-(\d+)$/)
+    if (range) {
+      const [start, end] = [Number(range[1]), Number(range[2])].sort((a, b) => a - b)
+      for (let id = start; id <= end; id++) ids.add(id)
+    } else if (/^\d+$/.test(part)) {
+      ids.add(Number(part))
+    }
+  }
+  return Array.from(ids)
+}
+
+const PAGE_SIZE = 10
+
 export function YachtAdminList() {
   const [yachts, setYachts] = useState<any[]>([])
   const [loading, setLoading] = useState(false)
   const [error, setError] = useState<string|null>(null)
   const [deleteId, setDeleteId] = useState("")
   const [deleting, setDeleting] = useState<string|null>(null)
+  const [selected, setSelected] = useState<Set<string>>(new Set())
+  // Keyset cursor for the next page; null once the catalogue is exhausted
+  const [nextAfter, setNextAfter] = useState<number|null>(null)
 
-  useEffect(() => {
-    const fetchYachts = async () => {
-      setLoading(true)
-      setError(null)
-      try {
-        const apiBase = getApiBase('yacht')
-        console.log('[YachtAdminList] apiBase:', apiBase)
-        const res = await fetch(`${apiBase}/yachts/search?query=`)
-        const data = await res.json()
-        console.log('Admin fetched yachts:', data)
-        // Sort by yacht_id descending, take last 10
-        const sorted = Array.isArray(data) ? [...data].sort((a, b) => Number(b.yacht_id) - Number(a.yacht_id)).slice(0, 10) : []
-        setYachts(sorted)
-      } catch (e) {
-        setError("Failed to fetch yachts")
-      } finally {
-        setLoading(false)
-      }
+  // Newest first, a page at a time
+  const fetchYachts = async (after: number|null) => {
+    setLoading(true)
+    setError(null)
+    try {
+      const apiBase = getApiBase('yacht')
+      const params = new URLSearchParams({ limit: String(PAGE_SIZE), desc: "true" })
+      if (after !== null) params.set("after", String(after))
+      const res = await fetch(`${apiBase}/yachts/list?${params}`)
+      if (!res.ok) throw new Error("List failed")
+      const data = await res.json()
+      setYachts(yachts => after === null ? data.items : [...yachts, ...data.items])
+      setNextAfter(data.next_after)
+    } catch (e) {
+      setError("Failed to fetch yachts")
+    } finally {
+      setLoading(false)
     }
-    fetchYachts()
-  }, [deleting])
+  }
+
+  useEffect(() => {
+    fetchYachts(null)
+  }, [])
 
   const handleDelete = async (id: string) => {
     setDeleting(id)
@@ -49,9 +71,43 @@ export function YachtAdminList() {
     }
   }
 
+  // One request for any number of yachts; the backend purges them in batches
+  const handleDeleteBatch = async (ids: number[]) => {
+    if (ids.length === 0) return
+    setDeleting("batch")
+    setError(null)
+    try {
+      const apiBase = getApiBase('yacht')
+      const res = await fetch(`${apiBase}/yachts/delete_batch`, {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ yacht_ids: ids }),
+      })
+      if (!res.ok) throw new Error("Delete failed")
+      const deleted = new Set(ids.map(String))
+      setYachts(yachts => yachts.filter(y => !deleted.has(String(y.yacht_id))))
+      setSelected(new Set())
+    } catch (e) {
+      setError("Failed to delete yachts")
+    } finally {
+      setDeleting(null)
+    }
+  }
+
+  const toggleSelected = (id: string) => {
+    setSelected(prev => {
+      const next = new Set(prev)
+      if (next.has(id)) next.delete(id)
+      else next.add(id)
+      return next
+    })
+  }
+
   const handleDeleteById = async () => {
-    if (!deleteId) return
-    await handleDelete(deleteId)
+    const ids = parseYachtIds(deleteId)
+    if (ids.length === 0) return
+    if (ids.length === 1) await handleDelete(String(ids[0]))
+    else await handleDeleteBatch(ids)
     setDeleteId("")
   }
 
@@ -59,13 +115,19 @@ export function YachtAdminList() {
     <div className="my-8">
       <Card className="mb-8">
         <CardContent className="p-6">
-          <h3 className="text-xl font-bold mb-4">Last 10 Yachts Created</h3>
+          <h3 className="text-xl font-bold mb-4">Yachts, Newest First</h3>
           {loading ? <div>Loading...</div> : null}
           {error ? <div className="text-red-500 mb-2">{error}</div> : null}
           <ul className="divide-y">
             {yachts.map(yacht => (
               <li key={yacht.yacht_id} className="flex items-center justify-between py-2">
                 <span>
+                  <input
+                    type="checkbox"
+                    className="mr-2"
+                    checked={selected.has(String(yacht.yacht_id))}
+                    onChange={() => toggleSelected(String(yacht.yacht_id))}
+                  />
                   <span className="font-mono text-sm">{yacht.yacht_id}</span> &mdash; {yacht.model || yacht.yacht_class || "(no name)"}
                 </span>
                 <Button variant="destructive" size="sm" disabled={deleting === String(yacht.yacht_id)} onClick={() => handleDelete(yacht.yacht_id)}>
@@ -74,21 +136,34 @@ export function YachtAdminList() {
               </li>
             ))}
           </ul>
+          {nextAfter !== null ? (
+            <Button variant="outline" className="mt-4 mr-2" disabled={loading} onClick={() => fetchYachts(nextAfter)}>
+              Load more
+            </Button>
+          ) : null}
+          <Button
+            variant="destructive"
+            className="mt-4"
+            disabled={selected.size === 0 || deleting === "batch"}
+            onClick={() => handleDeleteBatch(Array.from(selected).map(Number))}
+          >
+            {deleting === "batch" ? "Deleting..." : `Delete selected (${selected.size})`}
+          </Button>
         </CardContent>
       </Card>
       <Card>
         <CardContent className="p-6">
-          <h3 className="text-xl font-bold mb-4">Delete Yacht by ID</h3>
+          <h3 className="text-xl font-bold mb-4">Delete Yachts by ID</h3>
           <div className="flex gap-2">
             <input
               className="border rounded px-2 py-1 font-mono"
               type="text"
-              placeholder="Enter Yacht ID"
+              placeholder="IDs, e.g. 12, 15-40"
               value={deleteId}
               onChange={e => setDeleteId(e.target.value)}
             />
-            <Button variant="destructive" onClick={handleDeleteById} disabled={!deleteId || deleting === deleteId}>
-              {deleting === deleteId ? "Deleting..." : "Delete by ID"}
+            <Button variant="destructive" onClick={handleDeleteById} disabled={!deleteId || deleting !== null}>
+              {deleting !== null ? "Deleting..." : "Delete by ID"}
             </Button>
           </div>
         </CardContent>
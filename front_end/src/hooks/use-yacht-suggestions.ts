@@ -0,0 +1,30 @@
+"use client"
+
+import { useEffect, useState } from "react"
+import { getApiBase } from "@/lib/getApiBase"
+
+export interface YachtSuggestion {
+  value: string
+  field: string
+  count: number
+}
+
+// Typeahead names for a search box; stale responses are dropped
+export function useYachtSuggestions(prefix: string) {
+  const [suggestions, setSuggestions] = useState<YachtSuggestion[]>([])
+
+  useEffect(() => {
+    if (!prefix.trim()) {
+      setSuggestions([])
+      return
+    }
+    const controller = new AbortController()
+    fetch(`${getApiBase('yacht')}/yachts/suggest?prefix=${encodeURIComponent(prefix)}`, { signal: controller.signal })
+      .then(res => (res.ok ? res.json() : []))
+      .then(setSuggestions)
+      .catch(() => {})
+    return () => controller.abort()
+  }, [prefix])
+
+  return suggestions
+}